@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+文章页解析进程池的吞吐量测试
+
+模拟并发爬取时的解析阶段：若干工作线程同时领取已下载的文章页正文，分别在工作线程中
+解析（parse_workers为0）和交给不同数量的解析进程解析，比较每秒解析的页面数，
+并检查解析结果是否与在工作线程中解析一致。进程启动时间不计入吞吐量。
+
+在工作线程中解析受GIL限制只能使用一个CPU核心，解析进程数不超过CPU核心数时
+吞吐量应随进程数近似线性增长。
+
+用法:
+    python benchmarks/parse_pool_benchmark.py
+    python benchmarks/parse_pool_benchmark.py --pages 400 --workers 1 2 4 8 --parser lxml
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# 添加项目根目录到路径，以便导入core模块
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(current_dir))
+
+from core.crawler import WebCrawler
+from core.html_tree import PARSER_BACKENDS
+from core.parse_pool import ParsePool
+from parser_benchmark import DEFAULT_CONFIG, build_article_page
+
+
+def build_pages(count):
+    """生成内容和时间各不相同的文章页正文"""
+    template = build_article_page()
+    pages = []
+    for index in range(count):
+        text = template.replace('2024-05-15 10:30:00', f"2024-05-{index % 28 + 1:02d} 10:{index % 60:02d}:00")
+        text = text.replace('内容', f"内容{index}")
+        pages.append((f"https://example.com/article/{index}.html", text.encode('utf-8')))
+    return pages
+
+
+def run_in_threads(parse, pages, threads):
+    """用threads个工作线程解析所有页面，返回(耗时秒数, 按页面顺序排列的结果)"""
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        results = list(executor.map(lambda page: parse(page[1], 'utf-8', page[0]), pages))
+    return time.perf_counter() - start, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="文章页解析进程池的吞吐量测试")
+    parser.add_argument('--pages', type=int, default=200, help="文章页数量（默认200）")
+    parser.add_argument('--threads', type=int, default=8, help="模拟的文章工作线程数（默认8）")
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4], help="要测试的解析进程数（默认1 2 4）")
+    parser.add_argument('--parser', choices=PARSER_BACKENDS, default='html.parser', help="页面解析器（默认html.parser）")
+    args = parser.parse_args()
+    
+    # 屏蔽解析过程中的逐页日志，避免日志输出影响计时
+    logger = logging.getLogger('parse_pool_benchmark')
+    logger.addHandler(logging.NullHandler())
+    logger.propagate = False
+    
+    config = dict(DEFAULT_CONFIG, parser=args.parser)
+    pages = build_pages(args.pages)
+    crawler = WebCrawler(config, logger=logger)
+    
+    def parse_in_thread(body, encoding, url):
+        return crawler.parse_article(crawler._build_soup(body.decode(encoding, errors='replace'), 'article'), url)
+    
+    print(f"CPU核心数: {os.cpu_count()}，文章页: {len(pages)} 个，工作线程: {args.threads}，解析器: {args.parser}")
+    print(f"{'解析方式':<16}{'启动(s)':>10}{'耗时(s)':>10}{'页/秒':>10}{'加速比':>8}  结果")
+    try:
+        elapsed, expected = run_in_threads(parse_in_thread, pages, args.threads)
+        baseline = len(pages) / elapsed
+        print(f"{'工作线程':<16}{'-':>10}{elapsed:>10.2f}{baseline:>10.1f}{1.0:>8.1f}  -")
+        
+        failures = 0
+        for workers in args.workers:
+            start = time.perf_counter()
+            pool = ParsePool(config, workers)
+            try:
+                # 每个进程先解析一页，完成进程启动和提取计划编译
+                for future in [pool.submit(body, 'utf-8', url) for url, body in pages[:workers]]:
+                    future.result()
+                startup = time.perf_counter() - start
+                elapsed, results = run_in_threads(pool.parse, pages, args.threads)
+            finally:
+                pool.close()
+            same = results == expected
+            failures += not same
+            rate = len(pages) / elapsed
+            print(f"{f'{workers} 个解析进程':<16}{startup:>10.2f}{elapsed:>10.2f}{rate:>10.1f}{rate / baseline:>8.1f}  {'一致' if same else '不一致'}")
+    finally:
+        crawler.close()
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
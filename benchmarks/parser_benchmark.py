@@ -0,0 +1,172 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+页面解析器性能测试
+
+对每种解析器（以及bs4解析器的定向解析模式）分别测量建树（解析页面文本）和提取
+（parse_url_lists/parse_article）的单页耗时、建树时的内存峰值，
+并检查提取结果是否与html.parser完整解析一致。
+
+用法:
+    python benchmarks/parser_benchmark.py
+    python benchmarks/parser_benchmark.py --config config/xxx.json --list-page list.html --article-page article.html
+"""
+
+import argparse
+import json
+import logging
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+# 添加项目根目录到路径，以便导入core模块
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(current_dir))
+
+from core.crawler import WebCrawler
+from core.html_tree import PARSER_BACKENDS, LXML_AVAILABLE
+
+
+def build_list_page(items=40, nav_links=200):
+    """生成一个带导航栏和大量无关链接的列表页"""
+    nav = ''.join(f'<li><a href="/channel/{i}.html">栏目 {i}</a></li>' for i in range(nav_links))
+    rows = ''.join(
+        f'<li class="item"><a href="/news/2024/{i}.html" title="新闻 {i}">新闻标题 {i} 关于某项工作的通知</a>'
+        f'<span class="date">2024-05-{i % 28 + 1:02d}</span></li>'
+        for i in range(items)
+    )
+    return (
+        '<!DOCTYPE html><html><head><meta charset="utf-8"><title>列表</title>'
+        '<script>var config = {"a": 1, "b": [1, 2, 3]};</script><style>.nav li{float:left}</style></head><body>'
+        f'<div class="header"><ul class="nav">{nav}</ul></div>'
+        f'<div class="main"><div class="list"><ul>{rows}</ul></div></div>'
+        '<div class="footer">版权所有 2001-2024 <a href="/about.html">关于我们</a></div></body></html>'
+    )
+
+
+def build_article_page(paragraphs=60, nav_links=200):
+    """生成一个带导航栏、正文段落和发布时间的文章页"""
+    nav = ''.join(f'<li><a href="/channel/{i}.html">栏目 {i}</a></li>' for i in range(nav_links))
+    body = ''.join(
+        f'<p>第{i}段：这是一段用于测试解析速度的正文内容，包含<strong>加粗</strong>和<a href="/x/{i}">链接</a>。</p>'
+        for i in range(paragraphs)
+    )
+    return (
+        '<!DOCTYPE html><html><head><meta charset="utf-8"><title>文章</title>'
+        '<script>var config = {"a": 1};</script></head><body>'
+        f'<div class="header"><ul class="nav">{nav}</ul></div>'
+        '<div class="article"><h1>文章标题</h1>'
+        '<div class="info"><span class="publish-time">发布时间：2024-05-15 10:30:00</span></div>'
+        f'{body}</div>'
+        '<div class="footer">版权所有 2001-2024</div></body></html>'
+    )
+
+
+DEFAULT_CONFIG = {
+    'name': 'parser_benchmark',
+    'base_url': 'https://example.com/',
+    'url_list_config': {
+        'target_list_container': {'name': 'div', 'class': 'list', 'id': ''},
+        'target_list_item': {
+            'name': 'li',
+            'title': {'name': 'a', 'attr': 'text'},
+            'link': {'name': 'a', 'attr': 'href'}
+        }
+    },
+    'article_config': {
+        'target_container': {'name': 'div', 'class': 'article', 'id': ''},
+        'target_text_item': {'name': 'p', 'attr': 'text'}
+    },
+    'use_jsonl': False
+}
+
+
+def measure(crawler, text, target, extract, repeat):
+    """
+    多次解析同一页面，返回建树和提取的单页耗时中位数（毫秒）、建树时Python对象的内存峰值（KB）
+    以及最后一次的提取结果
+    """
+    tracemalloc.start()
+    crawler._build_soup(text, target)
+    peak_kb = tracemalloc.get_traced_memory()[1] / 1024
+    tracemalloc.stop()
+    
+    build_times = []
+    extract_times = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        document = crawler._build_soup(text, target)
+        built = time.perf_counter()
+        result = extract(crawler, document)
+        done = time.perf_counter()
+        build_times.append((built - start) * 1000)
+        extract_times.append((done - built) * 1000)
+    return statistics.median(build_times), statistics.median(extract_times), peak_kb, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="页面解析器性能测试")
+    parser.add_argument('--config', help="爬虫配置文件，使用其中的列表和文章提取配置，默认使用内置配置")
+    parser.add_argument('--list-page', help="列表页HTML文件，默认使用生成的页面")
+    parser.add_argument('--article-page', help="文章页HTML文件，默认使用生成的页面")
+    parser.add_argument('--repeat', type=int, default=50, help="每个页面的解析次数（默认50）")
+    args = parser.parse_args()
+    
+    config = dict(DEFAULT_CONFIG)
+    if args.config:
+        with open(args.config, 'r', encoding='utf-8') as f:
+            config.update(json.load(f))
+        config['use_jsonl'] = False
+    
+    pages = []
+    for label, path, build, target, extract in (
+        ('列表页', args.list_page, build_list_page, 'list', lambda crawler, doc: crawler.parse_url_lists(doc)),
+        ('文章页', args.article_page, build_article_page, 'article', lambda crawler, doc: crawler.parse_article(doc, 'benchmark')),
+    ):
+        if path:
+            with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                text = f.read()
+        else:
+            text = build()
+        pages.append((label, text, target, extract))
+    
+    # 屏蔽解析过程中的逐页日志，避免日志输出影响计时
+    logger = logging.getLogger('parser_benchmark')
+    logger.addHandler(logging.NullHandler())
+    logger.propagate = False
+    
+    backends = [name for name in PARSER_BACKENDS if name == 'html.parser' or LXML_AVAILABLE]
+    if not LXML_AVAILABLE:
+        print("未安装lxml，只测试html.parser")
+    # 定向解析只对基于bs4的解析器有效
+    modes = [(backend, False) for backend in backends]
+    modes += [(backend, True) for backend in backends if backend != 'lxml.html']
+    
+    print(f"{'页面':<6}{'解析器':<20}{'大小(KB)':>10}{'建树(ms)':>12}{'提取(ms)':>12}{'合计(ms)':>12}{'内存(KB)':>12}{'加速比':>8}  结果")
+    for label, text, target, extract in pages:
+        baseline_total = None
+        baseline_result = None
+        for backend, targeted in modes:
+            crawler = WebCrawler(dict(config, parser=backend, targeted_parse=targeted), logger=logger)
+            try:
+                build_ms, extract_ms, peak_kb, result = measure(crawler, text, target, extract, args.repeat)
+            finally:
+                crawler.close()
+            total = build_ms + extract_ms
+            if baseline_total is None:
+                baseline_total = total
+                baseline_result = result
+            same = '一致' if result == baseline_result else '不一致'
+            name = f"{backend}（定向）" if targeted else backend
+            # lxml元素树分配在C层，tracemalloc统计不到
+            memory = '-' if backend == 'lxml.html' else f"{peak_kb:.0f}"
+            print(f"{label:<6}{name:<20}{len(text.encode('utf-8')) / 1024:>10.1f}{build_ms:>12.2f}"
+                  f"{extract_ms:>12.2f}{total:>12.2f}{memory:>12}{baseline_total / total:>8.1f}  {same}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,176 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+文章时间提取的回归检查和性能测试
+
+用一组覆盖各种时间格式、选择器优先级和无效日期的页面，比较extract_time_from_page
+与原来逐个选择器、逐个正则查找的实现提取到的时间是否一致，并测量两者的单页耗时。
+
+用法:
+    python benchmarks/time_benchmark.py
+    python benchmarks/time_benchmark.py --parser lxml.html --repeat 200
+"""
+
+import argparse
+import logging
+import os
+import re
+import statistics
+import sys
+import time
+from datetime import datetime
+
+# 添加项目根目录到路径，以便导入core模块
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(current_dir))
+
+from core.crawler import WebCrawler
+from core.html_tree import PARSER_BACKENDS
+from parser_benchmark import build_article_page
+
+
+def page(body, head=''):
+    return f'<html><head><meta charset="utf-8">{head}</head><body>{body}</body></html>'
+
+
+# 回归页面：(说明, HTML)
+CORPUS = [
+    ('time标签的datetime属性', page('<time datetime="2024-05-15 10:30:00">5月15日</time>')),
+    ('datetime属性无效时使用元素文本', page('<time datetime="yesterday">2024-05-14 08:00</time>')),
+    ('ISO格式按年月日匹配', page('<span class="time">2024-05-15T10:30:00</span>')),
+    ('带毫秒的时间', page('<span class="time">2024-05-15 10:30:00.123</span>')),
+    ('斜杠分隔', page('<div class="date">2024/05/15 10:30</div>')),
+    ('中文单位数月日', page('<p class="publish-time">发布时间：2024年5月6日 09:05</p>')),
+    ('中文年月日', page('<span class="date">2024年12月1日</span>')),
+    ('只有月日', page('<span class="date">5月15日</span>')),
+    ('月日时分', page('<span class="date">05-15 10:30</span>')),
+    ('格式优先于位置', page('<span class="time">更新于 05-16 11:00，发布于 2024-05-15</span>')),
+    ('无效日期时尝试下一种格式', page('<span class="time">2024-13-45 10:30 / 05/16 11:00</span>')),
+    ('所有格式都无效时尝试下一个元素', page('<span class="time">2024-02-30</span><span class="date">2024-03-01 12:00</span>')),
+    ('选择器优先于页面顺序', page('<span class="date">2023-01-01 00:00:00</span><time>2024-05-15 10:30:00</time>')),
+    ('同一选择器按页面顺序', page('<span class="time">2024-01-02 03:04:05</span><span class="time">2024-05-15 10:30:00</span>')),
+    ('class包含time的span', page('<span class="info-timeline">2024-05-15 10:30</span><div class="update-time">2024-06-01 09:00</div>')),
+    ('published类', page('<div class="meta"><abbr class="published">2024-05-15 10:30:00</abbr></div>')),
+    ('时间元素为空时搜索页面文本', page('<span class="time"></span><p>发布于 2024-05-15 10:30</p>')),
+    ('只有页面文本', page('<div>来源：本站 2024年5月15日 10:30:00 浏览次数：100</div>')),
+    ('页面文本中格式优先于位置', page('<div>12-31 23:59 转载 2024/05/15</div>')),
+    ('页面文本中的无效日期', page('<div>编号 2024-99-99，发布 2024-05-15</div>')),
+    ('脚本中的日期', page('<div>正文</div>', '<script>var d = "2024-05-15 10:30:00";</script>')),
+    ('没有时间', page('<div class="article"><p>没有任何日期的正文</p></div>')),
+    ('生成的文章页', build_article_page()),
+    ('生成的文章页（无时间）', build_article_page().replace('2024-05-15 10:30:00', '')),
+]
+
+
+class LegacyTimeCrawler(WebCrawler):
+    """原来逐个选择器查找、逐个正则匹配的时间提取实现，作为回归基准"""
+    
+    TIME_PATTERNS = [
+        r'(\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2})',
+        r'(\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2})',
+        r'(\d{4}-\d{2}-\d{2})',
+        r'(\d{4}/\d{2}/\d{2}\s+\d{2}:\d{2}:\d{2})',
+        r'(\d{4}/\d{2}/\d{2}\s+\d{2}:\d{2})',
+        r'(\d{4}/\d{2}/\d{2})',
+        r'(\d{4}年\d{1,2}月\d{1,2}日\s+\d{2}:\d{2}:\d{2})',
+        r'(\d{4}年\d{1,2}月\d{1,2}日\s+\d{2}:\d{2})',
+        r'(\d{4}年\d{1,2}月\d{1,2}日)',
+        r'(\d{2}-\d{2}\s+\d{2}:\d{2})',
+        r'(\d{2}/\d{2}\s+\d{2}:\d{2})',
+        r'(\d{1,2}月\d{1,2}日)',
+        r'(\d{1,2}月\d{1,2}日\s+\d{2}:\d{2})',
+        r'(\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2})',
+        r'(\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2}\.\d{3})'
+    ]
+    
+    TIME_SELECTORS = [
+        'time', '.time', '.date', '.publish-time',
+        '.publish_date', '.article-time', '.post-date',
+        '[datetime]', '.entry-date', '.published',
+        '.news-time', '.article-date', '.post-time',
+        '.release-time', '.update-time', '.create-time',
+        '.meta-time', '.timestamp', 'span[class*="time"]',
+        'span[class*="date"]', 'div[class*="time"]',
+        'div[class*="date"]', 'p[class*="time"]',
+        'p[class*="date"]'
+    ]
+    
+    def extract_time_from_page(self, soup):
+        for selector in self.TIME_SELECTORS:
+            for element in soup.select(selector):
+                if element.has_attr('datetime'):
+                    parsed_time = self._parse_time_text(element['datetime'])
+                    if parsed_time:
+                        return parsed_time
+                time_text = element.get_text(strip=True)
+                if time_text:
+                    for pattern in self.TIME_PATTERNS:
+                        match = re.search(pattern, time_text)
+                        if match:
+                            parsed_time = self._parse_time_text(match.group(1))
+                            if parsed_time:
+                                return parsed_time
+        page_text = soup.get_text()
+        for pattern in self.TIME_PATTERNS:
+            matches = re.findall(pattern, page_text)
+            if matches:
+                parsed_time = self._parse_time_text(matches[0])
+                if parsed_time:
+                    return parsed_time
+        return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+
+def timed(extract, document, repeat):
+    """多次提取同一页面的时间，返回单页耗时中位数（毫秒）"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        extract(document)
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="文章时间提取的回归检查和性能测试")
+    parser.add_argument('--parser', choices=PARSER_BACKENDS, default='html.parser', help="页面解析器（默认html.parser）")
+    parser.add_argument('--repeat', type=int, default=50, help="每个页面的提取次数（默认50）")
+    args = parser.parse_args()
+    
+    # 屏蔽提取过程中的逐页日志，避免日志输出影响计时
+    logger = logging.getLogger('time_benchmark')
+    logger.addHandler(logging.NullHandler())
+    logger.propagate = False
+    
+    config = {'name': 'time_benchmark', 'base_url': 'https://example.com/', 'parser': args.parser, 'use_jsonl': False}
+    crawler = WebCrawler(config, logger=logger)
+    legacy = LegacyTimeCrawler(config, logger=logger)
+    
+    failures = 0
+    print(f"{'页面':<28}{'提取结果':<22}{'原实现(ms)':>12}{'单次遍历(ms)':>14}{'加速比':>8}")
+    try:
+        for label, html in CORPUS:
+            document = crawler._build_soup(html)
+            expected = legacy.extract_time_from_page(document)
+            actual = crawler.extract_time_from_page(document)
+            if actual != expected:
+                # 只有日期的时间用当前时刻补全，跨秒时重新比较一次
+                expected = legacy.extract_time_from_page(document)
+                actual = crawler.extract_time_from_page(document)
+            same = actual == expected
+            failures += not same
+            
+            legacy_ms = timed(legacy.extract_time_from_page, document, args.repeat)
+            current_ms = timed(crawler.extract_time_from_page, document, args.repeat)
+            result = actual if same else f"{actual} != {expected}"
+            print(f"{label:<28}{result:<22}{legacy_ms:>12.3f}{current_ms:>14.3f}{legacy_ms / current_ms:>8.1f}")
+    finally:
+        crawler.close()
+        legacy.close()
+    
+    print(f"\n{len(CORPUS) - failures}/{len(CORPUS)} 个页面结果一致")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,172 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+时间文本解析的性能测试
+
+比较原来逐个尝试strptime格式的_parse_time_text与按指纹选择格式并缓存结果的
+parse_time_text：检查两者对每个时间文本的解析结果是否一致，并测量在整个语料上的耗时
+（冷缓存为每轮开始前清空缓存，热缓存为缓存已填满）。
+
+默认语料模拟一次多站点爬取：每个站点使用一种时间格式，只显示日期的站点同一天的文章共用
+同一个时间文本，另有少量无法解析的文本。也可以用--input指定每行一个时间文本的文件。
+
+用法:
+    python benchmarks/time_parse_benchmark.py
+    python benchmarks/time_parse_benchmark.py --input times.txt --repeat 20
+"""
+
+import argparse
+import os
+import random
+import re
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+
+# 添加项目根目录到路径，以便导入core模块
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(current_dir))
+
+from core.time_extractor import parse_time_text, parse_time_parts
+
+# 各站点的时间写法
+SITE_FORMATS = [
+    '{d:%Y-%m-%d}',
+    '{d:%Y-%m-%d %H:%M}',
+    '{d:%Y-%m-%d %H:%M:%S}',
+    '{d:%Y/%m/%d}',
+    '{d:%Y/%m/%d %H:%M}',
+    '{d.year}年{d.month}月{d.day}日',
+    '{d.year}年{d:%m}月{d:%d}日 {d:%H:%M}',
+    '{d:%m-%d %H:%M}',
+    '{d.month}月{d.day}日',
+    '{d:%Y-%m-%dT%H:%M:%S}',
+    '{d:%Y-%m-%d %H:%M:%S}.123',
+    '{d.year}年{d.month}月{d.day}日{d.hour}时{d.minute}分',
+]
+
+# 无法解析或需要回退的文本
+NOISE = ['2024-13-45', '2024-02-30', '99月99日', '2024年5月15日 25:00', '2024-05-15 10:30:00 更新', '昨天']
+
+
+def build_corpus(sites=24, days=90, articles_per_day=8, seed=1):
+    """
+    生成模拟语料：按站点依次爬取，每个站点每天若干篇文章，
+    每篇文章的时间文本在列表页和文章页中各出现一次
+    """
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1, 8, 0, 0)
+    corpus = []
+    for site in range(sites):
+        fmt = SITE_FORMATS[site % len(SITE_FORMATS)]
+        site_texts = []
+        for day in range(days):
+            for _ in range(articles_per_day):
+                moment = start + timedelta(days=day, minutes=rng.randrange(600))
+                site_texts.append(fmt.format(d=moment))
+        site_texts.extend(NOISE)
+        rng.shuffle(site_texts)
+        corpus.extend(site_texts * 2)
+    return corpus
+
+
+def legacy_parse_time_text(time_text):
+    """原来的_parse_time_text：依次尝试所有格式，再用正则提取中文日期"""
+    try:
+        time_text = re.sub(r'(\d{4})年(\d{1,2})月(\d{1,2})日', lambda m: f"{m.group(1)}年{m.group(2).zfill(2)}月{m.group(3).zfill(2)}日", time_text)
+        time_formats = [
+            '%Y-%m-%d %H:%M:%S', '%Y-%m-%d %H:%M', '%Y-%m-%d',
+            '%Y/%m/%d %H:%M:%S', '%Y/%m/%d %H:%M', '%Y/%m/%d',
+            '%Y年%m月%d日 %H:%M:%S', '%Y年%m月%d日 %H:%M', '%Y年%m月%d日',
+            '%m-%d %H:%M', '%m/%d %H:%M', '%m月%d日', '%m月%d日 %H:%M',
+            '%Y-%m-%dT%H:%M:%S', '%Y-%m-%d %H:%M:%S.%f'
+        ]
+        for fmt in time_formats:
+            try:
+                parsed_time = datetime.strptime(time_text, fmt)
+                if fmt in ['%Y-%m-%d', '%Y/%m/%d', '%Y年%m月%d日', '%m月%d日']:
+                    now = datetime.now()
+                    parsed_time = parsed_time.replace(hour=now.hour, minute=now.minute, second=now.second)
+                return parsed_time.strftime('%Y-%m-%d %H:%M:%S')
+            except ValueError:
+                continue
+        year_month_day_match = re.search(r'(\d{4})年(\d{1,2})月(\d{1,2})日', time_text)
+        if year_month_day_match:
+            year = int(year_month_day_match.group(1))
+            month = int(year_month_day_match.group(2))
+            day = int(year_month_day_match.group(3))
+            hour_min_sec_match = re.search(r'(\d{1,2})[时:](\d{1,2})(?:[分:](\d{1,2}))?', time_text)
+            if hour_min_sec_match:
+                hour = int(hour_min_sec_match.group(1))
+                minute = int(hour_min_sec_match.group(2))
+                second = int(hour_min_sec_match.group(3)) if hour_min_sec_match.group(3) else 0
+            else:
+                now = datetime.now()
+                hour, minute, second = now.hour, now.minute, now.second
+            try:
+                return datetime(year, month, day, hour, minute, second).strftime('%Y-%m-%d %H:%M:%S')
+            except ValueError:
+                pass
+        return None
+    except Exception:
+        return None
+
+
+def run(parse, corpus, repeat, before=None):
+    """多轮解析整个语料，返回每轮耗时的中位数（毫秒）"""
+    times = []
+    for _ in range(repeat):
+        if before:
+            before()
+        start = time.perf_counter()
+        for text in corpus:
+            parse(text)
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="时间文本解析的性能测试")
+    parser.add_argument('--input', help="每行一个时间文本的语料文件，默认使用生成的语料")
+    parser.add_argument('--repeat', type=int, default=10, help="解析整个语料的轮数（默认10）")
+    args = parser.parse_args()
+    
+    if args.input:
+        with open(args.input, 'r', encoding='utf-8') as f:
+            corpus = [line.strip() for line in f if line.strip()]
+    else:
+        corpus = build_corpus()
+    
+    mismatches = []
+    for text in set(corpus):
+        expected, actual = legacy_parse_time_text(text), parse_time_text(text)
+        if actual != expected:
+            # 只有日期的时间用当前时刻补全，跨秒时重新比较一次
+            expected, actual = legacy_parse_time_text(text), parse_time_text(text)
+            if actual != expected:
+                mismatches.append((text, expected, actual))
+    
+    legacy_ms = run(legacy_parse_time_text, corpus, args.repeat)
+    # 不经过缓存，只比较按指纹选择格式的效果
+    uncached_ms = run(parse_time_parts.__wrapped__, corpus, args.repeat)
+    cold_ms = run(parse_time_text, corpus, args.repeat, before=parse_time_parts.cache_clear)
+    parse_time_parts.cache_clear()
+    for text in corpus:
+        parse_time_text(text)
+    warm_ms = run(parse_time_text, corpus, args.repeat)
+    
+    print(f"语料: {len(corpus)} 个时间文本，{len(set(corpus))} 个不同文本")
+    print(f"{'实现':<24}{'耗时(ms)':>12}{'单条(us)':>12}{'加速比':>8}")
+    for label, elapsed in (('逐个尝试格式', legacy_ms), ('指纹（不缓存）', uncached_ms), ('指纹+缓存（冷缓存）', cold_ms), ('指纹+缓存（热缓存）', warm_ms)):
+        print(f"{label:<24}{elapsed:>12.2f}{elapsed * 1000 / len(corpus):>12.2f}{legacy_ms / elapsed:>8.1f}")
+    
+    for text, expected, actual in mismatches[:20]:
+        print(f"不一致: {text!r} 原结果 {expected} 新结果 {actual}")
+    print(f"\n{len(set(corpus)) - len(mismatches)}/{len(set(corpus))} 个不同文本结果一致")
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
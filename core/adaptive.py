@@ -0,0 +1,180 @@
+import asyncio
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from .page_result import is_server_failure
+
+# 表示服务端要求降速的状态码
+THROTTLE_STATUS_CODES = (429, 503)
+
+
+def parse_retry_after(value):
+    """
+    解析Retry-After响应头
+    
+    Args:
+        value (str): 响应头的值，可以是秒数或HTTP日期
+    
+    Returns:
+        float: 需要等待的秒数，无法解析时返回None
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_time = parsedate_to_datetime(value)
+        if retry_time.tzinfo is None:
+            retry_time = retry_time.replace(tzinfo=timezone.utc)
+        return max(0.0, (retry_time - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+class ConcurrencyGate:
+    """
+    上限可动态调整的并发闸门
+    
+    工作线程数按最大并发数创建，实际同时在途的请求数由闸门的当前上限控制。
+    """
+    
+    def __init__(self, limit):
+        """
+        初始化并发闸门
+        
+        Args:
+            limit (int): 初始并发上限
+        """
+        self._condition = threading.Condition()
+        self.limit = max(1, int(limit))
+        self.active = 0
+    
+    def set_limit(self, limit):
+        """调整并发上限，上限提高时唤醒等待的线程"""
+        with self._condition:
+            self.limit = max(1, int(limit))
+            self._condition.notify_all()
+    
+    def try_acquire(self):
+        """尝试占用一个并发名额，不阻塞"""
+        with self._condition:
+            if self.active < self.limit:
+                self.active += 1
+                return True
+            return False
+    
+    def acquire(self):
+        """阻塞当前线程直到获得并发名额"""
+        with self._condition:
+            while self.active >= self.limit:
+                self._condition.wait()
+            self.active += 1
+    
+    async def acquire_async(self, poll_interval=0.05):
+        """在事件循环中等待直到获得并发名额"""
+        while not self.try_acquire():
+            await asyncio.sleep(poll_interval)
+    
+    def release(self):
+        """释放并发名额"""
+        with self._condition:
+            self.active -= 1
+            self._condition.notify()
+
+
+class AdaptiveController:
+    """
+    AIMD自适应并发控制器
+    
+    根据响应延迟和请求结果调整并发数和请求速率：
+    响应正常时每轮（约等于当前并发数个成功响应）加性增加，
+    被限流（429/503）、服务端出错（5xx）、连接失败或超时（包括读取正文超时），
+    以及延迟超过目标值时乘性减少，并在冷却时间内不重复减少。
+    """
+    
+    def __init__(self, config, initial_concurrency, initial_rate, log=None, on_rate_change=None):
+        """
+        初始化自适应控制器
+        
+        Args:
+            config (dict): adaptive配置
+            initial_concurrency (int): 初始并发数
+            initial_rate (float): 初始每秒请求数
+            log: 日志函数，接收一条消息
+            on_rate_change: 速率变化回调，接收新的每秒请求数
+        """
+        self._lock = threading.Lock()
+        self.min_concurrency = max(1, int(config.get('min_concurrency', 1)))
+        self.max_concurrency = max(self.min_concurrency, int(config.get('max_concurrency', 16)))
+        self.min_rate = float(config.get('min_rate', 0.5))
+        self.max_rate = max(self.min_rate, float(config.get('max_rate', 20)))
+        self.rate_step = float(config.get('rate_step', 0.5))
+        self.target_latency = config.get('target_latency_ms', 2000) / 1000  # 转换为秒
+        self.decrease_factor = float(config.get('decrease_factor', 0.5))
+        self.cooldown = max(1.0, self.target_latency)
+        
+        self.concurrency = min(self.max_concurrency, max(self.min_concurrency, int(initial_concurrency)))
+        self.rate = min(self.max_rate, max(self.min_rate, float(initial_rate or self.min_rate)))
+        self.latency_ewma = None
+        self._successes = 0
+        self._last_decrease = 0.0
+        
+        self.gate = ConcurrencyGate(self.concurrency)
+        self._log = log
+        self._on_rate_change = on_rate_change
+    
+    def record(self, status, latency, failure=None):
+        """
+        记录一次响应并按需调整并发数和速率
+        
+        Args:
+            status (int): HTTP状态码，连接失败时为None
+            latency (float): 响应耗时（秒）
+            failure (optional): 失败类别，见PageResult.failure
+        """
+        with self._lock:
+            if self.latency_ewma is None:
+                self.latency_ewma = latency
+            else:
+                self.latency_ewma = 0.8 * self.latency_ewma + 0.2 * latency
+            
+            now = time.monotonic()
+            failed = is_server_failure(status, failure)
+            if failed or self.latency_ewma > self.target_latency:
+                if now - self._last_decrease < self.cooldown:
+                    return
+                self._last_decrease = now
+                self._successes = 0
+                concurrency = max(self.min_concurrency, int(self.concurrency * self.decrease_factor))
+                rate = max(self.min_rate, self.rate * self.decrease_factor)
+                if not failed:
+                    reason = f"平均延迟 {self.latency_ewma:.2f} 秒"
+                elif status is not None and status >= 400:
+                    reason = f"状态码 {status}"
+                else:
+                    reason = f"请求失败（{failure or 'connection'}）"
+            else:
+                self._successes += 1
+                if self._successes < self.concurrency:
+                    return
+                self._successes = 0
+                concurrency = min(self.max_concurrency, self.concurrency + 1)
+                rate = min(self.max_rate, self.rate + self.rate_step)
+                reason = "响应正常"
+            
+            if concurrency == self.concurrency and rate == self.rate:
+                return
+            
+            if self._log:
+                self._log(f"自适应调整（{reason}）: 并发数 {self.concurrency} -> {concurrency}, "
+                          f"速率 {self.rate:.2f} -> {rate:.2f} 次/秒")
+            self.concurrency = concurrency
+            self.rate = rate
+            
+            self.gate.set_limit(concurrency)
+            if self._on_rate_change:
+                self._on_rate_change(rate)
@@ -0,0 +1,513 @@
+import asyncio
+import random
+import time
+from collections import deque
+from concurrent.futures.process import BrokenProcessPool
+from .crawler import WebCrawler, _served_from_cache
+from .adaptive import parse_retry_after
+from .page_result import PageResult
+from .charset import detect_encoding
+
+# 尝试导入aiohttp模块
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+
+class AsyncWebCrawler(WebCrawler):
+    """
+    基于asyncio的爬虫引擎
+    
+    与WebCrawler使用相同的配置、进度回调以及crawl()/test_config()/stop()接口。
+    爬取流程的编排仍由WebCrawler完成（运行在事件循环的执行器线程中），
+    只有页面请求、链接收集和文章爬取阶段在事件循环中运行，
+    因此单个线程即可同时保持数百个请求在途。构建页面对象、解析文章和保存结果
+    在执行器线程中运行，不会阻塞其他在途请求。
+    """
+    
+    def __init__(self, config, logger=None, progress_callback=None):
+        """
+        初始化异步爬虫
+        
+        Args:
+            config (dict): 爬虫配置
+            logger: 日志记录器
+            progress_callback: 进度回调函数，接收(current, total, message)参数
+        """
+        if not AIOHTTP_AVAILABLE:
+            raise ImportError("异步爬虫引擎需要aiohttp，请先执行: pip install aiohttp")
+        
+        super().__init__(config, logger, progress_callback)
+        
+        # 事件循环和HTTP会话，在crawl()/test_config()运行期间有效
+        self._loop = None
+        self._client = None
+    
+    def crawl_multi_pages(self):
+        """在事件循环中执行多页爬取"""
+        return asyncio.run(self._run_in_session(super().crawl_multi_pages))
+    
+    def test_config(self, max_pages=2, max_articles=3):
+        """测试配置是否正确，请求通过事件循环发送"""
+        return asyncio.run(self._run_in_session(super().test_config, max_pages, max_articles))
+    
+    async def _run_in_session(self, func, *args):
+        """打开HTTP会话，并在执行器线程中运行同步的流程编排函数"""
+        self._loop = asyncio.get_running_loop()
+        # 连接池设置与多线程引擎共用connection_pool配置
+        pool_config = self.pool_config
+        if pool_config['keep_alive']:
+            keep_alive_options = {'keepalive_timeout': pool_config['keepalive_timeout']}
+        else:
+            keep_alive_options = {'force_close': True}
+        connector = aiohttp.TCPConnector(
+            limit=pool_config['max_hosts'] * pool_config['max_per_host'],
+            limit_per_host=pool_config['max_per_host'],
+            **keep_alive_options
+        )
+        # total为单个请求（含读取正文）的总时限，sock_read为两次读取之间的最长间隔
+        timeout = aiohttp.ClientTimeout(
+            total=self.request_deadline if self.request_deadline > 0 else None,
+            sock_connect=self.connect_timeout,
+            sock_read=self.read_timeout
+        )
+        try:
+            async with aiohttp.ClientSession(headers=self.headers, connector=connector, timeout=timeout) as client:
+                self._client = client
+                return await self._loop.run_in_executor(None, func, *args)
+        finally:
+            self._client = None
+            self._loop = None
+    
+    def _call_async(self, coro):
+        """从执行器线程提交协程到事件循环并等待结果"""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+    
+    def fetch_page(self, url, attempt=1, defer_retry=False, headers=None, target=None, raw=False):
+        """
+        获取页面（同步接口，供串行流程在执行器线程中调用）
+        
+        事件循环中的重试等待不会阻塞其他请求，因此忽略defer_retry。
+        
+        Args:
+            url (str): 页面URL
+            attempt (int): 本次请求的尝试次数，从1开始
+            defer_retry (bool): 未使用
+            headers (dict, optional): 额外的请求头
+            target (str, optional): 页面类型，见WebCrawler.get_page
+            raw (bool): 为True时不构建页面对象，见WebCrawler.fetch_page
+        
+        Returns:
+            PageResult: 请求结果
+        """
+        result = self._call_async(self.fetch_page_async(url, attempt, headers, target, raw))
+        # 协程在事件循环的上下文中运行，需要在当前线程中重新记录缓存命中情况
+        _served_from_cache.set(result.from_cache)
+        return result
+    
+    async def get_page_async(self, url, target=None):
+        """
+        异步获取页面内容
+        
+        Args:
+            url (str): 页面URL
+            target (str, optional): 页面类型，见WebCrawler.get_page
+        
+        Returns:
+            BeautifulSoup或LxmlDocument: 解析后的页面对象，失败返回None
+        """
+        result = await self.fetch_page_async(url, target=target)
+        return result.soup
+    
+    async def fetch_page_async(self, url, attempt=1, headers=None, target=None, raw=False):
+        """
+        异步获取页面，失败时按重试策略重试，等待重试期间不阻塞其他请求
+        
+        Args:
+            url (str): 页面URL
+            attempt (int): 本次请求的尝试次数，从1开始
+            headers (dict, optional): 额外的请求头
+            target (str, optional): 页面类型，见WebCrawler.get_page
+            raw (bool): 为True时不构建页面对象，见WebCrawler.fetch_page
+        
+        Returns:
+            PageResult: 请求结果
+        """
+        # 达到爬取预算或收到停止请求后不再获取页面（包括缓存中的页面）
+        self._enforce_budget()
+        if self.is_stopped():
+            return PageResult(url, failure='stopped')
+        result = await self._run_blocking(self._load_cached_page, url, target, raw)
+        _served_from_cache.set(result is not None)
+        if result is not None:
+            return result
+        
+        parked = False
+        while True:
+            # 主机熔断期间暂缓请求，不计入尝试次数；等待期间不阻塞其他请求
+            wait = self._circuit_wait(url)
+            if wait:
+                if not parked:
+                    parked = True
+                    self._add_stat('parked')
+                if self.is_stopped():
+                    return PageResult(url, failure='circuit_open')
+                await asyncio.sleep(min(wait, 0.5))
+                continue
+            
+            result = await self._fetch_page_once_async(url, headers, target, raw)
+            if result.failure is None:
+                return result
+            
+            delay = self.retry_policy.get_delay(result.failure, attempt, result.retry_after)
+            if delay is None or self.is_stopped():
+                if attempt > 1:
+                    self.log(f"已重试 {attempt - 1} 次仍然失败，放弃: {url}")
+                return result
+            
+            self.log(f"请求失败（{result.failure}），{delay:.1f} 秒后第 {attempt + 1} 次尝试: {url}")
+            await asyncio.sleep(delay)
+            attempt += 1
+    
+    async def _sleep_unless_stopped_async(self, seconds):
+        """分段等待，不阻塞事件循环，含义与WebCrawler._sleep_unless_stopped相同"""
+        deadline = time.monotonic() + seconds
+        while not self.is_stopped():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return True
+            await asyncio.sleep(min(remaining, 0.5))
+        return False
+    
+    async def _acquire_rate_limit_async(self, url):
+        """按主机限速等待令牌，不阻塞事件循环，含义与WebCrawler._acquire_rate_limit相同"""
+        limiter = self._get_rate_limiter(url)
+        if not limiter:
+            return True
+        wait = limiter.reserve()
+        if wait > 0 and not await self._sleep_unless_stopped_async(wait):
+            limiter.release()
+            return False
+        return True
+    
+    async def _fetch_page_once_async(self, url, headers=None, target=None, raw=False):
+        """
+        异步发送一次请求并解析页面
+        
+        Args:
+            url (str): 页面URL
+            headers (dict, optional): 额外的请求头
+            target (str, optional): 页面类型，见WebCrawler.get_page
+            raw (bool): 为True时不构建页面对象，见WebCrawler.fetch_page
+        
+        Returns:
+            PageResult: 请求结果，含义与WebCrawler._fetch_page_once相同
+        """
+        # 按主机限速，等待令牌时不阻塞其他请求；等待期间收到停止请求时不再发送
+        if not await self._acquire_rate_limit_async(url):
+            return PageResult(url, failure='stopped')
+        
+        # 自适应模式下受并发闸门控制；闸门保持到正文读取完成，反馈的延迟也包含读取正文的时间
+        gate = self.adaptive.gate if self.adaptive else None
+        if gate:
+            await gate.acquire_async()
+        start = time.monotonic()
+        status = None
+        response_headers = None
+        failure = None
+        try:
+            async with self._client.get(url, headers=headers) as response:
+                status = response.status
+                response_headers = response.headers
+                if status >= 400:
+                    self.log(f"获取页面失败: {url}, 状态码: {status}")
+                    retry_after = parse_retry_after(response_headers.get('Retry-After'))
+                    return PageResult(url, status=status, headers=response_headers, failure=status, retry_after=retry_after)
+                if status == 304:
+                    return PageResult(url, status=status, headers=response_headers)
+                if not self._check_response_headers(url, response_headers):
+                    return PageResult(url, status=status, headers=response_headers, failure='skipped')
+                body = await self._read_body_async(url, response)
+                if body is None:
+                    return PageResult(url, status=status, headers=response_headers, failure='skipped')
+        except asyncio.TimeoutError as e:
+            self.log(f"获取页面超时: {url}, 错误: {str(e)}")
+            failure = 'timeout'
+            return PageResult(url, failure=failure)
+        except (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError) as e:
+            # 正文被截断或连接在读取正文时被重置，与多线程引擎的读取错误一样按连接失败重试
+            self.log(f"获取页面连接失败: {url}, 错误: {str(e)}")
+            failure = 'connection'
+            return PageResult(url, failure=failure)
+        except Exception as e:
+            self.log(f"获取页面失败: {url}, 错误: {str(e)}")
+            return PageResult(url, status=status, failure='error')
+        finally:
+            if gate:
+                gate.release()
+            self._record_response(url, status, time.monotonic() - start, response_headers, failure)
+        
+        return await self._run_blocking(self._build_page_result, url, body, status, response_headers, target, raw)
+    
+    def _build_page_result(self, url, body, status, response_headers, target=None, raw=False):
+        """检测编码、构建页面对象并写入响应缓存，在执行器线程中运行"""
+        try:
+            encoding = detect_encoding(url, response_headers.get('Content-Type'), body)
+            soup = None if raw else self._build_soup(body.decode(encoding, errors='replace'), target)
+            self._store_cached_page(url, body, encoding, status, response_headers)
+            return PageResult(url, soup=soup, status=status, headers=response_headers, body=body, encoding=encoding)
+        except Exception as e:
+            self.log(f"获取页面失败: {url}, 错误: {str(e)}")
+            return PageResult(url, status=status, headers=response_headers, failure='error')
+    
+    async def _run_blocking(self, func, *args):
+        """在执行器线程中运行构建页面对象、解析文章和写入文件等耗时的同步操作，避免阻塞事件循环中的其他请求"""
+        return await self._loop.run_in_executor(None, func, *args)
+    
+    async def _read_body_async(self, url, response):
+        """
+        分块读取响应正文，超过大小上限时立即停止读取
+        
+        Args:
+            url (str): 页面URL
+            response (aiohttp.ClientResponse): 响应对象
+        
+        Returns:
+            bytes: 响应正文，超过大小上限时返回None
+        """
+        chunks = []
+        size = 0
+        async for chunk in response.content.iter_chunked(self.download_chunk_size):
+            chunks.append(chunk)
+            size += len(chunk)
+            self._add_stat('bytes_downloaded', len(chunk))
+            if self._body_too_large(url, size):
+                return None
+        self._add_stat('pages_fetched')
+        self._enforce_budget()
+        return b''.join(chunks)
+    
+    def _page_exists(self, url):
+        """发送探测请求判断页面是否存在（同步接口，探测流程在执行器线程中运行）"""
+        return self._call_async(self._page_exists_async(url))
+    
+    async def _page_exists_async(self, url):
+        """
+        异步发送探测请求判断页面是否存在
+        
+        Args:
+            url (str): 页面URL
+        
+        Returns:
+            bool: 页面是否存在，请求失败或被限流等无法判断的情况返回None
+        """
+        try:
+            if not await self._acquire_rate_limit_async(url):
+                return None
+            
+            status = None
+            if self._probe_method == 'HEAD':
+                async with self._client.head(url, allow_redirects=True) as response:
+                    status = response.status
+                if status in (405, 501):
+                    self.log("服务端不支持HEAD请求，改用Range请求探测")
+                    self._probe_method = 'RANGE'
+            if self._probe_method == 'RANGE':
+                async with self._client.get(url, headers={'Range': 'bytes=0-0'}) as response:
+                    status = response.status
+        except Exception as e:
+            self.log(f"探测页面失败: {url}, 错误: {str(e)}")
+            return None
+        
+        if status == 429 or status >= 500:
+            self.log(f"探测页面失败: {url}, 状态码: {status}")
+            return None
+        return status < 400
+    
+    async def _get_url_list_async(self, page_url):
+        """异步获取列表页并解析链接，启用条件请求时未变化的列表页直接复用上次的解析结果"""
+        headers = self._list_conditional_headers(page_url)
+        result = await self.fetch_page_async(page_url, headers=headers, target='list')
+        if self._lost_list_links(result):
+            result = await self.fetch_page_async(page_url, target='list')
+        return await self._run_blocking(self._handle_url_list_result, result)
+    
+    async def random_delay_async(self):
+        """随机延迟，不阻塞事件循环；启用按主机限速或页面来自缓存时不再额外延迟"""
+        if self.requests_per_second > 0 or _served_from_cache.get():
+            return
+        delay = random.uniform(self.delay_min, self.delay_max)
+        self.log(f"随机延迟 {delay:.2f} 秒")
+        await asyncio.sleep(delay)
+    
+    async def _iter_url_batches_async(self, config):
+        """在滑动窗口内并行获取列表页，按页码顺序逐页产出解析出的链接，含义与WebCrawler._iter_url_batches相同"""
+        page_indexes = iter(range(config['url_multi_page_start'], config['url_multi_page_stop'] + 1))
+        window = self.list_page_concurrency
+        pending = deque()
+        
+        def fill_window():
+            while len(pending) < window and not self.is_stopped():
+                page_index = next(page_indexes, None)
+                if page_index is None:
+                    return
+                page_url = self._page_url(config, page_index)
+                self.log(f"正在处理第 {page_index} 页: {page_url}")
+                pending.append((page_index, page_url, asyncio.create_task(self._fetch_list_page_async(page_url))))
+        
+        try:
+            fill_window()
+            while pending:
+                # 检查是否应该停止
+                if self.is_stopped():
+                    self.log("在收集链接过程中收到停止请求")
+                    break
+                
+                page_index, page_url, task = pending.popleft()
+                url_data = await task
+                if url_data is None:
+                    self.log(f"获取页面内容失败: {page_url}")
+                    if pending:
+                        self.log(f"已到达最后一页，取消第 {page_index} 页之后的 {len(pending)} 个列表页请求")
+                    break
+                
+                if url_data:
+                    self.log(f"第 {page_index} 页找到 {len(url_data)} 个链接")
+                else:
+                    self.log(f"第 {page_index} 页没有找到任何链接")
+                yield url_data
+                
+                fill_window()
+        finally:
+            for _, _, task in pending:
+                task.cancel()
+            await asyncio.gather(*(task for _, _, task in pending), return_exceptions=True)
+    
+    async def _fetch_list_page_async(self, page_url):
+        """异步获取列表页并解析链接，完成后执行随机延迟；获取失败返回None"""
+        if self.is_stopped():
+            return []
+        url_data = await self._get_url_list_async(page_url)
+        if url_data is not None:
+            await self.random_delay_async()
+        return url_data
+    
+    def _crawl_pipeline(self, config):
+        """以生产者/消费者流水线的方式收集链接并爬取文章"""
+        return self._call_async(self._crawl_pipeline_async(config))
+    
+    async def _crawl_pipeline_async(self, config):
+        """在事件循环中获取列表页，解析出的链接通过有界队列立即交给文章爬取任务"""
+        worker_count = self._worker_count()
+        self.log(f"开始异步爬取，列表页解析出的链接将立即交给 {worker_count} 个文章爬取任务")
+        
+        self._processed_count = 0
+        self._total_links = 0
+        self._pages_done = 0
+        
+        work_queue = asyncio.Queue(maxsize=self.link_queue_size)
+        workers = [asyncio.create_task(self._article_worker_async(work_queue)) for _ in range(worker_count)]
+        
+        found_count = 0
+        seen_urls = set()
+        batches = self._iter_url_batches_async(config)
+        try:
+            async for url_data in batches:
+                found_count += len(url_data)
+                new_items = self._dedup_links(url_data, seen_urls)
+                total = self._add_links(len(new_items))
+                for item in new_items:
+                    if not await self._put_link_async(work_queue, item):
+                        break
+                if self.is_stopped():
+                    break
+                self.update_progress(self._processed_count, total, self._collection_message())
+            
+            # 每个任务领取到结束标记后退出
+            for _ in workers:
+                if not await self._put_link_async(work_queue, None):
+                    break
+        finally:
+            await batches.aclose()
+            if self.is_stopped():
+                for worker in workers:
+                    worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+        
+        total = self._total_links
+        self.log(f"总共收集到 {found_count} 个链接，去重后剩余 {total} 个链接")
+        
+        # 更新最终进度
+        if total and not self.is_stopped():
+            self.update_progress(total, total, "文章爬取完成")
+        return total
+    
+    async def _put_link_async(self, work_queue, item):
+        """把链接放入有界队列，队列满时等待空位，收到停止请求时返回False"""
+        while not self.is_stopped():
+            try:
+                await asyncio.wait_for(work_queue.put(item), 0.5)
+                return True
+            except asyncio.TimeoutError:
+                continue
+        return False
+    
+    async def _article_worker_async(self, work_queue):
+        """异步文章爬取任务，循环领取队列中的链接直到领取到结束标记或收到停止请求"""
+        while True:
+            item = await work_queue.get()
+            if item is None or self.is_stopped():
+                return
+            
+            title = item['title']
+            await self._process_article_async(item)
+            
+            self._processed_count += 1
+            self.update_progress(self._processed_count, self._progress_total(), f"已处理: {title[:30]}...")
+    
+    async def _parse_article_body_async(self, body, encoding, url):
+        """异步解析只下载了正文的文章页，见WebCrawler._parse_article_body"""
+        pool = self.parse_pool
+        if pool is not None:
+            try:
+                return await pool.parse_async(body, encoding, url)
+            except BrokenProcessPool as e:
+                self._parse_pool_failed(pool, e)
+        return await self._run_blocking(self._parse_article_body, body, encoding, url)
+    
+    async def _process_article_async(self, item):
+        """异步获取、解析并保存单篇文章"""
+        url = item['url']
+        title = item['title']
+        
+        self.log(f"正在处理链接: {url}, 标题: {title}")
+        
+        try:
+            if self.parse_pool:
+                # 只下载正文，在解析进程中解析文章，等待期间事件循环继续处理其他请求
+                result = await self.fetch_page_async(url, target='article', raw=True)
+                if result.body is None:
+                    self.log(f"获取页面内容失败: {url}")
+                    return
+                article_data = await self._parse_article_body_async(result.body, result.encoding, url)
+            else:
+                page_content = await self.get_page_async(url, target='article')
+                if not page_content:
+                    self.log(f"获取页面内容失败: {url}")
+                    return
+                
+                article_data = await self._run_blocking(self.parse_article, page_content, url)
+            if not article_data.get('content'):
+                return
+            
+            # 使用从链接列表中提取的标题
+            article_data['title'] = title
+            await self._run_blocking(self.save_results, article_data)
+            
+            self.log(f"已处理文章: {title}, 时间: {article_data.get('time', '未知')}")
+            
+            await self.random_delay_async()
+        except Exception as e:
+            self.log(f"处理链接 {url} 时出错: {str(e)}")
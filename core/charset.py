@@ -0,0 +1,109 @@
+import codecs
+import re
+import threading
+from urllib.parse import urlparse
+from requests.compat import chardet
+
+# 只在正文开头查找<meta>声明的编码
+META_SCAN_BYTES = 4096
+# 统计检测只使用正文开头的样本
+DETECT_SAMPLE_BYTES = 16 * 1024
+
+# 服务端未声明编码时requests默认使用ISO-8859-1，中文网站上这个声明通常不可信
+_UNTRUSTED_CHARSETS = {'iso-8859-1', 'latin-1', 'latin1', 'ascii', 'us-ascii'}
+
+# 按浏览器的做法把常见的中文编码声明映射到超集，避免个别生僻字解码失败
+_CHARSET_ALIASES = {
+    'gb2312': 'gb18030',
+    'gbk': 'gb18030',
+    'x-gbk': 'gb18030',
+    'big5': 'big5hkscs',
+}
+
+_HEADER_CHARSET_RE = re.compile(r'charset\s*=\s*["\']?([\w.:-]+)', re.I)
+_META_CHARSET_RE = re.compile(rb'<meta[^>]+?charset\s*=\s*["\']?\s*([\w.:-]+)', re.I)
+
+# 进程内按主机缓存的检测结果，同一网站通常只需统计检测一次
+_host_charsets = {}
+_cache_lock = threading.Lock()
+
+
+def normalize_charset(charset):
+    """
+    规范化编码名称
+    
+    Args:
+        charset (str): 编码名称
+    
+    Returns:
+        str: Python可用的编码名称，无法识别时返回None
+    """
+    if not charset:
+        return None
+    charset = charset.strip().lower()
+    charset = _CHARSET_ALIASES.get(charset, charset)
+    try:
+        codecs.lookup(charset)
+    except LookupError:
+        return None
+    return charset
+
+
+def charset_from_content_type(content_type):
+    """从Content-Type响应头中提取声明的编码，未声明或声明不可信时返回None"""
+    if not content_type:
+        return None
+    match = _HEADER_CHARSET_RE.search(content_type)
+    if not match or match.group(1).lower() in _UNTRUSTED_CHARSETS:
+        return None
+    return normalize_charset(match.group(1))
+
+
+def charset_from_meta(body):
+    """从正文开头的<meta charset>或<meta http-equiv="Content-Type">中提取编码"""
+    match = _META_CHARSET_RE.search(body[:META_SCAN_BYTES])
+    if not match:
+        return None
+    return normalize_charset(match.group(1).decode('ascii', errors='ignore'))
+
+
+def detect_encoding(url, content_type, body):
+    """
+    确定响应正文的编码
+    
+    依次使用Content-Type响应头、正文开头的<meta>声明、同一主机上次确定的编码，
+    都没有时才对正文开头的样本做统计检测，结果按主机缓存。
+    
+    Args:
+        url (str): 请求URL
+        content_type (str): Content-Type响应头
+        body (bytes): 响应正文
+    
+    Returns:
+        str: 编码名称
+    """
+    host = urlparse(url).netloc
+    encoding = charset_from_content_type(content_type) or charset_from_meta(body)
+    if encoding:
+        with _cache_lock:
+            _host_charsets[host] = encoding
+        return encoding
+    
+    with _cache_lock:
+        encoding = _host_charsets.get(host)
+    if encoding:
+        return encoding
+    
+    sample = body[:DETECT_SAMPLE_BYTES]
+    if len(body) > DETECT_SAMPLE_BYTES:
+        # 在最后一个'>'处截断，避免样本末尾出现不完整的多字节字符导致检测失败
+        end = sample.rfind(b'>')
+        if end > 0:
+            sample = sample[:end + 1]
+    encoding = normalize_charset(chardet.detect(sample).get('encoding'))
+    # 样本全是ASCII时无法判断网站的实际编码，按UTF-8解码且不缓存
+    if not encoding or encoding in _UNTRUSTED_CHARSETS:
+        return 'utf-8'
+    with _cache_lock:
+        _host_charsets[host] = encoding
+    return encoding
@@ -0,0 +1,146 @@
+import threading
+import time
+from collections import deque
+
+# 熔断器状态
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+# 状态的中文名称，用于日志和界面显示
+STATE_NAMES = {
+    CLOSED: '正常',
+    OPEN: '熔断',
+    HALF_OPEN: '试探',
+}
+
+
+class CircuitBreaker:
+    """
+    单个主机的熔断器
+    
+    正常状态下记录最近window次请求的结果，请求数不少于min_requests且失败率达到
+    failure_rate时熔断。熔断期间拒绝所有请求，open_seconds秒后进入试探状态，
+    放行half_open_probes个试探请求：全部成功则恢复正常，任一失败则重新熔断。
+    """
+    
+    def __init__(self, config=None):
+        """
+        初始化熔断器
+        
+        Args:
+            config (dict, optional): circuit_breaker配置
+        """
+        config = config or {}
+        self.window = max(1, int(config.get('window', 20)))
+        self.min_requests = max(1, int(config.get('min_requests', 10)))
+        self.failure_rate = float(config.get('failure_rate', 0.5))
+        self.open_seconds = float(config.get('open_seconds', 30))
+        self.half_open_probes = max(1, int(config.get('half_open_probes', 1)))
+        
+        self._lock = threading.Lock()
+        self._results = deque(maxlen=self.window)
+        self.state = CLOSED
+        self._opened_at = 0.0
+        self._probes_sent = 0
+        self._probes_succeeded = 0
+    
+    def allow(self):
+        """
+        判断是否放行一个请求
+        
+        Returns:
+            tuple: (是否放行, 不放行时建议等待的秒数)
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self.state == CLOSED:
+                return True, 0.0
+            
+            elapsed = now - self._opened_at
+            if self.state == OPEN:
+                if elapsed < self.open_seconds:
+                    return False, self.open_seconds - elapsed
+                self._enter_half_open(now)
+            elif elapsed >= self.open_seconds:
+                # 试探请求长时间没有结果（如请求被取消），重新开始试探
+                self._enter_half_open(now)
+            
+            if self._probes_sent < self.half_open_probes:
+                self._probes_sent += 1
+                return True, 0.0
+            return False, min(1.0, self.open_seconds)
+    
+    def _enter_half_open(self, now):
+        self.state = HALF_OPEN
+        self._opened_at = now
+        self._probes_sent = 0
+        self._probes_succeeded = 0
+    
+    def record(self, success):
+        """
+        记录一次请求结果
+        
+        Args:
+            success (bool): 请求是否成功
+        
+        Returns:
+            str: 状态发生变化时返回新状态，否则返回None
+        """
+        with self._lock:
+            if self.state == HALF_OPEN:
+                if not success:
+                    return self._open()
+                self._probes_succeeded += 1
+                if self._probes_succeeded >= self.half_open_probes:
+                    self.state = CLOSED
+                    self._results.clear()
+                    return CLOSED
+                return None
+            
+            if self.state == OPEN:
+                return None
+            
+            self._results.append(success)
+            if len(self._results) >= self.min_requests:
+                failures = self._results.count(False)
+                if failures / len(self._results) >= self.failure_rate:
+                    return self._open()
+            return None
+    
+    def _open(self):
+        self.state = OPEN
+        self._opened_at = time.monotonic()
+        self._results.clear()
+        return OPEN
+    
+    def remaining(self):
+        """熔断状态下距离进入试探状态的秒数"""
+        with self._lock:
+            if self.state != OPEN:
+                return 0.0
+            return max(0.0, self.open_seconds - (time.monotonic() - self._opened_at))
+
+
+# 进程内按主机共享的熔断器，所有爬虫标签页看到同一主机的同一状态
+_breakers = {}
+_registry_lock = threading.Lock()
+
+
+def get_host_breaker(host, config=None):
+    """
+    获取指定主机的共享熔断器
+    
+    Args:
+        host (str): 主机名（含端口）
+        config (dict, optional): circuit_breaker配置，只在首次创建时使用
+    
+    Returns:
+        CircuitBreaker: 熔断器
+    """
+    with _registry_lock:
+        breaker = _breakers.get(host)
+        if breaker is None:
+            breaker = CircuitBreaker(config)
+            _breakers[host] = breaker
+        return breaker
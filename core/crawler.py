@@ -1,14 +1,63 @@
 import requests
+import urllib3
 import json
 import time
 import os
 from datetime import datetime
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin, urlparse
+from urllib.parse import urlparse
 import logging
+import threading
+import queue
+import contextvars
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from .jsonl_writer import JsonlWriter
+from .rate_limiter import get_host_limiter
+from .adaptive import AdaptiveController, THROTTLE_STATUS_CODES, parse_retry_after
+from .retry import RetryPolicy, RetryLater
+from .work_queue import WorkQueue
+from .http_pool import create_session, resolve_pool_config
+from .page_result import PageResult, is_server_failure
+from .validator_store import get_validator_store, list_config_fingerprint
+from .response_cache import get_response_cache
+from .charset import detect_encoding
+from .page_probe import last_page_search
+from .circuit_breaker import get_host_breaker, OPEN, CLOSED, STATE_NAMES
+from .html_tree import parse_html, resolve_parser, DEFAULT_PARSER, TargetStrainer, element_rule
+from .extraction_plan import ExtractionPlan
+from .time_extractor import TIME_SELECTORS, STRUCTURED_TIME_META, JSON_LD_TYPE, ranked_time_elements, search_time, parse_time_text, find_structured_time
+from .time_locator import get_time_locator_store, make_locator, apply_locator, SOURCE_DATETIME, SOURCE_TEXT
+from .parse_pool import ParsePool
 import random
 
+# 默认允许下载的内容类型，以"/*"结尾表示匹配该大类下的所有类型
+DEFAULT_ALLOWED_CONTENT_TYPES = ['text/html', 'application/xhtml+xml', 'text/plain']
+
+# 当前线程（或协程）最近一次获取的页面是否来自响应缓存，命中缓存时无需请求间延迟
+_served_from_cache = contextvars.ContextVar('served_from_cache', default=False)
+
+
+def _is_time_candidate(name, attrs):
+    """
+    定向解析文章页时需要保留的时间元素
+    
+    覆盖time_extractor.TIME_SELECTORS可能匹配的全部元素：<time>标签、
+    带datetime属性的元素，以及class中含time、date或published的元素；
+    还保留记录发布时间的<meta>和JSON-LD脚本。
+    """
+    if name == 'time' or 'datetime' in attrs:
+        return True
+    if name == 'meta':
+        return any((attrs.get(attr) or '').strip().lower() in STRUCTURED_TIME_META for attr in ('name', 'property', 'itemprop'))
+    if name == 'script':
+        return (attrs.get('type') or '').strip().lower() == JSON_LD_TYPE
+    classes = attrs.get('class') or ''
+    if isinstance(classes, list):
+        classes = ' '.join(classes)
+    classes = classes.lower()
+    return 'time' in classes or 'date' in classes or 'published' in classes
+
 class WebCrawler:
     def __init__(self, config, logger=None, progress_callback=None):
         """
@@ -23,9 +72,37 @@ class WebCrawler:
         self.base_url = config.get('base_url', '')
         self.url_list_config = config.get('url_list_config', {})
         self.article_config = config.get('article_config', {})
+        # 由列表和文章配置编译得到的提取计划，解析页面时不再遍历配置字典
+        self.extraction_plan = ExtractionPlan(self.url_list_config, self.article_config, self.base_url)
         self.delay_min = config.get('delay_min', 1000) / 1000  # 转换为秒
         self.delay_max = config.get('delay_max', 3000) / 1000  # 转换为秒
         self.headers = config.get('headers', {})
+        # 文章爬取并发数（工作线程数）
+        self.concurrency = max(1, int(config.get('concurrency', 1)))
+        # 列表页与文章爬取流水线中待处理链接队列的容量，队列满时暂停获取列表页
+        self.link_queue_size = max(1, int(config.get('link_queue_size', 200)))
+        # 同时获取的列表页数（滑动窗口大小），1表示逐页获取
+        self.list_page_concurrency = max(1, int(config.get('list_page_concurrency', 1)))
+        # 爬取前探测最后一页的页码，用于限定列表页范围和估算进度总数
+        self.probe_last_page = config.get('probe_last_page', False)
+        self._probe_method = 'HEAD'
+        # 按主机限速，启用后取代每次请求后的随机延迟
+        rate_limit_config = config.get('rate_limit', {})
+        self.requests_per_second = float(rate_limit_config.get('requests_per_second', 0) or 0)
+        self.rate_burst = int(rate_limit_config.get('burst', 1) or 1)
+        self._rate_limiters = {}
+        # 自适应并发控制，启用后根据延迟和限流响应动态调整并发数和速率
+        adaptive_config = config.get('adaptive', {})
+        self.adaptive = None
+        if adaptive_config.get('enabled', False):
+            self.adaptive = AdaptiveController(
+                adaptive_config,
+                initial_concurrency=self.concurrency,
+                initial_rate=self.requests_per_second,
+                log=self.log,
+                on_rate_change=self._on_adaptive_rate_change
+            )
+            self.requests_per_second = self.adaptive.rate
         self.enable_jsonl = config.get('use_jsonl', False)
         if self.enable_jsonl:
             self.output_dir = config.get('jsonl_config', {}).get('base_path', 'output')
@@ -33,6 +110,19 @@ class WebCrawler:
         # 设置日志
         self.logger = logger or logging.getLogger(__name__)
         
+        # 页面解析器：html.parser、lxml（BeautifulSoup使用lxml建树）或lxml.html（直接使用lxml元素树）
+        self.parser_backend = resolve_parser(config.get('parser', DEFAULT_PARSER), self.log)
+        # XPath选择器只能在lxml.html页面上执行，创建爬虫时检查，避免每篇文章都提取失败
+        xpath_selectors = self.extraction_plan.article.xpath_selectors
+        if xpath_selectors and self.parser_backend != 'lxml.html':
+            raise ValueError(f"XPath选择器需要使用lxml.html解析器（当前为{self.parser_backend}）: {', '.join(xpath_selectors)}")
+        # 定向解析：只构建提取需要的子树，跳过导航栏、页脚和内联脚本等部分（对lxml.html解析器无效）
+        self.targeted_parse = config.get('targeted_parse', False)
+        self._parse_targets = self._build_parse_targets() if self.targeted_parse else {}
+        # 文章页解析进程数，大于0时文章页在独立进程中解析，0表示在工作线程中解析
+        self.parse_workers = max(0, int(config.get('parse_workers', 0) or 0))
+        self.parse_pool = None
+        
         # 设置进度回调
         self.progress_callback = progress_callback
         
@@ -41,9 +131,10 @@ class WebCrawler:
             if not os.path.exists(self.output_dir):
                 os.makedirs(self.output_dir)
             
-        # 创建会话
-        self.session = requests.Session()
-        self.session.headers.update(self.headers)
+        # 创建会话，底层连接来自进程内共享的连接池
+        max_workers = self.adaptive.max_concurrency if self.adaptive else self.concurrency
+        self.pool_config = resolve_pool_config(config.get('connection_pool', {}), min_per_host=max_workers)
+        self.session = create_session(self.headers, self.pool_config)
         
         # 初始化JSONL写入器
         self.jsonl_writer = None
@@ -55,18 +146,98 @@ class WebCrawler:
         if self.enable_jsonl:
             self.log(f"已配置JSONL写入器，输出目录: {self.jsonl_base_path}")
         
+        # 列表页条件请求，未变化的列表页复用上次的解析结果
+        conditional_config = config.get('conditional_get', {})
+        self.validator_store = None
+        if conditional_config.get('enabled', False):
+            store_path = conditional_config.get('store_path', os.path.join('cache', 'list_validators.json'))
+            self.validator_store = get_validator_store(store_path)
+        # 保存的链接只在列表页链接提取配置不变时复用
+        self.list_fingerprint = list_config_fingerprint(self.url_list_config, self.base_url)
+        
+        # 按站点学习的文章时间位置，先按学习到的位置提取，找不到时再使用完整的启发式提取
+        locator_config = config.get('time_locator', {})
+        self.time_locator_store = None
+        if locator_config.get('enabled', False):
+            store_path = locator_config.get('store_path', os.path.join('cache', 'time_locators.json'))
+            self.time_locator_store = get_time_locator_store(store_path)
+        
+        # 磁盘响应缓存，离线模式下只从缓存读取页面
+        cache_config = config.get('response_cache', {})
+        self.response_cache = None
+        self.offline = False
+        if cache_config.get('enabled', False):
+            self.response_cache = get_response_cache(
+                cache_config.get('directory', os.path.join('cache', 'responses')),
+                ttl=float(cache_config.get('ttl', 3600)),
+                max_size=int(float(cache_config.get('max_size_mb', 200)) * 1024 * 1024)
+            )
+            self.offline = cache_config.get('offline', False)
+            self.log(f"已启用响应缓存{'（离线模式）' if self.offline else ''}: {self.response_cache.directory}")
+        
+        # 请求失败时的重试策略
+        self.retry_policy = RetryPolicy(config.get('retry', {}))
+        
+        # 按主机熔断，主机持续失败时暂缓对它的所有请求
+        self.breaker_config = config.get('circuit_breaker', {})
+        self.breaker_enabled = self.breaker_config.get('enabled', False)
+        self._breakers = {}
+        
+        # 下载限制，流式读取响应，非HTML内容和超过大小上限的响应提前放弃
+        download_config = config.get('download', {})
+        self.max_body_size = int(float(download_config.get('max_body_mb', 10)) * 1024 * 1024)
+        self.allowed_content_types = [
+            content_type.strip().lower()
+            for content_type in download_config.get('allowed_content_types', DEFAULT_ALLOWED_CONTENT_TYPES)
+            if content_type.strip()
+        ]
+        self.download_chunk_size = 64 * 1024
+        
+        # 超时设置：连接超时、读取超时（两次读取之间的最长间隔）和单个请求的总时限
+        timeout_config = config.get('timeouts', {})
+        self.connect_timeout = float(timeout_config.get('connect', 10))
+        self.read_timeout = float(timeout_config.get('read', 10))
+        self.request_deadline = float(timeout_config.get('total', 60))
+        
+        # 爬取预算，任一项达到上限时结束爬取，0表示不限制
+        budget_config = config.get('budget', {})
+        self.max_crawl_seconds = float(budget_config.get('max_seconds', 0))
+        self.max_crawl_pages = int(budget_config.get('max_pages', 0))
+        self.max_crawl_bytes = int(float(budget_config.get('max_mb', 0)) * 1024 * 1024)
+        self.budget_exhausted = None
+        self._crawl_started = None
+        
         # 添加停止标志位
         self.should_stop = False
         
+        # 多线程爬取时保护写入器和进度计数的锁
+        self._write_lock = threading.Lock()
+        self._progress_lock = threading.Lock()
+        self._processed_count = 0
+        self._total_links = 0
+        self._pages_done = 0
+        self._expected_pages = 0
+        
+        # 爬取统计
+        self._stats_lock = threading.Lock()
+        self.stats = {
+            'pages_fetched': 0,
+            'bytes_downloaded': 0,
+            'skipped_content_type': 0,
+            'skipped_too_large': 0,
+            'parked': 0
+        }
+        
     def _init_jsonl_writer(self):
         """初始化JSONL写入器"""
-        if self.enable_jsonl and not self.jsonl_writer:
-            self.jsonl_writer = JsonlWriter(
-                base_path=self.jsonl_base_path,
-                max_entries_per_file=self.jsonl_max_entries,
-                file_prefix=self.jsonl_file_prefix
-            )
-            self.log(f"已初始化JSONL写入器，输出目录: {self.jsonl_base_path}")
+        with self._write_lock:
+            if self.enable_jsonl and not self.jsonl_writer:
+                self.jsonl_writer = JsonlWriter(
+                    base_path=self.jsonl_base_path,
+                    max_entries_per_file=self.jsonl_max_entries,
+                    file_prefix=self.jsonl_file_prefix
+                )
+                self.log(f"已初始化JSONL写入器，输出目录: {self.jsonl_base_path}")
     
     def update_progress(self, current, total, message=""):
         """更新进度"""
@@ -93,229 +264,729 @@ class WebCrawler:
         """检查是否应该停止爬取"""
         return self.should_stop
 
+    def _worker_count(self):
+        """文章爬取的工作线程数，自适应模式下按最大并发数创建，由并发闸门控制实际并发"""
+        return self.adaptive.max_concurrency if self.adaptive else self.concurrency
+    
+    def _on_adaptive_rate_change(self, rate):
+        """自适应控制器调整速率后，同步更新本爬虫使用的所有主机限速器"""
+        self.requests_per_second = rate
+        for limiter in list(self._rate_limiters.values()):
+            limiter.configure(rate)
+    
+    def _record_response(self, url, status, latency, headers=None, failure=None):
+        """
+        将响应的状态码和延迟反馈给熔断器和自适应控制器
+        
+        Args:
+            url (str): 请求URL
+            status (int): HTTP状态码，请求失败时为None
+            latency (float): 响应耗时（秒）
+            headers (dict, optional): 响应头，用于读取Retry-After
+            failure (optional): 失败类别，见PageResult.failure；读取正文超时或正文被截断时状态码仍为200
+        """
+        self._record_breaker(url, status, failure)
+        
+        if not self.adaptive:
+            return
+        self.adaptive.record(status, latency, failure)
+        
+        # 服务端通过Retry-After要求等待时，暂停该主机的令牌发放
+        if status in THROTTLE_STATUS_CODES and headers:
+            retry_after = parse_retry_after(headers.get('Retry-After'))
+            limiter = self._get_rate_limiter(url)
+            if retry_after and limiter:
+                limiter.pause(retry_after)
+                self.log(f"服务端要求等待 {retry_after:.1f} 秒: {url}")
+    
     def random_delay(self):
-        """随机延迟"""
+        """随机延迟，启用按主机限速时由限速器控制请求间隔，页面来自缓存时也不再延迟"""
+        if self.requests_per_second > 0 or _served_from_cache.get():
+            return
         delay = random.uniform(self.delay_min, self.delay_max)
         self.log(f"随机延迟 {delay:.2f} 秒")
         time.sleep(delay)
     
-    def get_page(self, url):
+    def _get_rate_limiter(self, url):
+        """
+        获取URL所属主机的共享限速器
+        
+        Args:
+            url (str): 请求URL
+            
+        Returns:
+            TokenBucket: 限速器，未启用限速时返回None
+        """
+        if self.requests_per_second <= 0:
+            return None
+        host = urlparse(url).netloc
+        limiter = self._rate_limiters.get(host)
+        if limiter is None:
+            limiter = get_host_limiter(host, self.requests_per_second, self.rate_burst)
+            self._rate_limiters[host] = limiter
+        return limiter
+    
+    def _get_breaker(self, url):
+        """
+        获取URL所属主机的共享熔断器
+        
+        Args:
+            url (str): 请求URL
+            
+        Returns:
+            CircuitBreaker: 熔断器，未启用熔断时返回None
+        """
+        if not self.breaker_enabled:
+            return None
+        host = urlparse(url).netloc
+        breaker = self._breakers.get(host)
+        if breaker is None:
+            breaker = get_host_breaker(host, self.breaker_config)
+            self._breakers[host] = breaker
+        return breaker
+    
+    def _acquire_rate_limit(self, url):
+        """
+        按主机限速等待令牌，分段等待以便及时响应停止请求
+        
+        Args:
+            url (str): 请求URL
+            
+        Returns:
+            bool: 获得令牌返回True；等待期间收到停止请求时归还预约的令牌并返回False
+        """
+        limiter = self._get_rate_limiter(url)
+        if not limiter:
+            return True
+        wait = limiter.reserve()
+        if wait > 0 and not self._sleep_unless_stopped(wait):
+            limiter.release()
+            return False
+        return True
+    
+    def _circuit_wait(self, url):
+        """
+        检查主机熔断器是否放行请求
+        
+        Args:
+            url (str): 请求URL
+            
+        Returns:
+            float: 需要暂缓的秒数，放行时返回0
+        """
+        breaker = self._get_breaker(url)
+        if not breaker:
+            return 0
+        allowed, wait = breaker.allow()
+        return 0 if allowed else wait
+    
+    def _record_breaker(self, url, status, failure=None):
+        """将请求结果反馈给熔断器，连接失败、超时（包括读取正文超时）、429和5xx视为失败"""
+        breaker = self._get_breaker(url)
+        if not breaker:
+            return
+        state = breaker.record(not is_server_failure(status, failure))
+        host = urlparse(url).netloc
+        if state == OPEN:
+            self.log(f"主机 {host} 请求失败过多，熔断 {breaker.open_seconds:.0f} 秒，期间的请求将暂缓")
+        elif state == CLOSED:
+            self.log(f"主机 {host} 已恢复，解除熔断")
+    
+    def get_breaker_states(self):
         """
-        获取页面内容
+        获取本爬虫访问过的主机的熔断状态
+        
+        Returns:
+            list: (主机, 状态名称, 熔断剩余秒数)元组的列表
+        """
+        return [
+            (host, STATE_NAMES[breaker.state], breaker.remaining())
+            for host, breaker in list(self._breakers.items())
+        ]
+    
+    def _sleep_unless_stopped(self, seconds):
+        """
+        分段等待，期间收到停止请求时提前返回
+        
+        Returns:
+            bool: 完整等待结束返回True，被停止请求打断返回False
+        """
+        deadline = time.monotonic() + seconds
+        while not self.is_stopped():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return True
+            time.sleep(min(remaining, 0.5))
+        return False
+    
+    def get_page(self, url, attempt=1, defer_retry=False, target=None):
+        """
+        获取页面内容，失败时按重试策略重试
         
         Args:
             url (str): 页面URL
+            attempt (int): 本次请求的尝试次数，从1开始
+            defer_retry (bool): 为True时不在当前线程等待重试，而是抛出RetryLater，
+                由调用方延后重新调度，避免阻塞其他任务
+            target (str, optional): 页面类型，"list"或"article"，启用定向解析时只构建该类页面需要的部分
             
         Returns:
-            BeautifulSoup: 解析后的页面对象，失败返回None
+            BeautifulSoup或LxmlDocument: 解析后的页面对象，失败返回None
+            
+        Raises:
+            RetryLater: defer_retry为True且需要重试时抛出
+        """
+        return self.fetch_page(url, attempt, defer_retry, target=target).soup
+    
+    def fetch_page(self, url, attempt=1, defer_retry=False, headers=None, target=None, raw=False):
         """
+        获取页面，返回包含状态码和响应头的完整结果，失败时按重试策略重试
+        
+        Args:
+            url (str): 页面URL
+            attempt (int): 本次请求的尝试次数，从1开始
+            defer_retry (bool): 为True时不在当前线程等待重试，而是抛出RetryLater
+            headers (dict, optional): 额外的请求头，如条件请求头
+            target (str, optional): 页面类型，见get_page
+            raw (bool): 为True时只下载正文，不构建页面对象，由调用方交给解析进程
+            
+        Returns:
+            PageResult: 请求结果
+            
+        Raises:
+            RetryLater: defer_retry为True且需要重试时抛出
+        """
+        # 达到爬取预算或收到停止请求后不再获取页面（包括缓存中的页面）
+        self._enforce_budget()
+        if self.is_stopped():
+            return PageResult(url, failure='stopped')
+        result = self._load_cached_page(url, target, raw)
+        _served_from_cache.set(result is not None)
+        if result is not None:
+            return result
+        
+        while True:
+            # 主机熔断期间暂缓请求，不计入尝试次数
+            wait = self._circuit_wait(url)
+            if wait:
+                self._add_stat('parked')
+                if defer_retry:
+                    raise RetryLater(url, wait, attempt, parked=True)
+                self.log(f"主机熔断中，{wait:.1f} 秒后再请求: {url}")
+                if not self._sleep_unless_stopped(wait):
+                    return PageResult(url, failure='circuit_open')
+                continue
+            
+            result = self._fetch_page_once(url, headers, target, raw)
+            if result.failure is None:
+                return result
+            
+            delay = self.retry_policy.get_delay(result.failure, attempt, result.retry_after)
+            if delay is None or self.is_stopped():
+                if attempt > 1:
+                    self.log(f"已重试 {attempt - 1} 次仍然失败，放弃: {url}")
+                return result
+            
+            if defer_retry:
+                raise RetryLater(url, delay, attempt + 1)
+            
+            self.log(f"请求失败（{result.failure}），{delay:.1f} 秒后第 {attempt + 1} 次尝试: {url}")
+            if not self._sleep_unless_stopped(delay):
+                return result
+            attempt += 1
+    
+    def _fetch_page_once(self, url, headers=None, target=None, raw=False):
+        """
+        发送一次请求并解析页面
+        
+        Args:
+            url (str): 页面URL
+            headers (dict, optional): 额外的请求头
+            target (str, optional): 页面类型，见get_page
+            raw (bool): 为True时不构建页面对象，见fetch_page
+            
+        Returns:
+            PageResult: 请求结果，失败时failure为HTTP状态码或"timeout"/"connection"/"error"，
+                等待限速令牌期间收到停止请求时为"stopped"，
+                内容类型不符或超过大小上限时为"skipped"
+        """
+        try:
+            # 按主机限速，等待令牌；等待期间收到停止请求时不再发送
+            if not self._acquire_rate_limit(url):
+                return PageResult(url, failure='stopped')
+        except Exception as e:
+            self.log(f"获取页面失败: {url}, 错误: {str(e)}")
+            return PageResult(url, failure='error')
+        
+        # 自适应模式下受并发闸门控制；闸门保持到正文读取完成，反馈的延迟也包含读取正文的时间
+        gate = self.adaptive.gate if self.adaptive else None
+        if gate:
+            gate.acquire()
+        start = time.monotonic()
+        result = None
         try:
-            response = self.session.get(url, timeout=10)
-            response.raise_for_status()
+            result = self._download_page(url, headers)
+        finally:
+            if gate:
+                gate.release()
+            if result is not None:
+                self._record_response(url, result.status, time.monotonic() - start, result.headers, result.failure)
+            else:
+                self._record_response(url, None, time.monotonic() - start)
+        
+        if result.failure is not None or result.body is None:
+            return result
+        
+        body = result.body
+        try:
+            encoding = detect_encoding(url, result.headers.get('Content-Type'), body)
+            soup = None if raw else self._build_soup(body.decode(encoding, errors='replace'), target)
+            self._store_cached_page(url, body, encoding, result.status, result.headers)
+            return PageResult(url, soup=soup, status=result.status, headers=result.headers, body=body, encoding=encoding)
+        except Exception as e:
+            self.log(f"获取页面失败: {url}, 错误: {str(e)}")
+            return PageResult(url, status=result.status, headers=result.headers, failure='error')
+    
+    def _download_page(self, url, headers=None):
+        """
+        发送一次请求并读取正文，不解码、不解析
+        
+        Args:
+            url (str): 页面URL
+            headers (dict, optional): 额外的请求头
             
-            # 自动处理编码
-            if response.encoding == 'ISO-8859-1':
-                response.encoding = response.apparent_encoding
-                
-            soup = BeautifulSoup(response.text, 'html.parser')
-            return soup
+        Returns:
+            PageResult: 成功时body为响应正文；未修改时body为None；失败时含义与_fetch_page_once相同
+        """
+        try:
+            deadline = time.monotonic() + self.request_deadline if self.request_deadline > 0 else None
+            response = self._send_request(url, headers)
+        except requests.exceptions.Timeout as e:
+            self.log(f"获取页面超时: {url}, 错误: {str(e)}")
+            return PageResult(url, failure='timeout')
+        except requests.exceptions.ConnectionError as e:
+            self.log(f"获取页面连接失败: {url}, 错误: {str(e)}")
+            return PageResult(url, failure='connection')
         except Exception as e:
             self.log(f"获取页面失败: {url}, 错误: {str(e)}")
-            return None
+            return PageResult(url, failure='error')
+        
+        # 流式响应需要关闭后才会把连接归还连接池
+        with response:
+            status = response.status_code
+            if status >= 400:
+                self.log(f"获取页面失败: {url}, 状态码: {status}")
+                retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                return PageResult(url, status=status, headers=response.headers, failure=status, retry_after=retry_after)
+            
+            if status == 304:
+                return PageResult(url, status=status, headers=response.headers)
+            
+            if not self._check_response_headers(url, response.headers):
+                return PageResult(url, status=status, headers=response.headers, failure='skipped')
+            
+            try:
+                body = self._read_body(url, response, deadline)
+            except requests.exceptions.Timeout as e:
+                self.log(f"读取页面内容超时: {url}, 错误: {str(e)}")
+                return PageResult(url, status=status, headers=response.headers, failure='timeout')
+            except requests.exceptions.RequestException as e:
+                self.log(f"读取页面内容失败: {url}, 错误: {str(e)}")
+                return PageResult(url, status=status, headers=response.headers, failure='connection')
+            if body is None:
+                return PageResult(url, status=status, headers=response.headers, failure='skipped')
+        return PageResult(url, status=status, headers=response.headers, body=body)
     
-    def parse_url_lists(self, soup):
+    def _read_body(self, url, response, deadline=None):
         """
-        解析页面中的链接列表
+        分块读取响应正文，超过大小上限时立即停止读取
         
         Args:
-            soup (BeautifulSoup): 页面对象
+            url (str): 页面URL
+            response (requests.Response): 流式响应
+            deadline (float, optional): 请求的截止时间（time.monotonic()），
+                超过时停止读取，用于限制持续缓慢发送数据的响应
             
         Returns:
-            list: 包含标题和链接的字典列表 [{'title': '标题', 'url': '链接'}, ...]
+            bytes: 响应正文，超过大小上限时返回None
+            
+        Raises:
+            requests.exceptions.Timeout: 读取超时或超过请求总时限
+            requests.exceptions.ConnectionError: 读取过程中连接出错
+        """
+        chunks = []
+        size = 0
+        for chunk in self._iter_body(response):
+            chunks.append(chunk)
+            size += len(chunk)
+            self._add_stat('bytes_downloaded', len(chunk))
+            if self._body_too_large(url, size):
+                return None
+            if deadline is not None and time.monotonic() > deadline:
+                raise requests.exceptions.Timeout(f"超过单个请求的总时限 {self.request_deadline:.0f} 秒")
+        self._add_stat('pages_fetched')
+        self._enforce_budget()
+        return b''.join(chunks)
+    
+    def _iter_body(self, response):
         """
-        url_data = []
+        逐块产出响应正文
+        
+        urllib3支持read1()时每块只等待一次网络读取，即使服务端持续缓慢地发送数据，
+        调用方也能及时检查请求总时限；否则退回到iter_content()。
+        """
+        read1 = getattr(response.raw, 'read1', None)
+        if read1 is None:
+            yield from response.iter_content(chunk_size=self.download_chunk_size)
+            return
+        
         try:
-            # 从新的配置格式中获取参数
-            list_container_config = self.url_list_config.get('target_list_container', {})
-            list_item_config = self.url_list_config.get('target_list_item', {})
+            while True:
+                chunk = read1(self.download_chunk_size, decode_content=True)
+                if not chunk:
+                    return
+                yield chunk
+        except urllib3.exceptions.ReadTimeoutError as e:
+            raise requests.exceptions.ReadTimeout(str(e))
+        except urllib3.exceptions.HTTPError as e:
+            raise requests.exceptions.ConnectionError(str(e))
+    
+    def _check_response_headers(self, url, headers):
+        """
+        读取正文前根据Content-Type和Content-Length判断是否继续下载
+        
+        Args:
+            url (str): 页面URL
+            headers (dict): 响应头
             
-            container_tag = list_container_config.get('name', 'div')
-            container_class = list_container_config.get('class', '')
-            container_id = list_container_config.get('id', '')
+        Returns:
+            bool: 是否继续下载
+        """
+        content_type = (headers.get('Content-Type') or '').split(';')[0].strip().lower()
+        if content_type and self.allowed_content_types and not any(
+            content_type == allowed or (allowed.endswith('/*') and content_type.startswith(allowed[:-1]))
+            for allowed in self.allowed_content_types
+        ):
+            self.log(f"跳过非HTML内容（{content_type}）: {url}")
+            self._add_stat('skipped_content_type')
+            return False
+        
+        try:
+            content_length = int(headers.get('Content-Length'))
+        except (TypeError, ValueError):
+            return True
+        return not self._body_too_large(url, content_length)
+    
+    def _body_too_large(self, url, size):
+        """检查响应大小是否超过上限，超过时记录日志和统计"""
+        if self.max_body_size <= 0 or size <= self.max_body_size:
+            return False
+        self.log(f"跳过超过大小上限（{self.max_body_size // 1024} KB）的页面: {url}")
+        self._add_stat('skipped_too_large')
+        return True
+    
+    def _enforce_budget(self):
+        """检查爬取预算，任一项达到上限时设置停止标志位"""
+        if self.budget_exhausted or self._crawl_started is None:
+            return
+        
+        with self._stats_lock:
+            pages = self.stats['pages_fetched']
+            downloaded = self.stats['bytes_downloaded']
+        reason = None
+        if self.max_crawl_seconds > 0 and time.monotonic() - self._crawl_started >= self.max_crawl_seconds:
+            reason = f"运行时间达到 {self.max_crawl_seconds:.0f} 秒"
+        elif self.max_crawl_pages > 0 and pages >= self.max_crawl_pages:
+            reason = f"下载页面数达到 {self.max_crawl_pages} 个"
+        elif self.max_crawl_bytes > 0 and downloaded >= self.max_crawl_bytes:
+            reason = f"下载量达到 {self.max_crawl_bytes / 1024 / 1024:.1f} MB"
+        
+        if reason:
+            self.budget_exhausted = reason
+            self.should_stop = True
+            self.log(f"已达到爬取预算（{reason}），正在结束爬取任务...")
+    
+    def _add_stat(self, key, value=1):
+        """累加爬取统计"""
+        with self._stats_lock:
+            self.stats[key] += value
+    
+    def _log_stats(self):
+        """输出爬取统计"""
+        with self._stats_lock:
+            stats = dict(self.stats)
+        self.log(
+            f"爬取统计: 下载页面 {stats['pages_fetched']} 个，共 {stats['bytes_downloaded'] / 1024:.1f} KB；"
+            f"跳过非HTML内容 {stats['skipped_content_type']} 个，超过大小上限 {stats['skipped_too_large']} 个；"
+            f"因主机熔断暂缓请求 {stats['parked']} 次"
+        )
+    
+    def _load_cached_page(self, url, target=None, raw=False):
+        """
+        从响应缓存读取页面
+        
+        Args:
+            url (str): 页面URL
+            target (str, optional): 页面类型，见get_page
+            raw (bool): 为True时不构建页面对象，见fetch_page
             
-            item_tag = list_item_config.get('name', 'li')
-            item_class = list_item_config.get('class', '')
-            item_id = list_item_config.get('id', '')
+        Returns:
+            PageResult: 命中缓存时返回解析后的结果；离线模式下未命中返回失败结果；
+                其余情况返回None，需要发送请求
+        """
+        if not self.response_cache:
+            return None
+        
+        cached = self.response_cache.get(url, allow_stale=self.offline)
+        if cached is not None:
+            try:
+                soup = None if raw else self._build_soup(cached.text, target)
+                return PageResult(url, soup=soup, status=cached.status, headers=cached.headers, from_cache=True,
+                                  body=cached.body, encoding=cached.encoding)
+            except Exception as e:
+                self.log(f"解析缓存页面失败: {url}, 错误: {str(e)}")
+        
+        if self.offline:
+            self.log(f"离线模式，缓存中没有该页面: {url}")
+            return PageResult(url, failure='offline', from_cache=True)
+        return None
+    
+    def _store_cached_page(self, url, body, encoding, status, headers):
+        """将成功的响应写入响应缓存"""
+        if not self.response_cache:
+            return
+        try:
+            self.response_cache.put(url, body, encoding, status, headers)
+        except Exception as e:
+            self.log(f"写入响应缓存失败: {url}, 错误: {str(e)}")
+    
+    def _send_request(self, url, headers=None):
+        """
+        发送GET请求，并发闸门和响应反馈由调用方在读取正文后处理
+        
+        Args:
+            url (str): 请求URL
+            headers (dict, optional): 额外的请求头
             
-            title_config = list_item_config.get('title', {})
-            link_config = list_item_config.get('link', {})
+        Returns:
+            requests.Response: 流式响应对象，正文尚未读取，调用方读取后需要关闭
+        """
+        return self.session.get(url, headers=headers, timeout=(self.connect_timeout, self.read_timeout), stream=True)
+    
+    def _get_url_list(self, page_url):
+        """
+        获取列表页并解析链接，启用条件请求时未变化的列表页直接复用上次的解析结果
+        
+        Args:
+            page_url (str): 列表页URL
             
-            title_tag = title_config.get('name', 'a')
-            title_attr = title_config.get('attr', 'text')
-
-            link_tag = link_config.get('name', 'a')
-            link_attr = link_config.get('attr', 'href')
-            
-            # 查找容器元素
-            if container_id:
-                container = soup.find(container_tag, id=container_id)
-            elif container_class:
-                container = soup.find(container_tag, class_=container_class)
+        Returns:
+            list: 链接列表，获取页面失败返回None
+        """
+        headers = self._list_conditional_headers(page_url)
+        result = self.fetch_page(page_url, headers=headers, target='list')
+        if self._lost_list_links(result):
+            result = self.fetch_page(page_url, target='list')
+        return self._handle_url_list_result(result)
+    
+    def _list_conditional_headers(self, page_url):
+        """列表页的条件请求头，未启用条件请求或没有按当前提取配置保存的记录时返回None"""
+        if not self.validator_store:
+            return None
+        return self.validator_store.conditional_headers(page_url, self.list_fingerprint)
+    
+    def _lost_list_links(self, result):
+        """服务端返回304，但保存的链接在请求期间被其他提取配置的记录替换，需要重新完整获取"""
+        if not result.not_modified or self.validator_store.get_links(result.url, self.list_fingerprint) is not None:
+            return False
+        self.log(f"列表页未变化，但保存的链接已失效，重新获取: {result.url}")
+        return True
+    
+    def _handle_url_list_result(self, result):
+        """处理列表页请求结果，解析链接并更新条件请求验证器"""
+        if result.not_modified:
+            url_data = self.validator_store.get_links(result.url, self.list_fingerprint) or []
+            self.log(f"列表页未变化，复用上次解析的 {len(url_data)} 个链接: {result.url}")
+            return url_data
+        
+        if result.soup is None:
+            return None
+        
+        url_data = self.parse_url_lists(result.soup)
+        if self.validator_store:
+            self.validator_store.update(result.url, result.headers, url_data, self.list_fingerprint)
+        return url_data
+    
+    def _build_soup(self, text, target=None):
+        """
+        使用配置的解析器将页面文本解析为页面对象
+        
+        Args:
+            text (str): 页面文本
+            target (str, optional): 页面类型，启用定向解析时只构建该类页面需要的部分
+        
+        Returns:
+            BeautifulSoup或LxmlDocument: 页面对象
+        """
+        return parse_html(text, self.parser_backend, self._parse_targets.get(target))
+    
+    def _build_parse_targets(self):
+        """
+        根据列表和文章提取配置生成定向解析使用的SoupStrainer
+        
+        列表页只保留链接列表容器；文章页保留文章容器、时间提取可能用到的元素和附加字段
+        匹配的元素。未配置容器（在整个页面中查找），或附加字段的选择器含组合符、伪类而无法
+        在建树时判断时，该类页面仍完整解析。
+        
+        Returns:
+            dict: 页面类型到TargetStrainer的映射
+        """
+        targets = {}
+        list_container = self.extraction_plan.list.container
+        if list_container.scoped:
+            targets['list'] = TargetStrainer([
+                element_rule(list_container.name, list_container.id, list_container.class_)
+            ])
+        article_container = self.extraction_plan.article.container
+        if article_container.scoped:
+            rules = [
+                element_rule(article_container.name, article_container.id, article_container.class_),
+                _is_time_candidate
+            ]
+            for selector in self.extraction_plan.article.selectors:
+                rule = selector.strainer_rule()
+                if rule is None:
+                    self.log(f"选择器 {selector.expression} 无法用于定向解析，文章页完整解析")
+                    break
+                rules.append(rule)
             else:
-                container = soup
+                targets['article'] = TargetStrainer(rules)
+        return targets
+    
+    def parse_url_lists(self, soup):
+        """
+        解析页面中的链接列表
+        
+        Args:
+            soup (BeautifulSoup): 页面对象
             
-            # 查找列表项
-            if item_id:
-                target_elements = container.find_all(item_tag, id=item_id)
-            elif item_class:
-                target_elements = container.find_all(item_tag, class_=item_class)
-            else:
-                target_elements = container.find_all(item_tag)
+        Returns:
+            list: 包含标题和链接的字典列表 [{'title': '标题', 'url': '链接'}, ...]
+        """
+        try:
+            list_plan = self.extraction_plan.list
             
-            self.log(f"找到 {len(target_elements)} 个 {item_tag} 元素")
+            # 查找列表项
+            target_elements = list_plan.find_items(soup)
+            self.log(f"找到 {len(target_elements)} 个 {list_plan.item.name} 元素")
             
             # 提取链接和标题
-            for element in target_elements:
-                link_element = element.find(link_tag)
-                title_element = element.find(title_tag)
-                
-                full_url = ''
-                title = ''
-                if link_element and link_element.has_attr(link_attr):
-                    href = link_element[link_attr]
-
-                    if not href.startswith('http'):
-                        full_url = urljoin(self.base_url, href)
-                    else:
-                        full_url = href
-                
-                if title_element:
-                    if title_attr == 'text':
-                        title = title_element.get_text(strip=True)
-                    else:
-                        title = title_element.get(title_attr, '')
-                    
-                    if not title:
-                        title = full_url
-                    
-                url_data.append({
-                    'title': title,
-                    'url': full_url
-                })
-                    
+            url_data = list_plan.extract_links(target_elements)
             self.log(f"成功提取 {len(url_data)} 个链接和标题")
             return url_data
         except Exception as e:
             self.log(f"解析链接列表失败: {str(e)}")
             return []
     
-    def extract_time_from_page(self, soup):
+    def extract_time_from_page(self, soup, url=None):
         """
         从页面中提取时间信息，不依赖外部配置
         
+        配置了article_config.target_time时只按配置的选择器和格式提取，没有提取到时
+        按其fallback继续启发式提取或不填写时间。启发式提取先读取页面头部的JSON-LD和<meta>
+        中的发布时间；没有时，启用时间定位器则按该站点学习到的位置提取，找不到时再使用
+        完整的启发式提取，并记录这次给出时间的位置。
+        
         Args:
             soup (BeautifulSoup): 页面对象
+            url (str, optional): 页面URL，用于确定站点
             
         Returns:
-            str: 提取到的时间字符串，如果未找到则返回当前时间
+            str: 提取到的时间字符串，如果未找到则返回当前时间；
+                时间规则的fallback为none且未提取到时返回空字符串
         """
         try:
-            # 导入正则表达式模块
-            import re
-            
-            # 常见的时间格式正则表达式
-            time_patterns = [
-                # YYYY-MM-DD HH:MM:SS
-                r'(\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2})',
-                # YYYY-MM-DD HH:MM
-                r'(\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2})',
-                # YYYY-MM-DD
-                r'(\d{4}-\d{2}-\d{2})',
-                # YYYY/MM/DD HH:MM:SS
-                r'(\d{4}/\d{2}/\d{2}\s+\d{2}:\d{2}:\d{2})',
-                # YYYY/MM/DD HH:MM
-                r'(\d{4}/\d{2}/\d{2}\s+\d{2}:\d{2})',
-                # YYYY/MM/DD
-                r'(\d{4}/\d{2}/\d{2})',
-                # YYYY年MM月DD日 HH:MM:SS
-                r'(\d{4}年\d{1,2}月\d{1,2}日\s+\d{2}:\d{2}:\d{2})',
-                # YYYY年MM月DD日 HH:MM
-                r'(\d{4}年\d{1,2}月\d{1,2}日\s+\d{2}:\d{2})',
-                # YYYY年MM月DD日
-                r'(\d{4}年\d{1,2}月\d{1,2}日)',
-                # MM-DD HH:MM
-                r'(\d{2}-\d{2}\s+\d{2}:\d{2})',
-                # MM/DD HH:MM
-                r'(\d{2}/\d{2}\s+\d{2}:\d{2})',
-                # MM月DD日
-                r'(\d{1,2}月\d{1,2}日)',
-                # MM月DD日 HH:MM
-                r'(\d{1,2}月\d{1,2}日\s+\d{2}:\d{2})',
-                # ISO 8601 格式
-                r'(\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2})',
-                # 带毫秒的格式
-                r'(\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2}\.\d{3})'
-            ]
+            # 配置了时间规则时直接按规则提取，不运行启发式提取
+            time_rule = self.extraction_plan.article.time
+            if time_rule is not None:
+                try:
+                    parsed_time = time_rule.extract(soup, self._parse_time_text)
+                except Exception as e:
+                    self.log(f"按配置的时间规则提取时间失败: {str(e)}")
+                    parsed_time = None
+                if parsed_time:
+                    self.log(f"按配置的时间规则提取时间: {parsed_time}")
+                    return parsed_time
+                if not time_rule.use_heuristic:
+                    self.log("按配置的时间规则未提取到时间，不填写时间")
+                    return ''
+                self.log("按配置的时间规则未提取到时间，使用启发式提取")
             
-            # 常见的时间元素选择器
-            time_selectors = [
-                'time', '.time', '.date', '.publish-time', 
-                '.publish_date', '.article-time', '.post-date',
-                '[datetime]', '.entry-date', '.published',
-                '.news-time', '.article-date', '.post-time',
-                '.release-time', '.update-time', '.create-time',
-                '.meta-time', '.timestamp', 'span[class*="time"]',
-                'span[class*="date"]', 'div[class*="time"]',
-                'div[class*="date"]', 'p[class*="time"]',
-                'p[class*="date"]'
-            ]
+            # 优先读取页面头部的结构化元数据，找到时不再运行任何启发式提取
+            parsed_time, source = find_structured_time(soup, self._parse_time_text)
+            if parsed_time:
+                self.log(f"从{source}提取时间: {parsed_time}")
+                return parsed_time
             
-            # 首先尝试从常见的时间元素中提取
-            for selector in time_selectors:
-                elements = soup.select(selector)
-                for element in elements:
-                    # 优先从datetime属性获取
-                    if element.has_attr('datetime'):
-                        time_text = element['datetime']
-                        # 尝试解析时间
-                        parsed_time = self._parse_time_text(time_text)
-                        if parsed_time:
-                            self.log(f"从datetime属性提取时间: {parsed_time}")
-                            return parsed_time
-                    
-                    # 从元素文本中提取
-                    time_text = element.get_text(strip=True)
-                    if time_text:
-                        # 使用正则表达式从文本中提取时间
-                        for pattern in time_patterns:
-                            match = re.search(pattern, time_text)
-                            if match:
-                                time_str = match.group(1)
-                                parsed_time = self._parse_time_text(time_str)
-                                if parsed_time:
-                                    self.log(f"从元素文本提取时间: {parsed_time}")
-                                    return parsed_time
-            
-            # 如果没有从特定元素中找到时间，尝试从整个页面文本中搜索
-            page_text = soup.get_text()
-            for pattern in time_patterns:
-                matches = re.findall(pattern, page_text)
-                if matches:
-                    # 取第一个匹配的时间
-                    time_str = matches[0]
-                    parsed_time = self._parse_time_text(time_str)
+            site = self._time_locator_site(url)
+            if site:
+                locator = self.time_locator_store.get(site)
+                if locator:
+                    parsed_time = apply_locator(soup, locator, self._parse_time_text)
+                    self.time_locator_store.record(site, parsed_time is not None)
                     if parsed_time:
-                        self.log(f"从页面文本提取时间: {parsed_time}")
+                        self.log(f"按已学习的位置提取时间: {parsed_time}")
                         return parsed_time
             
+            # 首先尝试从常见的时间元素中提取，所有选择器合并为一次遍历
+            for rank, element in ranked_time_elements(soup):
+                # 优先从datetime属性获取
+                if element.has_attr('datetime'):
+                    parsed_time = self._parse_time_text(element['datetime'])
+                    if parsed_time:
+                        self.log(f"从datetime属性提取时间: {parsed_time}")
+                        self._learn_time_locator(site, make_locator(TIME_SELECTORS[rank], SOURCE_DATETIME))
+                        return parsed_time
+                
+                # 从元素文本中提取
+                time_text = element.get_text(strip=True)
+                if time_text:
+                    parsed_time, pattern = search_time(time_text, self._parse_time_text)
+                    if parsed_time:
+                        self.log(f"从元素文本提取时间: {parsed_time}")
+                        self._learn_time_locator(site, make_locator(TIME_SELECTORS[rank], SOURCE_TEXT, pattern))
+                        return parsed_time
+            
+            # 如果没有从特定元素中找到时间，尝试从整个页面文本中搜索；这个位置不记录为定位器
+            parsed_time, _ = search_time(soup.get_text(), self._parse_time_text)
+            if parsed_time:
+                self.log(f"从页面文本提取时间: {parsed_time}")
+                return parsed_time
+            
             # 如果没有找到时间，返回当前时间
             self.log("未找到时间元素，使用当前时间")
             return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
             
         except Exception as e:
             self.log(f"提取时间信息失败: {str(e)}")
+            # 配置了不回退到启发式提取的时间规则时，不使用当前时间
+            time_rule = self.extraction_plan.article.time
+            if time_rule is not None and not time_rule.use_heuristic:
+                return ''
             return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
     
+    def _time_locator_site(self, url):
+        """时间定位器使用的站点键：页面URL的主机名，没有URL时使用任务名称；未启用时返回None"""
+        if not self.time_locator_store:
+            return None
+        host = urlparse(url).netloc if url else ''
+        return host or self.config.get('name') or None
+    
+    def _learn_time_locator(self, site, locator):
+        """记录站点的时间位置，未启用时间定位器时不做任何事"""
+        if site:
+            self.time_locator_store.learn(site, locator)
+    
     def _parse_time_text(self, time_text):
         """
         解析时间文本并标准化为统一格式
@@ -327,68 +998,8 @@ class WebCrawler:
             str: 标准化后的时间字符串，解析失败返回None
         """
         try:
-            # 导入正则表达式模块
-            import re
-            
-            # 预处理中文格式的月份和日期
-            # 将"2023年5月15日"转换为"2023年05月15日"
-            time_text = re.sub(r'(\d{4})年(\d{1,2})月(\d{1,2})日', lambda m: f"{m.group(1)}年{m.group(2).zfill(2)}月{m.group(3).zfill(2)}日", time_text)
-            
-            # 常见的时间格式
-            time_formats = [
-                '%Y-%m-%d %H:%M:%S',
-                '%Y-%m-%d %H:%M',
-                '%Y-%m-%d',
-                '%Y/%m/%d %H:%M:%S',
-                '%Y/%m/%d %H:%M',
-                '%Y/%m/%d',
-                '%Y年%m月%d日 %H:%M:%S',
-                '%Y年%m月%d日 %H:%M',
-                '%Y年%m月%d日',
-                '%m-%d %H:%M',
-                '%m/%d %H:%M',
-                '%m月%d日',
-                '%m月%d日 %H:%M',
-                '%Y-%m-%dT%H:%M:%S',  # ISO 8601
-                '%Y-%m-%d %H:%M:%S.%f'  # 带毫秒
-            ]
-            
-            for fmt in time_formats:
-                try:
-                    parsed_time = datetime.strptime(time_text, fmt)
-                    # 如果解析成功但没有时间部分，添加当前时间
-                    if fmt in ['%Y-%m-%d', '%Y/%m/%d', '%Y年%m月%d日', '%m月%d日']:
-                        now = datetime.now()
-                        parsed_time = parsed_time.replace(hour=now.hour, minute=now.minute, second=now.second)
-                    return parsed_time.strftime('%Y-%m-%d %H:%M:%S')
-                except ValueError:
-                    continue
-            
-            # 如果标准格式无法解析，尝试使用正则表达式提取
-            # 尝试提取年月日
-            year_month_day_match = re.search(r'(\d{4})年(\d{1,2})月(\d{1,2})日', time_text)
-            if year_month_day_match:
-                year = int(year_month_day_match.group(1))
-                month = int(year_month_day_match.group(2))
-                day = int(year_month_day_match.group(3))
-                
-                # 尝试提取时分秒
-                hour_min_sec_match = re.search(r'(\d{1,2})[时:](\d{1,2})(?:[分:](\d{1,2}))?', time_text)
-                if hour_min_sec_match:
-                    hour = int(hour_min_sec_match.group(1))
-                    minute = int(hour_min_sec_match.group(2))
-                    second = int(hour_min_sec_match.group(3)) if hour_min_sec_match.group(3) else 0
-                else:
-                    now = datetime.now()
-                    hour, minute, second = now.hour, now.minute, now.second
-                
-                try:
-                    parsed_time = datetime(year, month, day, hour, minute, second)
-                    return parsed_time.strftime('%Y-%m-%d %H:%M:%S')
-                except ValueError:
-                    pass
-            
-            return None
+            # 按指纹选择格式解析，同一时间文本的解析结果会被缓存
+            return parse_time_text(time_text)
         except Exception as e:
             self.log(f"解析时间文本失败: {str(e)}")
             return None
@@ -405,43 +1016,20 @@ class WebCrawler:
             dict: 文章数据
         """
         try:
-            # 从新的配置格式中获取参数
-            container_config = self.article_config.get('target_container', {})
-            text_item_config = self.article_config.get('target_text_item', {})
-            
-            container_tag = container_config.get('name', 'div')
-            container_class = container_config.get('class', '')
-            container_id = container_config.get('id', '')
-            
-            text_tag = text_item_config.get('name', 'p')
-            text_attr = text_item_config.get('attr', 'text')
-            
-            # 查找容器元素
-            if container_id:
-                container = soup.find(container_tag, id=container_id)
-            elif container_class:
-                container = soup.find(container_tag, class_=container_class)
-            else:
-                container = soup
-            
-            # 查找文本元素
-            content_elements = container.find_all(text_tag)
-            
-            # 提取文本内容
-            if text_attr == 'text':
-                content = '\n'.join([element.get_text(strip=True) for element in content_elements])
-            else:
-                # 如果指定了其他属性，则提取该属性值
-                content = '\n'.join([element.get(text_attr, '') for element in content_elements if element.has_attr(text_attr)])
+            # 提取正文内容
+            content = self.extraction_plan.article.extract_content(soup)
 
             # 提取文章时间
-            article_time = self.extract_time_from_page(soup)
+            article_time = self.extract_time_from_page(soup, url)
 
             article_data = {
                 'url': url,
                 'content': content,
                 'time': article_time
             }
+            # 配置中fields定义的附加字段，不覆盖上面的字段
+            for name, value in self.extraction_plan.article.extract_fields(soup).items():
+                article_data.setdefault(name, value)
             return article_data
         except Exception as e:
             self.log(f"解析文章失败: {url}, 错误: {str(e)}")
@@ -482,8 +1070,12 @@ class WebCrawler:
                 if not self.jsonl_writer:
                     self._init_jsonl_writer()
                 
-                # 写入到JSONL文件，使用从页面中提取的时间
-                file_path = self.jsonl_writer.write(title, content, article_time)
+                # 配置中fields定义的附加字段
+                extra = {name: article_data[name] for name in self.extraction_plan.article.field_names if name in article_data}
+                
+                # 写入到JSONL文件，使用从页面中提取的时间（多线程下串行写入）
+                with self._write_lock:
+                    file_path = self.jsonl_writer.write(title, content, article_time, extra)
                 self.log(f"已保存文章到JSONL文件: {title}, 时间: {article_time}")
                 
         except Exception as e:
@@ -491,9 +1083,83 @@ class WebCrawler:
     
     def close(self):
         """关闭爬虫资源，包括JSONL写入器"""
-        if self.jsonl_writer:
-            self.jsonl_writer.close()
-            self.log("JSONL写入器已关闭")
+        with self._write_lock:
+            if self.jsonl_writer:
+                self.jsonl_writer.close()
+                self.log("JSONL写入器已关闭")
+        
+        if self.validator_store:
+            try:
+                self.validator_store.save()
+            except Exception as e:
+                self.log(f"保存条件请求验证器失败: {str(e)}")
+        
+        if self.time_locator_store:
+            try:
+                self.time_locator_store.save()
+            except Exception as e:
+                self.log(f"保存时间定位器失败: {str(e)}")
+        
+        self._save_response_cache()
+        self._stop_parse_pool()
+    
+    def _start_parse_pool(self):
+        """启动文章页解析进程池，启动失败时在工作线程中解析"""
+        if not self.parse_workers or self.parse_pool:
+            return
+        try:
+            self.parse_pool = ParsePool(self.config, self.parse_workers, log=self.log, locator_store=self.time_locator_store)
+            self.log(f"已启动 {self.parse_workers} 个文章页解析进程")
+        except Exception as e:
+            self.log(f"启动解析进程失败，在工作线程中解析文章页: {str(e)}")
+            self.parse_pool = None
+    
+    def _parse_pool_failed(self, pool, error):
+        """解析进程异常退出后关闭进程池，之后的文章页在工作线程中解析"""
+        with self._progress_lock:
+            if self.parse_pool is not pool:
+                return
+            self.parse_pool = None
+        self.log(f"解析进程异常退出，改为在工作线程中解析文章页: {str(error)}")
+        pool.close(wait=False)
+    
+    def _parse_article_body(self, body, encoding, url):
+        """
+        解析只下载了正文的文章页，优先交给解析进程，进程池不可用时在当前线程中解析
+        
+        Args:
+            body (bytes): 响应正文
+            encoding (str): 解码正文使用的编码
+            url (str): 文章URL
+        
+        Returns:
+            dict: 文章数据
+        """
+        pool = self.parse_pool
+        if pool is not None:
+            try:
+                return pool.parse(body, encoding, url)
+            except BrokenProcessPool as e:
+                self._parse_pool_failed(pool, e)
+        return self.parse_article(self._build_soup(body.decode(encoding or 'utf-8', errors='replace'), 'article'), url)
+    
+    def _stop_parse_pool(self):
+        """关闭文章页解析进程池"""
+        if self.parse_pool:
+            try:
+                self.parse_pool.close()
+            except Exception as e:
+                self.log(f"关闭解析进程失败: {str(e)}")
+            self.parse_pool = None
+    
+    def _save_response_cache(self):
+        """保存响应缓存索引"""
+        if self.response_cache:
+            try:
+                self.response_cache.save()
+                self.log(f"响应缓存命中 {self.response_cache.hits} 次，未命中 {self.response_cache.misses} 次")
+            except Exception as e:
+                self.log(f"保存响应缓存失败: {str(e)}")
     
     def test_config(self, max_pages=2, max_articles=3):
         """测试配置是否正确，只爬取少量页面和文章
@@ -567,7 +1233,7 @@ class WebCrawler:
                 self.log(f"正在测试第 {page_index} 页: {page_url}")
                 
                 # 获取页面内容
-                page_content = self.get_page(page_url)
+                page_content = self.get_page(page_url, target='list')
                 if not page_content:
                     error_msg = f"获取页面内容失败: {page_url}"
                     self.log(error_msg)
@@ -627,7 +1293,7 @@ class WebCrawler:
                 
                 try:
                     # 获取页面内容
-                    page_content = self.get_page(url)
+                    page_content = self.get_page(url, target='article')
                     if not page_content:
                         error_msg = f"获取文章页面内容失败: {url}"
                         self.log(error_msg)
@@ -699,6 +1365,7 @@ class WebCrawler:
             # 恢复原始JSONL设置
             self.enable_jsonl = original_enable_jsonl
             self.log(f"测试完成：已恢复JSONL文件创建设置为 {original_enable_jsonl}")
+            self._save_response_cache()
             # 测试模式下不关闭JSONL写入器，因为可能继续执行正式爬取
     
     def crawl(self):
@@ -712,6 +1379,8 @@ class WebCrawler:
     
     def crawl_multi_pages(self):
         """爬取多页内容"""
+        self._crawl_started = time.monotonic()
+        self.budget_exhausted = None
         try:
             # 初始化JSONL写入器（如果需要）
             if self.enable_jsonl:
@@ -740,83 +1409,279 @@ class WebCrawler:
             self.log(f"多页URL起始页码: {config['url_multi_page_start']}")
             self.log(f"多页URL结束页码: {config['url_multi_page_stop']}")
             
-            # 收集所有URL数据（包含标题和URL）
-            all_url_data = self._collect_all_urls(config)
+            # 探测最后一页，限定列表页范围并用于估算进度总数
+            self._expected_pages = 0
+            if self.probe_last_page and not self.offline:
+                last_page = self._probe_last_page(config)
+                if last_page is not None:
+                    config['url_multi_page_stop'] = last_page
+                    self._expected_pages = last_page - config['url_multi_page_start'] + 1
+            
+            # 配置了解析进程时，文章页交给解析进程解析
+            self._start_parse_pool()
+            
+            # 收集链接的同时爬取文章：列表页解析出的链接立即交给文章工作线程
+            link_count = self._crawl_pipeline(config)
+            if self.budget_exhausted:
+                self.log(f"已达到爬取预算（{self.budget_exhausted}），爬取任务提前结束，共发现 {link_count} 个链接")
+                return True
             if self.is_stopped():
                 self.log("爬取任务已被用户停止")
                 return False
                 
-            if not all_url_data:
+            if not link_count:
                 self.log("所有页面都没有找到任何链接，爬取任务终止")
                 return False
-            
-            # 爬取文章内容
-            self._crawl_articles(all_url_data, config)
-            
-            if self.is_stopped():
-                self.log("爬取任务已被用户停止")
-                return False
                 
-            self.log(f"多页爬取任务完成，共处理 {len(all_url_data)} 个链接")
+            self.log(f"多页爬取任务完成，共处理 {link_count} 个链接")
             return True
         finally:
+            self._log_stats()
             # 确保关闭JSONL写入器
             self.close()
     
-    def _collect_all_urls(self, config):
-        """收集所有页面的URL"""
-        all_url_data = []
+    def _page_url(self, config, page_index):
+        """构建指定页码的列表页URL，起始页使用单页URL"""
+        if page_index == config['url_multi_page_start']:
+            return config['url_onepage']
+        return config['url_multi_page'].format(page_index)
+    
+    def _iter_url_batches(self, config):
+        """
+        获取列表页并按页码顺序逐页产出解析出的链接
         
-        page_start = config['url_multi_page_start']
-        page_stop = config['url_multi_page_stop']
+        在滑动窗口内并行获取list_page_concurrency个列表页，结果仍按页码顺序产出。
+        某一页获取失败时视为已到达最后一页，取消窗口中尚未开始的后续页面。
         
-        for page_index in range(page_start, page_stop + 1):
-            # 检查是否应该停止
-            if self.is_stopped():
-                self.log("在收集链接过程中收到停止请求")
-                break
-                
-            # 构建页面URL
-            if page_index == page_start:
-                page_url = config['url_onepage']
-            else:
-                page_url = config['url_multi_page'].format(page_index)
+        Args:
+            config (dict): 多页爬取配置
             
-            self.log(f"正在处理第 {page_index} 页: {page_url}")
+        Yields:
+            list: 一个列表页中的链接列表（未去重）
+        """
+        page_indexes = iter(range(config['url_multi_page_start'], config['url_multi_page_stop'] + 1))
+        window = self.list_page_concurrency
+        executor = ThreadPoolExecutor(max_workers=window, thread_name_prefix='list-page')
+        pending = deque()
+        
+        def fill_window():
+            while len(pending) < window and not self.is_stopped():
+                page_index = next(page_indexes, None)
+                if page_index is None:
+                    return
+                page_url = self._page_url(config, page_index)
+                self.log(f"正在处理第 {page_index} 页: {page_url}")
+                pending.append((page_index, page_url, executor.submit(self._fetch_list_page, page_url)))
+        
+        try:
+            fill_window()
+            while pending:
+                # 检查是否应该停止
+                if self.is_stopped():
+                    self.log("在收集链接过程中收到停止请求")
+                    break
+                
+                page_index, page_url, future = pending.popleft()
+                url_data = future.result()
+                if url_data is None:
+                    self.log(f"获取页面内容失败: {page_url}")
+                    if pending:
+                        self.log(f"已到达最后一页，取消第 {page_index} 页之后的 {len(pending)} 个列表页请求")
+                    break
+                
+                if url_data:
+                    self.log(f"第 {page_index} 页找到 {len(url_data)} 个链接")
+                else:
+                    self.log(f"第 {page_index} 页没有找到任何链接")
+                yield url_data
+                
+                fill_window()
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+    
+    def _fetch_list_page(self, page_url):
+        """获取列表页并解析链接，完成后执行随机延迟；获取失败返回None"""
+        if self.is_stopped():
+            return []
+        url_data = self._get_url_list(page_url)
+        if url_data is not None:
+            self.random_delay()
+        return url_data
+    
+    def _probe_last_page(self, config):
+        """
+        用HEAD请求（不支持时改用只取1字节的Range请求）按指数加二分的方式探测最后一页
+        
+        Args:
+            config (dict): 多页爬取配置
             
-            # 获取页面内容
-            page_content = self.get_page(page_url)
-            if not page_content:
-                self.log(f"获取页面内容失败: {page_url}")
-                break
+        Returns:
+            int: 最后一页的页码，探测失败或收到停止请求时返回None
+        """
+        self.log("正在探测列表页的最后一页...")
+        search = last_page_search(config['url_multi_page_start'], config['url_multi_page_stop'])
+        probe_count = 0
+        try:
+            page_index = next(search)
+            while True:
+                if self.is_stopped():
+                    return None
+                exists = self._page_exists(self._page_url(config, page_index))
+                if exists is None:
+                    self.log("探测最后一页失败，按配置的页码范围爬取")
+                    return None
+                probe_count += 1
+                page_index = search.send(exists)
+        except StopIteration as e:
+            last_page = e.value
+        
+        self.log(f"探测到最后一页为第 {last_page} 页，共发送 {probe_count} 个探测请求")
+        return last_page
+    
+    def _page_exists(self, url):
+        """
+        发送探测请求判断页面是否存在
+        
+        Args:
+            url (str): 页面URL
             
-            # 解析链接列表
-            url_data = self.parse_url_lists(page_content)
-            if url_data:
-                all_url_data.extend(url_data)
-                self.log(f"第 {page_index} 页找到 {len(url_data)} 个链接")
-            else:
-                self.log(f"第 {page_index} 页没有找到任何链接")
+        Returns:
+            bool: 页面是否存在，请求失败或被限流等无法判断的情况返回None
+        """
+        try:
+            if not self._acquire_rate_limit(url):
+                return None
             
-            self.random_delay()
+            status = None
+            if self._probe_method == 'HEAD':
+                response = self.session.head(url, timeout=(self.connect_timeout, self.read_timeout), allow_redirects=True)
+                response.close()
+                status = response.status_code
+                if status in (405, 501):
+                    self.log("服务端不支持HEAD请求，改用Range请求探测")
+                    self._probe_method = 'RANGE'
+            if self._probe_method == 'RANGE':
+                with self.session.get(url, headers={'Range': 'bytes=0-0'}, timeout=(self.connect_timeout, self.read_timeout), stream=True) as response:
+                    status = response.status_code
+        except Exception as e:
+            self.log(f"探测页面失败: {url}, 错误: {str(e)}")
+            return None
         
-        # 去重
-        unique_urls = []
-        seen_urls = set()
-        for item in all_url_data:
+        if status == 429 or status >= 500:
+            self.log(f"探测页面失败: {url}, 状态码: {status}")
+            return None
+        return status < 400
+    
+    def _dedup_links(self, url_data, seen_urls):
+        """去掉本次爬取中已经出现过的链接，并把新链接记入seen_urls"""
+        new_items = []
+        for item in url_data:
             url = item['url']
             if url not in seen_urls:
                 seen_urls.add(url)
-                unique_urls.append(item)
+                new_items.append(item)
+        return new_items
+    
+    def _add_links(self, count):
+        """记录一个列表页中新发现的链接数，返回进度总数"""
+        with self._progress_lock:
+            self._total_links += count
+            self._pages_done += 1
+            return self._progress_total()
+    
+    def _progress_total(self):
+        """进度总数，已探测到列表页总数时按已获取页面的平均链接数估算全部链接数（需持有_progress_lock）"""
+        total = self._total_links
+        if self._expected_pages and 0 < self._pages_done < self._expected_pages:
+            total = max(total, total * self._expected_pages // self._pages_done)
+        return total
+    
+    def _collection_message(self):
+        """链接收集阶段的进度说明"""
+        message = f"已发现 {self._total_links} 个链接"
+        if self._expected_pages:
+            message += f"（列表页 {self._pages_done}/{self._expected_pages}）"
+        return message
+    
+    def _crawl_pipeline(self, config):
+        """
+        以生产者/消费者流水线的方式收集链接并爬取文章
+        
+        当前线程依次获取列表页并把去重后的新链接放入有界队列，工作线程同时从队列中
+        领取链接爬取文章。队列满时暂停获取列表页，内存中只保留待处理的链接和已见过的URL。
+        
+        Args:
+            config (dict): 多页爬取配置
+            
+        Returns:
+            int: 去重后的链接总数
+        """
+        worker_count = self._worker_count()
+        self.log(f"开始爬取，列表页解析出的链接将立即交给 {worker_count} 个文章工作线程")
+        
+        self._processed_count = 0
+        self._total_links = 0
+        self._pages_done = 0
+        
+        # 需要重试的链接会延后重新投递
+        work_queue = WorkQueue(maxsize=self.link_queue_size)
+        workers = []
+        for i in range(worker_count):
+            worker = threading.Thread(
+                target=self._article_worker,
+                args=(work_queue,),
+                name=f"article-worker-{i + 1}",
+                daemon=True
+            )
+            worker.start()
+            workers.append(worker)
         
-        self.log(f"总共收集到 {len(all_url_data)} 个链接，去重后剩余 {len(unique_urls)} 个链接")
-        return unique_urls
+        found_count = 0
+        seen_urls = set()
+        batches = self._iter_url_batches(config)
+        try:
+            for url_data in batches:
+                found_count += len(url_data)
+                new_items = self._dedup_links(url_data, seen_urls)
+                total = self._add_links(len(new_items))
+                for item in new_items:
+                    if not self._put_link(work_queue, item):
+                        break
+                if self.is_stopped():
+                    break
+                with self._progress_lock:
+                    processed = self._processed_count
+                    message = self._collection_message()
+                self.update_progress(processed, total, message)
+        finally:
+            batches.close()
+            work_queue.close()
+            for worker in workers:
+                worker.join()
+        
+        total = self._total_links
+        self.log(f"总共收集到 {found_count} 个链接，去重后剩余 {total} 个链接")
+        
+        # 更新最终进度
+        if total and not self.is_stopped():
+            self.update_progress(total, total, "文章爬取完成")
+        return total
+    
+    def _put_link(self, work_queue, item):
+        """把链接放入有界队列，队列满时等待空位，收到停止请求时返回False"""
+        while not self.is_stopped():
+            try:
+                work_queue.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
     
     def _crawl_page(self, url, page_name):
         """爬取单个页面并返回URL列表"""
         self.log(f"正在获取{page_name}: {url}")
         
-        page_soup = self.get_page(url)
+        page_soup = self.get_page(url, target='list')
         if not page_soup:
             self.log(f"无法获取{page_name}，可能已到最后一页")
             return []
@@ -829,58 +1694,86 @@ class WebCrawler:
         self.log(f"{page_name}找到 {len(page_urls)} 个链接")
         return page_urls
     
-    def _crawl_articles(self, url_data, config):
-        """爬取文章内容"""
-        if not url_data:
-            self.log("没有找到任何链接，跳过文章爬取")
-            return
+    def _article_worker(self, work_queue):
+        """文章爬取工作线程，循环领取队列中的链接直到所有链接处理完成或收到停止请求"""
+        while not self.is_stopped():
+            try:
+                item = work_queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            if item is None:
+                return
+            
+            try:
+                finished = self._process_article(item, work_queue)
+            finally:
+                work_queue.task_done()
             
-        self.log(f"开始爬取文章内容，共 {len(url_data)} 个链接")
+            if finished:
+                # 更新进度
+                with self._progress_lock:
+                    self._processed_count += 1
+                    processed = self._processed_count
+                    total = self._progress_total()
+                self.update_progress(processed, total, f"已处理: {item['title'][:30]}...")
         
-        # 通知UI开始爬取文章，并设置总数量
-        self.update_progress(0, len(url_data), "开始爬取文章内容")
+        self.log("在爬取文章内容过程中收到停止请求")
+    
+    def _process_article(self, item, work_queue=None):
+        """
+        获取、解析并保存单篇文章
         
-        for i, item in enumerate(url_data):
-            # 检查是否应该停止
-            if self.is_stopped():
-                self.log("在爬取文章内容过程中收到停止请求")
-                break
-                
-            url = item['url']
-            title = item['title']
-            
-            # 更新进度
-            self.update_progress(i, len(url_data), f"正在处理: {title[:30]}...")
-            
-            self.log(f"正在处理链接: {url}, 标题: {title}")
+        Args:
+            item (dict): 包含标题和链接的字典，可带attempt表示尝试次数
+            work_queue (WorkQueue, optional): 任务队列，提供时失败的请求延后重新投递而不在当前线程等待
             
-            try:
+        Returns:
+            bool: 文章处理结束返回True，已延后重试返回False
+        """
+        url = item['url']
+        title = item['title']
+        
+        self.log(f"正在处理链接: {url}, 标题: {title}")
+        
+        try:
+            if self.parse_pool:
+                # 只下载正文，在解析进程中构建页面对象并解析文章
+                result = self.fetch_page(url, attempt=item.get('attempt', 1), defer_retry=work_queue is not None, target='article', raw=True)
+                if result.body is None:
+                    self.log(f"获取页面内容失败: {url}")
+                    return True
+                article_data = self._parse_article_body(result.body, result.encoding, url)
+            else:
                 # 获取页面内容
-                page_content = self.get_page(url)
+                page_content = self.get_page(url, attempt=item.get('attempt', 1), defer_retry=work_queue is not None, target='article')
                 if not page_content:
                     self.log(f"获取页面内容失败: {url}")
-                    continue
+                    return True
                 
                 # 解析文章内容
                 article_data = self.parse_article(page_content, url)
 
-                if not article_data.get('content'):
-                    continue
-                
-                # 使用从链接列表中提取的标题
-                article_data['title'] = title
-                
-                # 保存结果
-                self.save_results(article_data)
-                
-                self.log(f"已处理文章: {title}, 时间: {article_data.get('time', '未知')}")
-                
-                self.random_delay()
-                    
-            except Exception as e:
-                self.log(f"处理链接 {url} 时出错: {str(e)}")
-                continue
+            if not article_data.get('content'):
+                return True
+            
+            # 使用从链接列表中提取的标题
+            article_data['title'] = title
+            
+            # 保存结果
+            self.save_results(article_data)
+            
+            self.log(f"已处理文章: {title}, 时间: {article_data.get('time', '未知')}")
+            
+            self.random_delay()
+            return True
         
-        # 更新最终进度
-        if not self.is_stopped():
-            self.update_progress(len(url_data), len(url_data), "文章爬取完成")
\ No newline at end of file
+        except RetryLater as e:
+            if e.parked:
+                self.log(f"主机熔断中，暂缓 {e.delay:.1f} 秒: {url}")
+            else:
+                self.log(f"请求失败，{e.delay:.1f} 秒后第 {e.attempt} 次尝试: {url}")
+            work_queue.put(dict(item, attempt=e.attempt), delay=e.delay, block=False)
+            return False
+        except Exception as e:
+            self.log(f"处理链接 {url} 时出错: {str(e)}")
+            return True
\ No newline at end of file
@@ -0,0 +1,31 @@
+from .crawler import WebCrawler
+from .async_crawler import AsyncWebCrawler
+
+# 可选的爬虫引擎，对应配置中的engine字段
+ENGINES = {
+    'threaded': WebCrawler,
+    'async': AsyncWebCrawler,
+}
+
+DEFAULT_ENGINE = 'threaded'
+
+
+def create_crawler(config, logger=None, progress_callback=None):
+    """
+    根据配置中的engine字段创建爬虫实例
+    
+    Args:
+        config (dict): 爬虫配置
+        logger: 日志记录器
+        progress_callback: 进度回调函数，接收(current, total, message)参数
+    
+    Returns:
+        WebCrawler: 爬虫实例，未知引擎时回退到默认的多线程引擎
+    """
+    engine = config.get('engine', DEFAULT_ENGINE)
+    crawler_class = ENGINES.get(engine)
+    if crawler_class is None:
+        if logger:
+            logger.warning(f"未知的爬虫引擎: {engine}，使用默认引擎 {DEFAULT_ENGINE}")
+        crawler_class = ENGINES[DEFAULT_ENGINE]
+    return crawler_class(config, logger, progress_callback)
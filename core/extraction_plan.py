@@ -0,0 +1,413 @@
+import calendar
+from datetime import datetime
+from functools import lru_cache
+from urllib.parse import urljoin
+from .parser import FieldExtractor, compile_selector
+from .time_extractor import parse_structured_time
+
+# 每个提取计划缓存的相对链接解析结果数量
+URL_CACHE_SIZE = 4096
+
+# 配置的时间规则没有提取到时间时的处理：继续使用启发式提取，或不填写时间
+TIME_FALLBACK_HEURISTIC = 'heuristic'
+TIME_FALLBACK_NONE = 'none'
+TIME_FALLBACKS = (TIME_FALLBACK_HEURISTIC, TIME_FALLBACK_NONE)
+
+# strptime格式中表示时刻的指令，不含这些指令的格式只给出日期
+_CLOCK_DIRECTIVES = ('%H', '%I', '%M', '%S', '%X', '%c')
+
+
+class _Frozen:
+    """创建后不可修改的对象，属性只能在__init__中通过_set()设置"""
+    
+    __slots__ = ()
+    
+    def _set(self, **fields):
+        for name, value in fields.items():
+            object.__setattr__(self, name, value)
+    
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__}创建后不可修改")
+    
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__}创建后不可修改")
+
+
+class ElementMatcher(_Frozen):
+    """
+    按标签名和id或class查找元素，查找方式在创建时确定：
+    配置了id时按id查找，否则配置了class时按class查找，都没有时只按标签名查找
+    
+    Attributes:
+        name (str): 标签名
+        id (str): id属性
+        class_ (str): class属性
+        find (callable): 接收页面对象或元素，返回第一个匹配的后代元素
+        find_all (callable): 接收页面对象或元素，返回所有匹配的后代元素
+    """
+    
+    __slots__ = ('name', 'id', 'class_', 'find', 'find_all')
+    
+    def __init__(self, name, id='', class_=''):
+        if id:
+            find = lambda node: node.find(name, id=id)
+            find_all = lambda node: node.find_all(name, id=id)
+        elif class_:
+            find = lambda node: node.find(name, class_=class_)
+            find_all = lambda node: node.find_all(name, class_=class_)
+        else:
+            find = lambda node: node.find(name)
+            find_all = lambda node: node.find_all(name)
+        self._set(name=name, id=id, class_=class_, find=find, find_all=find_all)
+    
+    @classmethod
+    def from_config(cls, config, default_name):
+        """从{'name', 'id', 'class'}形式的配置创建"""
+        return cls(config.get('name', default_name), config.get('id', ''), config.get('class', ''))
+    
+    @property
+    def scoped(self):
+        """是否配置了id或class，未配置时容器匹配器表示在整个页面中查找"""
+        return bool(self.id or self.class_)
+
+
+def _text_getter(attr):
+    """生成读取元素文本或属性值的函数，attr为text时读取去除首尾空白的文本"""
+    if attr == 'text':
+        return lambda element: element.get_text(strip=True)
+    return lambda element: element.get(attr, '')
+
+
+def _url_resolver(base_url):
+    """生成带缓存的链接解析函数，不以http开头的链接相对于base_url解析"""
+    @lru_cache(maxsize=URL_CACHE_SIZE)
+    def resolve(href):
+        if not href.startswith('http'):
+            return urljoin(base_url, href)
+        return href
+    return resolve
+
+
+class TimeRule(_Frozen):
+    """
+    article_config.target_time配置的文章时间提取规则
+    
+    只读取选择器匹配的第一个元素，不运行启发式提取。配置了format时按strptime格式解析，
+    只有日期的格式用当前时刻补全，没有年份的格式在解析前加上当前年份（当前年份不是闰年时，2月29日使用最近的闰年）；
+    未配置format时按TIME_PATTERNS从值中查找时间。
+    
+    Attributes:
+        selector (CompiledSelector): 时间元素的选择器（CSS或XPath）
+        attr (str): 时间所在的属性，text表示元素文本
+        format (str): strptime格式，为空时自动识别
+        fallback (str): 没有提取到时间时的处理，TIME_FALLBACKS之一
+    """
+    
+    __slots__ = ('selector', 'attr', 'format', 'fallback', '_get_value', '_date_only', '_no_year')
+    
+    def __init__(self, config):
+        """
+        Args:
+            config (dict): {'selector': 选择器, 'attr': 属性名, 'format': strptime格式, 'fallback': 处理方式}
+        
+        Raises:
+            ValueError: 选择器或fallback无效
+        """
+        selector = (config.get('selector') or '').strip()
+        if not selector:
+            raise ValueError("target_time未配置selector")
+        try:
+            compiled = compile_selector(selector)
+        except Exception as e:
+            raise ValueError(f"target_time的选择器无效: {str(e)}") from e
+        fallback = config.get('fallback') or TIME_FALLBACK_HEURISTIC
+        if fallback not in TIME_FALLBACKS:
+            raise ValueError(f"target_time的fallback无效: {fallback}，可选 {', '.join(TIME_FALLBACKS)}")
+        attr = config.get('attr') or 'text'
+        time_format = config.get('format') or ''
+        self._set(
+            selector=compiled,
+            attr=attr,
+            format=time_format,
+            fallback=fallback,
+            _get_value=_text_getter(attr),
+            _date_only=bool(time_format) and not any(directive in time_format for directive in _CLOCK_DIRECTIVES),
+            _no_year=bool(time_format) and '%Y' not in time_format and '%y' not in time_format
+        )
+    
+    def _strptime_without_year(self, value, year):
+        """
+        按没有年份的格式解析，补上年份后再解析
+        
+        strptime没有年份时使用1900年，2月29日总是解析失败；当前年份不是闰年时再尝试最近的闰年
+        """
+        try:
+            return datetime.strptime(f"{year} {value}", f"%Y {self.format}")
+        except ValueError:
+            if calendar.isleap(year):
+                raise
+            leap_year = year - 1
+            while not calendar.isleap(leap_year):
+                leap_year -= 1
+            return datetime.strptime(f"{leap_year} {value}", f"%Y {self.format}")
+    
+    @property
+    def use_heuristic(self):
+        """没有提取到时间时是否继续使用启发式提取"""
+        return self.fallback == TIME_FALLBACK_HEURISTIC
+    
+    def extract(self, document, parse):
+        """
+        按规则提取文章时间
+        
+        Args:
+            document: 页面对象（BeautifulSoup或lxml.html）
+            parse (callable): 未配置format时解析时间文本的函数，解析失败返回None
+        
+        Returns:
+            str: 格式为%Y-%m-%d %H:%M:%S的时间，没有匹配元素或无法解析时返回None
+        """
+        item = self.selector.select_one(document)
+        if item is None:
+            return None
+        # XPath可能直接返回文本或属性值
+        value = (item if isinstance(item, str) else self._get_value(item)).strip()
+        if not value:
+            return None
+        if not self.format:
+            return parse_structured_time(value, parse)
+        
+        now = datetime.now()
+        try:
+            if self._no_year:
+                parsed_time = self._strptime_without_year(value, now.year)
+            else:
+                parsed_time = datetime.strptime(value, self.format)
+        except ValueError:
+            return None
+        if self._date_only:
+            parsed_time = parsed_time.replace(hour=now.hour, minute=now.minute, second=now.second)
+        return parsed_time.strftime('%Y-%m-%d %H:%M:%S')
+
+
+class ListPlan(_Frozen):
+    """
+    列表页的提取计划
+    
+    Attributes:
+        container (ElementMatcher): 列表容器，未配置id和class时在整个页面中查找列表项
+        item (ElementMatcher): 列表项
+        link_tag (str): 链接元素的标签名
+        link_attr (str): 链接所在的属性
+        title_tag (str): 标题元素的标签名
+        title_attr (str): 标题所在的属性，text表示元素文本
+        resolve_url (callable): 带缓存的链接解析函数
+    """
+    
+    __slots__ = ('container', 'item', 'link_tag', 'link_attr', 'title_tag', 'title_attr',
+                 'resolve_url', '_get_title', '_same_element')
+    
+    def __init__(self, url_list_config, base_url):
+        list_item_config = url_list_config.get('target_list_item', {})
+        title_config = list_item_config.get('title', {})
+        link_config = list_item_config.get('link', {})
+        link_tag = link_config.get('name', 'a')
+        title_tag = title_config.get('name', 'a')
+        title_attr = title_config.get('attr', 'text')
+        self._set(
+            container=ElementMatcher.from_config(url_list_config.get('target_list_container', {}), 'div'),
+            item=ElementMatcher.from_config(list_item_config, 'li'),
+            link_tag=link_tag,
+            link_attr=link_config.get('attr', 'href'),
+            title_tag=title_tag,
+            title_attr=title_attr,
+            resolve_url=_url_resolver(base_url),
+            _get_title=_text_getter(title_attr),
+            # 链接和标题来自同一标签时只查找一次
+            _same_element=link_tag == title_tag
+        )
+    
+    def find_items(self, document):
+        """
+        查找页面中的所有列表项
+        
+        Args:
+            document: 页面对象
+        
+        Returns:
+            list: 列表项元素
+        
+        Raises:
+            AttributeError: 配置了容器但页面中没有找到
+        """
+        container = self.container.find(document) if self.container.scoped else document
+        return self.item.find_all(container)
+    
+    def extract_links(self, items):
+        """
+        从列表项中提取链接和标题
+        
+        Args:
+            items (list): find_items()返回的列表项
+        
+        Returns:
+            list: [{'title': '标题', 'url': '链接'}, ...]，没有标题时使用链接作为标题
+        """
+        link_tag = self.link_tag
+        link_attr = self.link_attr
+        title_tag = self.title_tag
+        get_title = self._get_title
+        resolve_url = self.resolve_url
+        same_element = self._same_element
+        
+        url_data = []
+        for element in items:
+            link_element = element.find(link_tag)
+            title_element = link_element if same_element else element.find(title_tag)
+            
+            full_url = ''
+            title = ''
+            if link_element and link_element.has_attr(link_attr):
+                full_url = resolve_url(link_element[link_attr])
+            
+            if title_element:
+                title = get_title(title_element) or full_url
+            
+            url_data.append({
+                'title': title,
+                'url': full_url
+            })
+        return url_data
+    
+    def apply(self, document):
+        """提取一个列表页中的链接和标题"""
+        return self.extract_links(self.find_items(document))
+    
+    def apply_batch(self, documents):
+        """
+        依次提取多个列表页中的链接和标题
+        
+        Args:
+            documents (iterable): 页面对象
+        
+        Returns:
+            list: 每个页面的提取结果
+        """
+        return [self.apply(document) for document in documents]
+
+
+class ArticlePlan(_Frozen):
+    """
+    文章页的提取计划
+    
+    Attributes:
+        container (ElementMatcher): 文章容器，未配置id和class时在整个页面中查找文本元素
+        text_tag (str): 文本元素的标签名
+        text_attr (str): 文本所在的属性，text表示元素文本
+        fields (FieldExtractor): 配置中fields定义的附加字段，未配置时为None
+        time (TimeRule): 配置中target_time定义的时间规则，未配置时为None
+    """
+    
+    __slots__ = ('container', 'text_tag', 'text_attr', 'fields', 'time', '_get_text', '_attr_only')
+    
+    def __init__(self, article_config):
+        text_item_config = article_config.get('target_text_item', {})
+        text_attr = text_item_config.get('attr', 'text')
+        self._set(
+            container=ElementMatcher.from_config(article_config.get('target_container', {}), 'div'),
+            text_tag=text_item_config.get('name', 'p'),
+            text_attr=text_attr,
+            fields=FieldExtractor(article_config['fields']) if article_config.get('fields') else None,
+            time=TimeRule(article_config['target_time']) if (article_config.get('target_time') or {}).get('selector') else None,
+            _get_text=_text_getter(text_attr),
+            # 提取属性值时跳过没有该属性的元素
+            _attr_only=text_attr != 'text'
+        )
+    
+    def extract_content(self, document):
+        """
+        提取文章正文，各文本元素之间以换行分隔
+        
+        Args:
+            document: 页面对象
+        
+        Returns:
+            str: 正文内容
+        
+        Raises:
+            AttributeError: 配置了容器但页面中没有找到
+        """
+        container = self.container.find(document) if self.container.scoped else document
+        elements = container.find_all(self.text_tag)
+        get_text = self._get_text
+        if self._attr_only:
+            text_attr = self.text_attr
+            return '\n'.join([get_text(element) for element in elements if element.has_attr(text_attr)])
+        return '\n'.join([get_text(element) for element in elements])
+    
+    @property
+    def selectors(self):
+        """附加字段和时间规则使用的选择器，定向解析时需要保留它们匹配的元素"""
+        selectors = tuple(field.selector for field in self.fields.fields) if self.fields is not None else ()
+        if self.time is not None:
+            selectors += (self.time.selector,)
+        return selectors
+    
+    @property
+    def xpath_selectors(self):
+        """配置中使用的XPath选择器，只能用于lxml.html解析器"""
+        return tuple(selector.expression for selector in self.selectors if selector.is_xpath)
+    
+    @property
+    def field_names(self):
+        """附加字段的名称"""
+        if self.fields is None:
+            return ()
+        return tuple(field.name for field in self.fields.fields)
+    
+    def extract_fields(self, document):
+        """
+        一次遍历提取附加字段
+        
+        Args:
+            document: 页面对象
+        
+        Returns:
+            dict: 字段名到值的映射，未配置附加字段时为空字典
+        """
+        if self.fields is None:
+            return {}
+        return self.fields.extract(document)
+    
+    def apply_batch(self, documents):
+        """依次提取多个文章页的正文，返回每个页面的正文列表"""
+        return [self.extract_content(document) for document in documents]
+
+
+class ExtractionPlan(_Frozen):
+    """
+    由爬虫配置编译得到的不可变提取计划
+    
+    在创建爬虫时一次性读取url_list_config和article_config、确定默认值和查找方式，
+    解析每个页面时不再遍历配置字典。
+    
+    Attributes:
+        list (ListPlan): 列表页的提取计划
+        article (ArticlePlan): 文章页的提取计划
+    """
+    
+    __slots__ = ('list', 'article')
+    
+    def __init__(self, url_list_config, article_config, base_url):
+        """
+        编译提取计划
+        
+        Args:
+            url_list_config (dict): 列表页配置
+            article_config (dict): 文章页配置
+            base_url (str): 解析相对链接使用的基础URL
+        """
+        self._set(
+            list=ListPlan(url_list_config or {}, base_url),
+            article=ArticlePlan(article_config or {})
+        )
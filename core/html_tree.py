@@ -0,0 +1,460 @@
+import re
+import threading
+from bs4 import BeautifulSoup, FeatureNotFound, SoupStrainer
+
+# 尝试导入lxml模块
+try:
+    import lxml.html
+    from lxml import etree
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+# 尝试导入cssselect模块，安装后CSS选择器由cssselect转换为XPath，支持完整的CSS3语法
+try:
+    from cssselect import HTMLTranslator
+    _css_translator = HTMLTranslator()
+except ImportError:
+    _css_translator = None
+
+# 可选的页面解析器，对应配置中的parser字段：
+# html.parser为BeautifulSoup内置的纯Python解析器，lxml为BeautifulSoup使用lxml建树，
+# lxml.html直接使用lxml的元素树，不构建BeautifulSoup对象
+PARSER_BACKENDS = ('html.parser', 'lxml', 'lxml.html')
+
+DEFAULT_PARSER = 'html.parser'
+
+# get_text()从祖先元素调用时跳过这些元素中的文本，与BeautifulSoup的行为一致
+_SKIP_TEXT_TAGS = {'script', 'style', 'template'}
+
+
+def resolve_parser(name, log=None):
+    """
+    检查解析器名称和依赖，不可用时回退到默认解析器
+    
+    Args:
+        name (str): 配置中的解析器名称
+        log (callable, optional): 日志函数
+    
+    Returns:
+        str: 实际使用的解析器名称
+    """
+    if name not in PARSER_BACKENDS:
+        if log:
+            log(f"未知的页面解析器: {name}，使用默认解析器 {DEFAULT_PARSER}")
+        return DEFAULT_PARSER
+    if name != 'html.parser' and not LXML_AVAILABLE:
+        if log:
+            log(f"页面解析器 {name} 需要lxml，请先执行: pip install lxml，使用默认解析器 {DEFAULT_PARSER}")
+        return DEFAULT_PARSER
+    return name
+
+
+def parse_html(text, parser=DEFAULT_PARSER, parse_only=None):
+    """
+    将页面文本解析为页面对象
+    
+    Args:
+        text (str): 页面文本
+        parser (str): 解析器名称，见PARSER_BACKENDS
+        parse_only (SoupStrainer, optional): 只构建匹配的子树，lxml.html解析器忽略该参数
+    
+    Returns:
+        BeautifulSoup或LxmlDocument: 页面对象，两者提供相同的查找和取文本接口
+    """
+    if parser == 'lxml.html':
+        return LxmlDocument.from_text(text)
+    try:
+        return BeautifulSoup(text, parser, parse_only=parse_only)
+    except FeatureNotFound:
+        return BeautifulSoup(text, DEFAULT_PARSER, parse_only=parse_only)
+
+
+def element_rule(name, id='', class_=''):
+    """
+    生成TargetStrainer使用的元素规则，匹配条件与find(name, id=id, class_=class_)相同，
+    同时指定id和class时只按id匹配
+    
+    Args:
+        name (str): 标签名
+        id (str): id属性
+        class_ (str): class属性
+    
+    Returns:
+        callable: 接收标签名和属性字典、返回是否匹配的函数
+    """
+    def rule(tag_name, attrs):
+        if tag_name != name:
+            return False
+        if id:
+            return attrs.get('id') == id
+        if class_:
+            return _class_matches(attrs.get('class'), class_)
+        return True
+    return rule
+
+
+class TargetStrainer(SoupStrainer):
+    """
+    定向解析使用的SoupStrainer：只保留匹配任一规则的元素及其整个子树，其余元素和文本不创建
+    
+    规则为接收标签名和属性字典、返回是否匹配的函数。同时实现bs4 4.13起的
+    allow_tag_creation()/allow_string_creation()和更早版本的search_tag()/search()。
+    """
+    
+    def __init__(self, rules):
+        """
+        初始化
+        
+        Args:
+            rules (list): 元素规则列表
+        """
+        super().__init__()
+        self.rules = tuple(rules)
+    
+    def _matches(self, name, attrs):
+        attrs = attrs or {}
+        return any(rule(name, attrs) for rule in self.rules)
+    
+    def allow_tag_creation(self, nsprefix, name, attrs):
+        return self._matches(name, attrs)
+    
+    def allow_string_creation(self, string):
+        return False
+    
+    def search_tag(self, markup_name=None, markup_attrs={}):
+        return markup_name if self._matches(markup_name, markup_attrs) else None
+    
+    def search(self, markup):
+        return None
+
+
+class LxmlElement:
+    """
+    lxml元素的包装，提供解析代码用到的BeautifulSoup接口子集：
+    find()、find_all()、select()、get_text()、get()、has_attr()和下标取属性
+    """
+    
+    __slots__ = ('element',)
+    
+    # 在查找时是否包含元素自身，BeautifulSoup文档对象的查找范围包含<html>根元素
+    _include_self = False
+    
+    def __init__(self, element):
+        self.element = element
+    
+    def __bool__(self):
+        return True
+    
+    def __eq__(self, other):
+        return isinstance(other, LxmlElement) and self.element is other.element
+    
+    def __hash__(self):
+        return hash(self.element)
+    
+    def __repr__(self):
+        return f"<{type(self).__name__} {self.name}>"
+    
+    @property
+    def name(self):
+        """标签名"""
+        return self.element.tag
+    
+    @property
+    def attrs(self):
+        """属性字典"""
+        return dict(self.element.attrib)
+    
+    def get(self, key, default=None):
+        return self.element.get(key, default)
+    
+    def has_attr(self, key):
+        return key in self.element.attrib
+    
+    def __getitem__(self, key):
+        return self.element.attrib[key]
+    
+    def _iter_candidates(self, name):
+        if self._include_self:
+            return self.element.iter(name)
+        return self.element.iterdescendants(name)
+    
+    def _iter_matches(self, name, id=None, class_=None):
+        for element in self._iter_candidates(name):
+            if id and element.get('id') != id:
+                continue
+            if class_ and not _class_matches(element.get('class'), class_):
+                continue
+            yield element
+    
+    def find(self, name, id=None, class_=None):
+        """
+        查找第一个匹配的后代元素
+        
+        Args:
+            name (str): 标签名
+            id (str, optional): id属性
+            class_ (str, optional): class属性，匹配其中一个类名或完整的属性值
+        
+        Returns:
+            LxmlElement: 匹配的元素，没有时返回None
+        """
+        for element in self._iter_matches(name, id, class_):
+            return LxmlElement(element)
+        return None
+    
+    def find_all(self, name, id=None, class_=None):
+        """查找所有匹配的后代元素，参数同find()"""
+        return [LxmlElement(element) for element in self._iter_matches(name, id, class_)]
+    
+    def select(self, selector):
+        """
+        按CSS选择器查找后代元素
+        
+        Args:
+            selector (str): CSS选择器
+        
+        Returns:
+            list: 匹配的元素列表，按文档顺序排列
+        """
+        xpath = compile_css(selector, self._include_self)
+        return [LxmlElement(element) for element in xpath(self.element)]
+    
+    def select_one(self, selector):
+        """按CSS选择器查找第一个后代元素，没有时返回None"""
+        elements = self.select(selector)
+        return elements[0] if elements else None
+    
+    def get_text(self, separator='', strip=False):
+        """
+        获取元素内的文本，不含注释以及script、style中的文本
+        
+        Args:
+            separator (str): 各段文本之间的分隔符
+            strip (bool): 去除每段文本首尾的空白，并丢弃空白段
+        
+        Returns:
+            str: 文本内容
+        """
+        strings = _iter_strings(self.element)
+        if strip:
+            strings = (string.strip() for string in strings)
+            strings = (string for string in strings if string)
+        return separator.join(strings)
+    
+    @property
+    def text(self):
+        return self.get_text()
+
+
+class LxmlDocument(LxmlElement):
+    """lxml.html解析得到的整个页面，查找范围包含<html>根元素"""
+    
+    __slots__ = ()
+    
+    _include_self = True
+    
+    @classmethod
+    def from_text(cls, text):
+        """
+        解析页面文本
+        
+        Args:
+            text (str): 页面文本
+        
+        Returns:
+            LxmlDocument: 页面对象，空页面返回只有<html>根元素的页面
+        """
+        try:
+            root = lxml.html.document_fromstring(text)
+        except ValueError:
+            # 带编码声明的XML头不能以str形式解析，转为UTF-8字节后再解析
+            parser = lxml.html.HTMLParser(encoding='utf-8')
+            try:
+                root = lxml.html.document_fromstring(text.encode('utf-8'), parser=parser)
+            except etree.ParserError:
+                root = lxml.html.Element('html')
+        except etree.ParserError:
+            root = lxml.html.Element('html')
+        return cls(root)
+
+
+def _class_matches(value, class_):
+    """与BeautifulSoup的class_参数一致：匹配其中一个类名，或与完整的属性值相同"""
+    if not value:
+        return False
+    if isinstance(value, list):
+        value = ' '.join(value)
+    return class_ == value or class_ in value.split()
+
+
+def _iter_strings(root):
+    """按文档顺序产出元素内的文本片段，跳过注释和后代script/style/template中的文本"""
+    skip_depth = 0
+    for event, element in etree.iterwalk(root, events=('start', 'end')):
+        is_tag = isinstance(element.tag, str)
+        if event == 'start':
+            if is_tag and element is not root and element.tag in _SKIP_TEXT_TAGS:
+                skip_depth += 1
+            if skip_depth == 0 and is_tag and element.text:
+                yield element.text
+        else:
+            if is_tag and element is not root and element.tag in _SKIP_TEXT_TAGS:
+                skip_depth -= 1
+            if skip_depth == 0 and element is not root and element.tail:
+                yield element.tail
+
+
+# 未安装cssselect时使用的CSS选择器到XPath的转换，支持解析代码中用到的子集：
+# 标签、*、#id、.class、[attr]、[attr=v]、[attr~=v]、[attr^=v]、[attr$=v]、[attr*=v]，
+# 后代（空格）和子元素（>）组合符，以及逗号分隔的多个选择器
+_CSS_TOKEN_RE = re.compile(
+    r'\s*(?:'
+    r'(?P<comma>,)'
+    r'|(?P<child>>)'
+    r'|(?P<tag>\*|[a-zA-Z][\w-]*)'
+    r'|\#(?P<id>[\w-]+)'
+    r'|\.(?P<cls>[\w-]+)'
+    r'|\[\s*(?P<attr>[\w-]+)\s*(?:(?P<op>[~^$*]?=)\s*(?:"(?P<dq>[^"]*)"|\'(?P<sq>[^\']*)\'|(?P<bare>[\w-]+))\s*)?\]'
+    r')'
+)
+
+_compiled_css = {}
+_css_lock = threading.Lock()
+
+
+def _xpath_literal(value):
+    if "'" not in value:
+        return f"'{value}'"
+    if '"' not in value:
+        return f'"{value}"'
+    parts = value.split("'")
+    return "concat(" + ", \"'\", ".join(f"'{part}'" for part in parts) + ")"
+
+
+def _attr_condition(name, op, value):
+    attr = f"@{name}"
+    if op is None:
+        return attr
+    literal = _xpath_literal(value)
+    if op == '=':
+        return f"{attr} = {literal}"
+    if not value:
+        # 与CSS规范一致，空值的前缀、后缀、包含和列表匹配不匹配任何元素
+        return "false()"
+    if op == '~=':
+        # 先判断属性存在，没有该属性的元素不必再做normalize-space
+        return f"{attr} and contains(concat(' ', normalize-space({attr}), ' '), {_xpath_literal(' ' + value + ' ')})"
+    if op == '^=':
+        return f"starts-with({attr}, {literal})"
+    if op == '$=':
+        return f"substring({attr}, string-length({attr}) - {len(value) - 1}) = {literal}"
+    return f"contains({attr}, {literal})"
+
+
+def css_to_xpath(selector, include_self=False):
+    """
+    将CSS选择器转换为XPath表达式
+    
+    Args:
+        selector (str): CSS选择器
+        include_self (bool): 查找范围是否包含当前元素自身
+    
+    Returns:
+        str: XPath表达式，从当前元素的后代中查找
+    
+    Raises:
+        ValueError: 选择器包含不支持的语法
+    """
+    first_axis = 'descendant-or-self' if include_self else 'descendant'
+    groups = []
+    steps = []
+    axis = first_axis
+    tag = None
+    conditions = []
+    position = 0
+    pending_space = False
+    
+    def close_step():
+        nonlocal tag, conditions
+        if tag is None and not conditions:
+            return False
+        step = f"{axis}::{tag or '*'}"
+        step += ''.join(f"[{condition}]" for condition in conditions)
+        steps.append(step)
+        tag = None
+        conditions = []
+        return True
+    
+    selector = selector.strip()
+    while position < len(selector):
+        match = _CSS_TOKEN_RE.match(selector, position)
+        if not match or match.end() == position:
+            raise ValueError(f"不支持的CSS选择器: {selector}")
+        # 简单选择器之间的空白表示后代组合符
+        if match.group(0)[:1].isspace() and (tag is not None or conditions):
+            pending_space = True
+        position = match.end()
+        
+        if match.group('comma') or match.group('child'):
+            if not close_step():
+                raise ValueError(f"不支持的CSS选择器: {selector}")
+            pending_space = False
+            if match.group('comma'):
+                groups.append('/'.join(steps))
+                steps = []
+                axis = first_axis
+            else:
+                axis = 'child'
+            continue
+        
+        if pending_space:
+            close_step()
+            axis = 'descendant'
+            pending_space = False
+        
+        if match.group('tag'):
+            if tag is not None or conditions:
+                raise ValueError(f"不支持的CSS选择器: {selector}")
+            tag = match.group('tag').lower()
+        elif match.group('id'):
+            conditions.append(f"@id = {_xpath_literal(match.group('id'))}")
+        elif match.group('cls'):
+            conditions.append(_attr_condition('class', '~=', match.group('cls')))
+        else:
+            value = match.group('dq')
+            if value is None:
+                value = match.group('sq')
+            if value is None:
+                value = match.group('bare')
+            conditions.append(_attr_condition(match.group('attr').lower(), match.group('op'), value))
+    
+    if not close_step():
+        raise ValueError(f"不支持的CSS选择器: {selector}")
+    groups.append('/'.join(steps))
+    return ' | '.join(groups)
+
+
+def compile_css(selector, include_self=False):
+    """
+    转换并编译CSS选择器，结果按选择器缓存；安装了cssselect时使用cssselect转换
+    
+    Args:
+        selector (str): CSS选择器
+        include_self (bool): 查找范围是否包含当前元素自身
+    
+    Returns:
+        etree.XPath: 编译后的XPath
+    """
+    key = (selector, include_self)
+    xpath = _compiled_css.get(key)
+    if xpath is None:
+        if _css_translator is not None:
+            prefix = 'descendant-or-self::' if include_self else 'descendant::'
+            expression = _css_translator.css_to_xpath(selector, prefix=prefix)
+        else:
+            expression = css_to_xpath(selector, include_self)
+        xpath = etree.XPath(expression)
+        with _css_lock:
+            _compiled_css[key] = xpath
+    return xpath
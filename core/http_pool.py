@@ -0,0 +1,183 @@
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3 import HTTPConnectionPool, HTTPSConnectionPool, PoolManager
+
+# 默认连接池配置
+DEFAULT_POOL_CONFIG = {
+    'max_hosts': 10,
+    'max_per_host': 10,
+    'block': False,
+    'keep_alive': True,
+    'keepalive_timeout': 15,
+}
+
+# 进程内共享的连接池适配器，按是否阻塞和长连接空闲超时区分；容量按所有使用者中最大的需求扩大
+_adapters = {}
+_registry_lock = threading.Lock()
+
+
+class _KeepAliveMixin:
+    """复用连接前检查空闲时间，空闲超过keepalive_timeout的连接关闭后重新建立"""
+    
+    keepalive_timeout = None
+    
+    def _get_conn(self, timeout=None):
+        conn = super()._get_conn(timeout)
+        idle_since = getattr(conn, '_idle_since', None)
+        if idle_since is not None and self.keepalive_timeout is not None:
+            if time.monotonic() - idle_since > self.keepalive_timeout:
+                conn.close()
+        return conn
+    
+    def _put_conn(self, conn):
+        if conn is not None:
+            conn._idle_since = time.monotonic()
+        super()._put_conn(conn)
+
+
+class _KeepAliveHTTPConnectionPool(_KeepAliveMixin, HTTPConnectionPool):
+    pass
+
+
+class _KeepAliveHTTPSConnectionPool(_KeepAliveMixin, HTTPSConnectionPool):
+    pass
+
+
+class _KeepAlivePoolManager(PoolManager):
+    """为每个主机创建带空闲超时的连接池"""
+    
+    def __init__(self, keepalive_timeout=None, **kwargs):
+        super().__init__(**kwargs)
+        self.keepalive_timeout = keepalive_timeout
+        self.pool_classes_by_scheme = {
+            'http': _KeepAliveHTTPConnectionPool,
+            'https': _KeepAliveHTTPSConnectionPool,
+        }
+    
+    def _new_pool(self, scheme, host, port, request_context=None):
+        pool = super()._new_pool(scheme, host, port, request_context)
+        pool.keepalive_timeout = self.keepalive_timeout
+        return pool
+
+
+class SharedPoolAdapter(HTTPAdapter):
+    """
+    进程内共享的HTTP适配器
+    
+    与aiohttp的keepalive_timeout含义相同，空闲超过keepalive_timeout秒的连接不再复用。
+    并发数不同的爬虫共用同一个适配器，每个爬虫通过ensure_capacity把容量扩大到自己的需求。
+    """
+    
+    def __init__(self, keepalive_timeout=None, **kwargs):
+        self.keepalive_timeout = keepalive_timeout
+        super().__init__(**kwargs)
+    
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs):
+        self._pool_connections = connections
+        self._pool_maxsize = maxsize
+        self._pool_block = block
+        self.poolmanager = _KeepAlivePoolManager(
+            keepalive_timeout=self.keepalive_timeout,
+            num_pools=connections,
+            maxsize=maxsize,
+            block=block,
+            **pool_kwargs
+        )
+    
+    def ensure_capacity(self, max_hosts, max_per_host):
+        """
+        把缓存的主机数和每主机连接数扩大到不少于给定值，已经足够时不做任何事
+        
+        每主机连接数是连接池的一部分，扩大后之前的连接池被关闭，正在使用的连接在请求结束后关闭。
+        
+        Args:
+            max_hosts (int): 缓存的主机数
+            max_per_host (int): 每主机保留的连接数
+        """
+        manager = self.poolmanager
+        if max_hosts > self._pool_connections:
+            self._pool_connections = max_hosts
+            manager.pools._maxsize = max_hosts
+        if max_per_host > self._pool_maxsize:
+            self._pool_maxsize = max_per_host
+            manager.connection_pool_kw['maxsize'] = max_per_host
+            manager.clear()
+
+
+def resolve_pool_config(pool_config=None, min_per_host=0):
+    """
+    合并默认值，得到完整的连接池配置
+    
+    Args:
+        pool_config (dict, optional): connection_pool配置
+        min_per_host (int): 每个主机至少保留的连接数，通常为爬虫的工作线程数
+    
+    Returns:
+        dict: 完整的连接池配置
+    """
+    resolved = dict(DEFAULT_POOL_CONFIG)
+    resolved.update(pool_config or {})
+    resolved['max_per_host'] = max(int(resolved['max_per_host']), int(min_per_host))
+    return resolved
+
+
+def get_shared_adapter(pool_config=None):
+    """
+    获取进程内共享的HTTP适配器
+    
+    连接池保存在适配器中，是否阻塞和长连接空闲超时相同的爬虫标签页、工作线程和请求测试窗口
+    共用同一个适配器，TCP连接和TLS握手可以在所有爬取任务之间复用。
+    适配器的容量扩大到所有使用者中最大的缓存主机数和每主机连接数。
+    
+    Args:
+        pool_config (dict, optional): connection_pool配置
+    
+    Returns:
+        SharedPoolAdapter: 共享的适配器，不要关闭
+    """
+    config = resolve_pool_config(pool_config)
+    max_hosts = int(config['max_hosts'])
+    max_per_host = int(config['max_per_host'])
+    keepalive_timeout = float(config['keepalive_timeout']) if config['keep_alive'] else None
+    key = (bool(config['block']), keepalive_timeout)
+    with _registry_lock:
+        adapter = _adapters.get(key)
+        if adapter is None:
+            adapter = SharedPoolAdapter(
+                keepalive_timeout=keepalive_timeout,
+                pool_connections=max_hosts,
+                pool_maxsize=max_per_host,
+                pool_block=key[0]
+            )
+            _adapters[key] = adapter
+        else:
+            adapter.ensure_capacity(max_hosts, max_per_host)
+        return adapter
+
+
+def create_session(headers=None, pool_config=None):
+    """
+    创建挂载共享连接池的会话
+    
+    每个会话有独立的请求头和Cookie，但底层连接来自共享的连接池。
+    
+    Args:
+        headers (dict, optional): 会话默认请求头
+        pool_config (dict, optional): connection_pool配置
+    
+    Returns:
+        requests.Session: 会话对象
+    """
+    config = resolve_pool_config(pool_config)
+    adapter = get_shared_adapter(config)
+    
+    session = requests.Session()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    if headers:
+        session.headers.update(headers)
+    if not config['keep_alive']:
+        session.headers['Connection'] = 'close'
+    return session
@@ -0,0 +1,82 @@
+import json
+import os
+import threading
+
+
+class JsonFileStore:
+    """
+    保存在JSON文件中的按键记录存储
+    
+    创建时从文件加载全部记录，修改后由save()一次写回。子类在_entries上实现具体的读写接口，
+    修改记录后设置_dirty；需要丢弃无效记录时覆盖_filter_entries。
+    """
+    
+    # 加载失败时输出的提示
+    load_error_message = "加载记录失败"
+    # 写入文件时的缩进，None表示紧凑格式
+    indent = None
+    
+    def __init__(self, path):
+        """
+        初始化存储，从文件中加载已有记录
+        
+        Args:
+            path (str): 存储文件路径
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._dirty = False
+        
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    self._entries = self._filter_entries(json.load(f))
+            except Exception as e:
+                print(f"{self.load_error_message}: {e}")
+                self._entries = {}
+    
+    def _filter_entries(self, entries):
+        """过滤从文件加载的记录，默认全部保留"""
+        return entries
+    
+    def save(self):
+        """将记录写入文件，先写临时文件再替换，避免中途失败损坏已有文件"""
+        with self._lock:
+            if not self._dirty:
+                return
+            data = json.dumps(self._entries, ensure_ascii=False, indent=self.indent)
+            self._dirty = False
+        
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(data)
+        os.replace(temp_path, self.path)
+
+
+# 进程内按存储类型和文件路径共享的存储，多个爬虫标签页写入同一文件时不会互相覆盖
+_stores = {}
+_registry_lock = threading.Lock()
+
+
+def get_shared_store(store_class, path):
+    """
+    获取指定类型和路径的共享存储
+    
+    Args:
+        store_class (type): JsonFileStore的子类
+        path (str): 存储文件路径
+    
+    Returns:
+        JsonFileStore: store_class的实例
+    """
+    key = (store_class, os.path.abspath(path))
+    with _registry_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = store_class(path)
+            _stores[key] = store
+        return store
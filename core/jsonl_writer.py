@@ -63,21 +63,22 @@ class JsonlWriter:
         
         print(f"创建新的JSONL文件: {self.current_file_path}")
     
-    def write(self, title, content, custom_time=None):
+    def write(self, title, content, custom_time=None, extra=None):
         """
         写入一条记录到JSONL文件
         
         Args:
             title (str): 标题
             content (str): 内容
-            custom_time (str, optional): 自定义时间，默认为当前时间
+            custom_time (str, optional): 自定义时间，为None时使用当前时间，空字符串表示没有时间
+            extra (dict, optional): 附加字段，不覆盖title、time和content
         """
         # 如果达到最大条数，创建新文件
         if self.current_file_entries >= self.max_entries_per_file:
             self._init_new_file()
         
         # 使用自定义时间或当前时间
-        if custom_time:
+        if custom_time is not None:
             timestamp = custom_time
         else:
             timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
@@ -88,6 +89,9 @@ class JsonlWriter:
             "time": timestamp,
             "content": content
         }
+        if extra:
+            for key, value in extra.items():
+                record.setdefault(key, value)
         
         # 写入JSONL格式（每行一个JSON对象）
         json_line = json.dumps(record, ensure_ascii=False)
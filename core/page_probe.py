@@ -0,0 +1,43 @@
+def last_page_search(start, stop):
+    """
+    查找最后一个存在的页码：先按1、2、4、8……的步长向后探测，越过末尾后在区间内二分
+    
+    以生成器的形式实现，便于同步和异步引擎共用：生成器产出待探测的页码，
+    调用方通过send()传回该页是否存在，生成器结束时的返回值即最后一页的页码。
+    起始页视为存在，探测次数约为2*log2(总页数)。
+    
+    Args:
+        start (int): 起始页码
+        stop (int): 页码上限
+    
+    Yields:
+        int: 待探测的页码
+    
+    Returns:
+        int: 最后一个存在的页码
+    """
+    low = start
+    high = None
+    step = 1
+    
+    # 指数探测，直到遇到不存在的页或到达上限
+    while high is None:
+        page_index = min(low + step, stop)
+        if page_index <= low:
+            return low
+        exists = yield page_index
+        if exists:
+            low = page_index
+            step *= 2
+        else:
+            high = page_index
+    
+    # 在low（存在）和high（不存在）之间二分
+    while high - low > 1:
+        page_index = (low + high) // 2
+        exists = yield page_index
+        if exists:
+            low = page_index
+        else:
+            high = page_index
+    return low
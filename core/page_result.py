@@ -0,0 +1,56 @@
+class PageResult:
+    """
+    一次页面请求的结果
+    
+    Attributes:
+        url (str): 请求URL
+        soup: 解析后的页面对象，失败、未修改或只下载正文（raw）时为None
+        body (bytes): 响应正文，失败或未修改时为None
+        encoding (str): 解码正文使用的编码
+        status (int): HTTP状态码，没有收到响应时为None
+        headers (dict): 响应头
+        failure: 失败类别，成功时为None；否则为HTTP状态码或"timeout"/"connection"/"error"/"skipped"/"offline"/"circuit_open"/"stopped"
+        retry_after (float): 服务端通过Retry-After要求等待的秒数
+        from_cache (bool): 结果来自响应缓存，没有发送请求
+    """
+    
+    __slots__ = ('url', 'soup', 'body', 'encoding', 'status', 'headers', 'failure', 'retry_after', 'from_cache')
+    
+    def __init__(self, url, soup=None, status=None, headers=None, failure=None, retry_after=None, from_cache=False,
+                 body=None, encoding=None):
+        self.url = url
+        self.soup = soup
+        self.body = body
+        self.encoding = encoding
+        self.status = status
+        self.headers = headers or {}
+        self.failure = failure
+        self.retry_after = retry_after
+        self.from_cache = from_cache
+    
+    @property
+    def not_modified(self):
+        """条件请求命中，页面自上次请求后未变化"""
+        return self.status == 304
+
+
+# 请求未能正常完成的失败类别：超时（包括读取正文超时）和连接失败（包括正文被截断）
+NETWORK_FAILURES = ('timeout', 'connection')
+
+
+def is_server_failure(status, failure=None):
+    """
+    判断一次请求的结果是否说明服务端不可用或过载
+    
+    收到响应头之后读取正文超时或正文被截断时状态码仍为200，需要同时检查失败类别。
+    
+    Args:
+        status (int): HTTP状态码，没有收到响应时为None
+        failure: PageResult.failure
+    
+    Returns:
+        bool: 连接失败、超时、429和5xx返回True
+    """
+    if failure in NETWORK_FAILURES or status is None:
+        return True
+    return status == 429 or status >= 500
@@ -0,0 +1,179 @@
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+# 解析进程中不需要的配置项：输出、缓存和请求控制都由主进程负责
+_MAIN_PROCESS_ONLY = {
+    'use_jsonl': False,
+    'response_cache': {'enabled': False},
+    'conditional_get': {'enabled': False},
+    'adaptive': {'enabled': False},
+    'parse_workers': 0,
+}
+
+# 解析进程中只用于解析文章页的爬虫实例，由进程初始化函数创建
+_worker_crawler = None
+# 解析一篇文章期间记录的日志和时间定位器的学习、命中记录，随结果一起返回主进程
+_worker_messages = []
+_worker_locator_events = []
+
+
+class _MessageCollector(logging.Handler):
+    """把解析进程中的日志收集到_worker_messages"""
+    
+    def emit(self, record):
+        _worker_messages.append(record.getMessage())
+
+
+class _LocatorRecorder:
+    """
+    解析进程中的时间定位器存储
+    
+    按解析进程启动时定位器文件中的记录和本进程学习到的位置提取，学习和命中统计同时记录到
+    _worker_locator_events，由主进程写入主进程的存储；解析进程本身不保存文件。
+    """
+    
+    def __init__(self, store):
+        self._store = store
+    
+    def get(self, key):
+        return self._store.get(key)
+    
+    def learn(self, key, locator):
+        self._store.learn(key, locator)
+        _worker_locator_events.append(('learn', key, locator))
+    
+    def record(self, key, hit):
+        self._store.record(key, hit)
+        _worker_locator_events.append(('record', key, hit))
+    
+    def save(self):
+        pass
+
+
+def _init_worker(config):
+    """
+    解析进程的初始化函数，每个进程只编译一次提取计划
+    
+    Args:
+        config (dict): 去掉主进程专用配置项后的爬虫配置
+    """
+    global _worker_crawler
+    # 在进程中导入，避免与crawler模块循环导入
+    from .crawler import WebCrawler
+    
+    logger = logging.getLogger(f"{__name__}.worker")
+    logger.handlers = [_MessageCollector()]
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    _worker_crawler = WebCrawler(config, logger=logger)
+    if _worker_crawler.time_locator_store:
+        _worker_crawler.time_locator_store = _LocatorRecorder(_worker_crawler.time_locator_store)
+
+
+def _ping():
+    """检查解析进程能否正常启动"""
+    return _worker_crawler is not None
+
+
+def _parse_article(body, encoding, url):
+    """
+    在解析进程中解析文章页
+    
+    Args:
+        body (bytes): 响应正文
+        encoding (str): 解码正文使用的编码
+        url (str): 文章URL
+    
+    Returns:
+        tuple: (文章数据, 解析期间的日志列表, 时间定位器的学习和命中记录)
+    """
+    del _worker_messages[:]
+    del _worker_locator_events[:]
+    soup = _worker_crawler._build_soup(body.decode(encoding or 'utf-8', errors='replace'), 'article')
+    article_data = _worker_crawler.parse_article(soup, url)
+    return article_data, list(_worker_messages), list(_worker_locator_events)
+
+
+class ParsePool:
+    """
+    文章页解析进程池
+    
+    构建页面对象、提取正文和时间都是纯Python计算，在工作线程或事件循环中执行时受GIL限制
+    只能使用一个CPU核心。启用后获取文章页时只下载正文，把正文字节交给解析进程，
+    由解析进程构建页面对象并执行parse_article，返回文章数据字典。
+    
+    每个解析进程启动时按同一份配置创建爬虫实例并编译提取计划，之后只传递正文和结果。
+    解析进程学习到的时间位置和命中统计随结果返回，写入主进程的时间定位器存储。
+    """
+    
+    def __init__(self, config, workers, log=None, locator_store=None):
+        """
+        启动解析进程池，并等待一个解析进程完成初始化
+        
+        Args:
+            config (dict): 爬虫配置
+            workers (int): 解析进程数
+            log (callable, optional): 输出解析进程日志的函数
+            locator_store (TimeLocatorStore, optional): 主进程的时间定位器存储
+        
+        Raises:
+            BrokenProcessPool: 解析进程无法启动或初始化失败
+        """
+        self.workers = workers
+        self._log = log
+        self._locator_store = locator_store
+        worker_config = dict(config, **_MAIN_PROCESS_ONLY)
+        # 使用spawn启动进程：fork会复制正在运行的工作线程持有的锁
+        self._executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_worker,
+            initargs=(worker_config,)
+        )
+        # 进程池在提交任务时才启动进程，先执行一次空任务，初始化失败时立即报错
+        try:
+            self._executor.submit(_ping).result()
+        except Exception:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            raise
+    
+    def submit(self, body, encoding, url):
+        """提交一篇文章页，返回Future，结果为(文章数据, 日志列表, 时间定位器记录)"""
+        return self._executor.submit(_parse_article, body, encoding, url)
+    
+    def _finish(self, result):
+        article_data, messages, locator_events = result
+        if self._log:
+            for message in messages:
+                self._log(message)
+        if self._locator_store:
+            for event, key, value in locator_events:
+                if event == 'learn':
+                    self._locator_store.learn(key, value)
+                else:
+                    self._locator_store.record(key, value)
+        return article_data
+    
+    def parse(self, body, encoding, url):
+        """
+        在解析进程中解析文章页并等待结果
+        
+        Args:
+            body (bytes): 响应正文
+            encoding (str): 解码正文使用的编码
+            url (str): 文章URL
+        
+        Returns:
+            dict: 文章数据，与WebCrawler.parse_article的返回值相同
+        """
+        return self._finish(self.submit(body, encoding, url).result())
+    
+    async def parse_async(self, body, encoding, url):
+        """在解析进程中解析文章页，等待期间不阻塞事件循环"""
+        return self._finish(await asyncio.wrap_future(self.submit(body, encoding, url)))
+    
+    def close(self, wait=True):
+        """关闭进程池，取消尚未开始的解析任务"""
+        self._executor.shutdown(wait=wait, cancel_futures=True)
@@ -1,30 +1,309 @@
-from bs4 import BeautifulSoup
+import logging
 import re
+import threading
+import soupsieve
+from bs4 import Tag
+from .html_tree import LxmlElement, LXML_AVAILABLE, compile_css
+
+if LXML_AVAILABLE:
+    from lxml import etree
+
+logger = logging.getLogger(__name__)
+
+# 选择器前缀：以xpath:开头的按XPath处理，以css:开头的按CSS处理；
+# 没有前缀时，以/、./或(开头的视为XPath，其余视为CSS
+XPATH_PREFIX = 'xpath:'
+CSS_PREFIX = 'css:'
+
+# 只由标签名、class、id和属性条件组成的简单选择器（可用逗号分隔多个），
+# 不含组合符和伪类，是否匹配只取决于元素自身，可以在定向解析建树时判断
+_SIMPLE_COMPOUND = r'(?:[\w-]+|\*)?(?:[.#][\w-]+|\[[^\]]*\])*'
+_SIMPLE_CSS_RE = re.compile(rf'\s*{_SIMPLE_COMPOUND}(?:\s*,\s*{_SIMPLE_COMPOUND})*\s*')
+_TAG_NAME_RE = re.compile(r'[\w-]+')
+_CLASS_RE = re.compile(r'\.([\w-]+)')
+_ATTR_CONDITION_RE = re.compile(r'\[\s*([\w-]+)[^\]]*\]')
+
+
+class CompiledSelector:
+    """
+    编译后的CSS或XPath选择器
+    
+    CSS选择器在BeautifulSoup页面上使用soupsieve编译后的选择器，在lxml.html页面上
+    转换为XPath后由lxml执行；XPath选择器只能用于lxml.html页面。
+    
+    Attributes:
+        expression (str): 原始选择器
+        is_xpath (bool): 是否为XPath选择器
+        css (str): 去掉前缀的CSS选择器，XPath选择器为None
+    """
+    
+    __slots__ = ('expression', 'is_xpath', 'css', '_soupsieve', '_xpath')
+    
+    def __init__(self, expression):
+        """
+        编译选择器，语法错误时立即抛出异常
+        
+        Args:
+            expression (str): CSS或XPath选择器
+        """
+        self.expression = expression
+        text = expression.strip()
+        if text.startswith(XPATH_PREFIX):
+            text, self.is_xpath = text[len(XPATH_PREFIX):].strip(), True
+        elif text.startswith(CSS_PREFIX):
+            text, self.is_xpath = text[len(CSS_PREFIX):].strip(), False
+        else:
+            self.is_xpath = text.startswith(('/', './', '('))
+        
+        self._soupsieve = None
+        self._xpath = None
+        if self.is_xpath:
+            if not LXML_AVAILABLE:
+                raise ValueError(f"XPath选择器需要lxml: {expression}")
+            self.css = None
+            self._xpath = etree.XPath(text)
+        else:
+            self.css = text
+            self._soupsieve = soupsieve.compile(text)
+    
+    def select(self, document):
+        """
+        查找所有匹配的元素
+        
+        Args:
+            document: 页面对象或元素（BeautifulSoup或lxml.html）
+        
+        Returns:
+            list: 匹配的元素；XPath返回文本或属性值时为字符串
+        """
+        if isinstance(document, LxmlElement):
+            if self.is_xpath:
+                result = self._xpath(document.element)
+            else:
+                result = compile_css(self.css, document._include_self)(document.element)
+            if not isinstance(result, list):
+                result = [result]
+            return [LxmlElement(item) if isinstance(item, etree._Element) else str(item) for item in result]
+        
+        if self.is_xpath:
+            raise ValueError(f"XPath选择器需要使用lxml.html解析器: {self.expression}")
+        return self._soupsieve.select(document)
+    
+    def select_one(self, document):
+        """查找第一个匹配的元素，没有时返回None"""
+        if self.is_xpath or isinstance(document, LxmlElement):
+            result = self.select(document)
+            return result[0] if result else None
+        return self._soupsieve.select_one(document)
+    
+    def match(self, element):
+        """判断BeautifulSoup元素是否匹配该CSS选择器"""
+        return self._soupsieve.match(element)
+    
+    def strainer_rule(self):
+        """
+        生成TargetStrainer使用的元素规则，保留该选择器匹配的元素
+        
+        Returns:
+            callable: 接收标签名和属性字典、返回是否匹配的函数；XPath或含组合符、伪类的选择器
+                无法只按元素自身判断，返回None
+        """
+        if self.is_xpath or not self.css.strip() or not _SIMPLE_CSS_RE.fullmatch(self.css):
+            return None
+        compiled = self._soupsieve
+        # 先按各部分的标签名、class和必须存在的属性过滤，只为可能匹配的元素创建Tag
+        parts = []
+        for part in self.css.split(','):
+            part = part.strip()
+            name = _TAG_NAME_RE.match(part)
+            required = set(_ATTR_CONDITION_RE.findall(part))
+            outside = _ATTR_CONDITION_RE.sub('', part)
+            if '#' in outside:
+                required.add('id')
+            parts.append((name.group(0).lower() if name else None, frozenset(_CLASS_RE.findall(outside)), required))
+        
+        def possible(name, attrs):
+            for tag_name, classes, required in parts:
+                if tag_name is not None and tag_name != name:
+                    continue
+                if any(attr not in attrs for attr in required):
+                    continue
+                if classes:
+                    value = attrs.get('class') or ''
+                    if not classes.issubset(value.split() if isinstance(value, str) else value):
+                        continue
+                return True
+            return False
+        
+        def rule(name, attrs):
+            return possible(name, attrs) and compiled.match(Tag(name=name, attrs=dict(attrs)))
+        return rule
+
+
+_compiled = {}
+_registry_lock = threading.Lock()
+
+
+def compile_selector(expression):
+    """
+    编译选择器，结果按选择器缓存，同一选择器只解析一次
+    
+    Args:
+        expression (str): CSS或XPath选择器
+    
+    Returns:
+        CompiledSelector: 编译后的选择器
+    """
+    selector = _compiled.get(expression)
+    if selector is None:
+        selector = CompiledSelector(expression)
+        with _registry_lock:
+            _compiled[expression] = selector
+    return selector
+
+
+def _value_of(item, attribute=None):
+    """读取元素的文本或属性值，XPath直接返回的字符串原样返回"""
+    if isinstance(item, str):
+        return item
+    if attribute:
+        return item.get(attribute, '')
+    return item.get_text(strip=True)
+
+
+class Field:
+    """
+    要提取的一个字段
+    
+    Attributes:
+        name (str): 字段名
+        selector (CompiledSelector): 选择器
+        attribute (str): 要提取的属性名，为None时提取文本
+        many (bool): 为True时提取所有匹配元素的值组成的列表，否则只提取第一个
+    """
+    
+    __slots__ = ('name', 'selector', 'attribute', 'many')
+    
+    def __init__(self, name, spec):
+        """
+        Args:
+            name (str): 字段名
+            spec (str或dict): 选择器，或{'selector': 选择器, 'attr': 属性名, 'many': 是否提取全部}
+        
+        Raises:
+            ValueError: 选择器无效
+        """
+        if isinstance(spec, str):
+            spec = {'selector': spec}
+        attribute = spec.get('attr')
+        self.name = name
+        try:
+            self.selector = compile_selector(spec['selector'])
+        except Exception as e:
+            raise ValueError(f"字段 {name} 的选择器无效: {str(e)}") from e
+        self.attribute = None if attribute in (None, '', 'text') else attribute
+        self.many = bool(spec.get('many', False))
+    
+    def empty(self):
+        return [] if self.many else ''
+
+
+class FieldExtractor:
+    """
+    一次遍历提取多个字段
+    
+    在BeautifulSoup页面上，所有字段都是CSS选择器时合并为一个选择器列表，
+    只遍历页面一次，再按各字段的选择器把匹配到的元素分配给字段；
+    在lxml.html页面上每个字段由lxml执行编译后的XPath。
+    """
+    
+    __slots__ = ('fields', '_combined')
+    
+    def __init__(self, fields):
+        """
+        Args:
+            fields (dict): 字段名到选择器（或字段配置）的映射，见Field
+        """
+        self.fields = tuple(Field(name, spec) for name, spec in fields.items())
+        self._combined = None
+        if self.fields and not any(field.selector.is_xpath for field in self.fields):
+            self._combined = soupsieve.compile(', '.join(field.selector.css for field in self.fields))
+    
+    def extract(self, document):
+        """
+        提取所有字段
+        
+        Args:
+            document: 页面对象（BeautifulSoup或lxml.html）
+        
+        Returns:
+            dict: 字段名到值的映射，没有匹配的字段为空字符串或空列表
+        """
+        result = {field.name: field.empty() for field in self.fields}
+        
+        if self._combined is not None and not isinstance(document, LxmlElement):
+            pending = list(self.fields)
+            for element in self._combined.iselect(document):
+                done = []
+                for field in pending:
+                    if field.selector.match(element):
+                        value = _value_of(element, field.attribute)
+                        if field.many:
+                            result[field.name].append(value)
+                        else:
+                            result[field.name] = value
+                            done.append(field)
+                # 单值字段取到第一个匹配元素后不再参与匹配
+                if done:
+                    pending = [field for field in pending if field not in done]
+                    if not pending:
+                        break
+            return result
+        
+        for field in self.fields:
+            if field.many:
+                result[field.name] = [_value_of(item, field.attribute) for item in field.selector.select(document)]
+            else:
+                item = field.selector.select_one(document)
+                if item is not None:
+                    result[field.name] = _value_of(item, field.attribute)
+        return result
+
 
 class PageParser:
+    @staticmethod
+    def compile(selector):
+        """
+        编译选择器，结果会被缓存
+        
+        Args:
+            selector (str): CSS选择器，或以xpath:、/、./开头的XPath
+        
+        Returns:
+            CompiledSelector: 编译后的选择器
+        """
+        return compile_selector(selector)
+    
     @staticmethod
     def extract_text(soup, selector, attribute=None):
         """
         从页面中提取文本或属性值
         
         Args:
-            soup (BeautifulSoup): 页面对象
-            selector (str): CSS选择器
+            soup: 页面对象（BeautifulSoup或lxml.html）
+            selector (str): CSS选择器或XPath
             attribute (str, optional): 要提取的属性名，如果为None则提取文本
-            
+        
         Returns:
             str: 提取的内容
         """
         try:
-            element = soup.select_one(selector)
-            if element:
-                if attribute:
-                    return element.get(attribute, '')
-                else:
-                    return element.get_text(strip=True)
+            element = compile_selector(selector).select_one(soup)
+            if element is not None:
+                return _value_of(element, attribute)
             return ''
         except Exception as e:
-            print(f"提取内容失败: {str(e)}")
+            logger.warning(f"提取内容失败: {selector}, 错误: {str(e)}")
             return ''
     
     @staticmethod
@@ -33,26 +312,39 @@ class PageParser:
         从页面中提取多个元素的文本或属性值
         
         Args:
-            soup (BeautifulSoup): 页面对象
-            selector (str): CSS选择器
+            soup: 页面对象（BeautifulSoup或lxml.html）
+            selector (str): CSS选择器或XPath
             attribute (str, optional): 要提取的属性名，如果为None则提取文本
-            
+        
         Returns:
             list: 提取的内容列表
         """
         try:
-            elements = soup.select(selector)
-            result = []
-            for element in elements:
-                if attribute:
-                    result.append(element.get(attribute, ''))
-                else:
-                    result.append(element.get_text(strip=True))
-            return result
+            return [_value_of(element, attribute) for element in compile_selector(selector).select(soup)]
         except Exception as e:
-            print(f"提取列表失败: {str(e)}")
+            logger.warning(f"提取列表失败: {selector}, 错误: {str(e)}")
             return []
     
+    @staticmethod
+    def extract_fields(soup, fields):
+        """
+        一次遍历从页面中提取多个字段
+        
+        Args:
+            soup: 页面对象（BeautifulSoup或lxml.html）
+            fields (dict或FieldExtractor): 字段名到选择器（或{'selector', 'attr', 'many'}）的映射，
+                需要反复使用时可先创建FieldExtractor
+        
+        Returns:
+            dict: 字段名到提取内容的映射，失败返回空字典
+        """
+        try:
+            extractor = fields if isinstance(fields, FieldExtractor) else FieldExtractor(fields)
+            return extractor.extract(soup)
+        except Exception as e:
+            logger.warning(f"提取字段失败: {str(e)}")
+            return {}
+    
     @staticmethod
     def extract_by_regex(text, pattern):
         """
@@ -69,7 +361,7 @@ class PageParser:
             matches = re.findall(pattern, text)
             return matches
         except Exception as e:
-            print(f"正则提取失败: {str(e)}")
+            logger.warning(f"正则提取失败: {str(e)}")
             return []
     
     @staticmethod
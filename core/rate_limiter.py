@@ -0,0 +1,115 @@
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    令牌桶限速器
+    
+    以固定速率补充令牌，最多积累burst个令牌。请求通过预约令牌获得需要等待的时间，
+    令牌数允许为负，表示已被后续请求预约，从而保证多个线程或协程共享同一个桶时
+    总请求速率不会超过设定值。等待由调用方完成，以便在等待期间响应停止请求并归还令牌。
+    """
+    
+    def __init__(self, rate, burst=1):
+        """
+        初始化令牌桶
+        
+        Args:
+            rate (float): 每秒补充的令牌数，即允许的平均请求速率
+            burst (int): 令牌桶容量，即允许的突发请求数
+        """
+        self._lock = threading.Lock()
+        self.rate = float(rate)
+        self.burst = max(1.0, float(burst))
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+    
+    def _refill(self, now):
+        """按经过的时间补充令牌"""
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+    
+    def configure(self, rate, burst=None):
+        """
+        调整速率和容量，已积累的令牌保留
+        
+        Args:
+            rate (float): 新的每秒请求速率
+            burst (int, optional): 新的突发容量，为None时保持不变
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = float(rate)
+            if burst is not None:
+                self.burst = max(1.0, float(burst))
+            self.tokens = min(self.tokens, self.burst)
+    
+    def reserve(self, tokens=1):
+        """
+        预约令牌
+        
+        Args:
+            tokens (int): 需要的令牌数
+        
+        Returns:
+            float: 获得令牌前需要等待的秒数，0表示可以立即发送请求
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            self.tokens -= tokens
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+    
+    def pause(self, seconds):
+        """
+        暂停发放令牌，用于服务端通过Retry-After要求等待的情况
+        
+        Args:
+            seconds (float): 暂停的秒数
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            self.tokens = min(self.tokens, -seconds * self.rate)
+    
+    def release(self, tokens=1):
+        """
+        归还预约但未使用的令牌，用于等待令牌期间取消请求的情况
+        
+        Args:
+            tokens (int): 归还的令牌数
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            self.tokens = min(self.burst, self.tokens + tokens)
+
+
+# 进程内按主机共享的限速器，所有工作线程和爬虫标签页访问同一主机时使用同一个令牌桶
+_host_limiters = {}
+_registry_lock = threading.Lock()
+
+
+def get_host_limiter(host, rate, burst=1):
+    """
+    获取指定主机的共享限速器
+    
+    同一主机只会创建一个令牌桶，之后的调用会用新的速率和容量更新它，
+    因此最后启动的爬虫配置决定该主机的限速。
+    
+    Args:
+        host (str): 主机名（可带端口）
+        rate (float): 每秒请求速率
+        burst (int): 突发容量
+    
+    Returns:
+        TokenBucket: 该主机的令牌桶
+    """
+    with _registry_lock:
+        limiter = _host_limiters.get(host)
+        if limiter is None:
+            limiter = TokenBucket(rate, burst)
+            _host_limiters[host] = limiter
+        else:
+            limiter.configure(rate, burst)
+        return limiter
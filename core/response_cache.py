@@ -0,0 +1,266 @@
+import hashlib
+import json
+import os
+import threading
+import time
+import zlib
+from collections import OrderedDict
+
+
+class CachedResponse:
+    """
+    缓存中的一条响应
+    
+    Attributes:
+        url (str): 请求URL
+        body (bytes): 响应正文（已解压）
+        encoding (str): 解码正文使用的编码
+        status (int): HTTP状态码
+        headers (dict): 响应头
+        stored_at (float): 写入缓存的时间戳
+    """
+    
+    __slots__ = ('url', 'body', 'encoding', 'status', 'headers', 'stored_at')
+    
+    def __init__(self, url, body, encoding, status, headers, stored_at):
+        self.url = url
+        self.body = body
+        self.encoding = encoding
+        self.status = status
+        self.headers = headers
+        self.stored_at = stored_at
+    
+    @property
+    def text(self):
+        """按缓存的编码解码后的正文"""
+        return self.body.decode(self.encoding or 'utf-8', errors='replace')
+
+
+class ResponseCache:
+    """
+    磁盘HTTP响应缓存
+    
+    正文按内容的SHA-256寻址，压缩后保存在objects目录下，内容相同的页面只保存一份；
+    索引记录URL到正文的映射以及状态码、响应头和编码。超过ttl秒的记录视为过期，
+    总大小（压缩后）超过max_size时按最近最少使用的顺序淘汰。
+    离线模式下只从缓存读取，不检查过期时间。
+    """
+    
+    INDEX_FILE = 'index.json'
+    OBJECTS_DIR = 'objects'
+    
+    def __init__(self, directory, ttl=3600, max_size=200 * 1024 * 1024):
+        """
+        初始化响应缓存，从磁盘加载索引
+        
+        Args:
+            directory (str): 缓存目录
+            ttl (float): 记录的有效秒数，0表示永不过期
+            max_size (int): 缓存总大小上限（字节），0表示不限制
+        """
+        self.directory = directory
+        self.ttl = ttl
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        # URL -> 记录，按最近访问顺序排列，最久未访问的在最前面
+        self._entries = OrderedDict()
+        # 正文摘要 -> [压缩后大小, 引用数]
+        self._objects = {}
+        self._total_size = 0
+        self._dirty = False
+        self.hits = 0
+        self.misses = 0
+        
+        self._load()
+    
+    def _index_path(self):
+        return os.path.join(self.directory, self.INDEX_FILE)
+    
+    def _object_path(self, digest):
+        return os.path.join(self.directory, self.OBJECTS_DIR, digest[:2], digest)
+    
+    def _load(self):
+        """加载索引，丢弃正文文件缺失的记录，并清理没有被索引引用的正文文件"""
+        index_path = self._index_path()
+        entries = []
+        if os.path.exists(index_path):
+            try:
+                with open(index_path, 'r', encoding='utf-8') as f:
+                    entries = json.load(f)
+            except Exception as e:
+                print(f"加载响应缓存索引失败: {e}")
+                entries = []
+        
+        for entry in entries:
+            digest = entry['digest']
+            if digest not in self._objects:
+                try:
+                    size = os.path.getsize(self._object_path(digest))
+                except OSError:
+                    continue
+                self._objects[digest] = [size, 0]
+                self._total_size += size
+            self._objects[digest][1] += 1
+            self._entries[entry['url']] = entry
+        
+        objects_dir = os.path.join(self.directory, self.OBJECTS_DIR)
+        if os.path.isdir(objects_dir):
+            for prefix in os.scandir(objects_dir):
+                if not prefix.is_dir():
+                    continue
+                for item in os.scandir(prefix.path):
+                    if item.name not in self._objects:
+                        self._remove_file(item.path)
+    
+    def get(self, url, allow_stale=False):
+        """
+        读取缓存的响应
+        
+        Args:
+            url (str): 请求URL
+            allow_stale (bool): 为True时忽略过期时间（离线模式）
+        
+        Returns:
+            CachedResponse: 缓存的响应，未命中或已过期时返回None
+        """
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is None or (not allow_stale and self._is_expired(entry)):
+                self.misses += 1
+                return None
+            self._entries.move_to_end(url)
+            self._dirty = True
+        
+        try:
+            with open(self._object_path(entry['digest']), 'rb') as f:
+                body = zlib.decompress(f.read())
+        except Exception:
+            with self._lock:
+                self.misses += 1
+                if self._entries.get(url) is entry:
+                    self._drop_entry(url)
+            return None
+        
+        with self._lock:
+            self.hits += 1
+        return CachedResponse(url, body, entry['encoding'], entry['status'], entry['headers'], entry['stored_at'])
+    
+    def put(self, url, body, encoding, status, headers):
+        """
+        写入响应，响应头包含Cache-Control: no-store时不缓存
+        
+        Args:
+            url (str): 请求URL
+            body (bytes): 响应正文
+            encoding (str): 解码正文使用的编码
+            status (int): HTTP状态码
+            headers (dict): 响应头
+        """
+        headers = dict(headers or {})
+        cache_control = next((v for k, v in headers.items() if k.lower() == 'cache-control'), '')
+        if 'no-store' in cache_control.lower():
+            return
+        
+        digest = hashlib.sha256(body).hexdigest()
+        data = zlib.compress(body)
+        with self._lock:
+            # 先增加新正文的引用再删除旧记录，URL内容未变时不会误删正文文件
+            if digest not in self._objects:
+                self._write_object(digest, data)
+                self._objects[digest] = [len(data), 0]
+                self._total_size += len(data)
+            self._objects[digest][1] += 1
+            if url in self._entries:
+                self._drop_entry(url)
+            self._entries[url] = {
+                'url': url,
+                'digest': digest,
+                'encoding': encoding,
+                'status': status,
+                'headers': headers,
+                'stored_at': time.time()
+            }
+            self._dirty = True
+            self._evict()
+    
+    def _is_expired(self, entry):
+        return self.ttl > 0 and time.time() - entry['stored_at'] > self.ttl
+    
+    def _write_object(self, digest, data):
+        """写入压缩后的正文，先写临时文件再替换"""
+        path = self._object_path(digest)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, path)
+    
+    def _remove_file(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+    
+    def _drop_entry(self, url):
+        """删除一条记录，正文不再被引用时一并删除（需持有锁）"""
+        entry = self._entries.pop(url)
+        obj = self._objects[entry['digest']]
+        obj[1] -= 1
+        if obj[1] <= 0:
+            del self._objects[entry['digest']]
+            self._total_size -= obj[0]
+            self._remove_file(self._object_path(entry['digest']))
+        self._dirty = True
+    
+    def _evict(self):
+        """按最近最少使用的顺序淘汰记录，直到总大小不超过上限（需持有锁）"""
+        if self.max_size <= 0:
+            return
+        while self._total_size > self.max_size and len(self._entries) > 1:
+            oldest = next(iter(self._entries))
+            self._drop_entry(oldest)
+    
+    def save(self):
+        """将索引写入文件，先写临时文件再替换，避免中途失败损坏已有索引"""
+        with self._lock:
+            if not self._dirty:
+                return
+            data = json.dumps(list(self._entries.values()), ensure_ascii=False)
+            self._dirty = False
+        
+        os.makedirs(self.directory, exist_ok=True)
+        index_path = self._index_path()
+        temp_path = f"{index_path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(data)
+        os.replace(temp_path, index_path)
+
+
+# 进程内按目录共享的响应缓存，多个爬虫标签页使用同一目录时共用索引
+_caches = {}
+_registry_lock = threading.Lock()
+
+
+def get_response_cache(directory, ttl=3600, max_size=200 * 1024 * 1024):
+    """
+    获取指定目录的共享响应缓存，ttl和max_size以最后一次调用为准
+    
+    Args:
+        directory (str): 缓存目录
+        ttl (float): 记录的有效秒数，0表示永不过期
+        max_size (int): 缓存总大小上限（字节），0表示不限制
+    
+    Returns:
+        ResponseCache: 响应缓存
+    """
+    key = os.path.abspath(directory)
+    with _registry_lock:
+        cache = _caches.get(key)
+        if cache is None:
+            cache = ResponseCache(directory, ttl, max_size)
+            _caches[key] = cache
+        else:
+            with cache._lock:
+                cache.ttl = ttl
+                cache.max_size = max_size
+        return cache
@@ -0,0 +1,100 @@
+import random
+
+# 默认可重试的失败类别：限流、服务端错误、超时和连接失败
+DEFAULT_STATUS_CLASSES = {
+    '429': {},
+    '5xx': {},
+    'timeout': {},
+    'connection': {},
+}
+
+
+class RetryLater(Exception):
+    """
+    需要延后重试的请求
+    
+    在不阻塞当前工作线程的模式下由get_page抛出，调用方应在delay秒后
+    以attempt作为尝试次数重新调度该请求。
+    """
+    
+    def __init__(self, url, delay, attempt, parked=False):
+        """
+        Args:
+            url (str): 请求URL
+            delay (float): 距离下次重试的秒数
+            attempt (int): 下次重试的尝试次数
+            parked (bool): 请求因主机熔断被暂缓，并未实际发送
+        """
+        super().__init__(f"{delay:.1f} 秒后第 {attempt} 次尝试: {url}")
+        self.url = url
+        self.delay = delay
+        self.attempt = attempt
+        self.parked = parked
+
+
+class RetryPolicy:
+    """
+    指数退避重试策略
+    
+    失败按类别区分：具体状态码（如"503"）、状态码段（如"5xx"）、"timeout"和"connection"。
+    只有在status_classes中列出的类别才会重试，每个类别可以单独覆盖
+    max_attempts、backoff_base、backoff_max。等待时间为
+    [0, min(backoff_max, backoff_base * 2^(attempt-1))]区间内的随机值（全抖动），
+    服务端返回Retry-After时优先使用其要求的等待时间。
+    """
+    
+    def __init__(self, config=None):
+        """
+        初始化重试策略
+        
+        Args:
+            config (dict, optional): retry配置
+        """
+        config = config or {}
+        self.max_attempts = max(1, int(config.get('max_attempts', 3)))
+        self.backoff_base = float(config.get('backoff_base', 1.0))
+        self.backoff_max = float(config.get('backoff_max', 60.0))
+        self.jitter = config.get('jitter', True)
+        self.respect_retry_after = config.get('respect_retry_after', True)
+        self.status_classes = config.get('status_classes', DEFAULT_STATUS_CLASSES)
+    
+    def _class_config(self, failure):
+        """查找失败类别对应的配置，不可重试时返回None"""
+        key = str(failure)
+        if key in self.status_classes:
+            return self.status_classes[key]
+        if isinstance(failure, int):
+            key = f"{failure // 100}xx"
+            if key in self.status_classes:
+                return self.status_classes[key]
+        return None
+    
+    def get_delay(self, failure, attempt, retry_after=None):
+        """
+        计算下次重试前的等待时间
+        
+        Args:
+            failure: 失败类别，HTTP状态码(int)或"timeout"/"connection"等字符串
+            attempt (int): 已完成的尝试次数，从1开始
+            retry_after (float, optional): 服务端Retry-After要求的等待秒数
+        
+        Returns:
+            float: 等待的秒数，不应重试时返回None
+        """
+        class_config = self._class_config(failure)
+        if class_config is None:
+            return None
+        
+        max_attempts = int(class_config.get('max_attempts', self.max_attempts))
+        if attempt >= max_attempts:
+            return None
+        
+        if retry_after is not None and self.respect_retry_after:
+            return retry_after
+        
+        base = float(class_config.get('backoff_base', self.backoff_base))
+        cap = float(class_config.get('backoff_max', self.backoff_max))
+        delay = min(cap, base * (2 ** (attempt - 1)))
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        return delay
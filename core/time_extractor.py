@@ -0,0 +1,487 @@
+import json
+import re
+from datetime import datetime
+from functools import lru_cache
+from bs4 import Tag
+from .html_tree import LxmlElement, LXML_AVAILABLE
+from .parser import compile_selector
+
+if LXML_AVAILABLE:
+    from lxml import etree
+
+# 常见的时间格式，按优先级排列：同一段文本中先尝试排在前面的格式
+TIME_PATTERNS = (
+    # YYYY-MM-DD HH:MM:SS
+    ('ymd_hms', r'\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2}'),
+    # YYYY-MM-DD HH:MM
+    ('ymd_hm', r'\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}'),
+    # YYYY-MM-DD
+    ('ymd', r'\d{4}-\d{2}-\d{2}'),
+    # YYYY/MM/DD HH:MM:SS
+    ('slash_ymd_hms', r'\d{4}/\d{2}/\d{2}\s+\d{2}:\d{2}:\d{2}'),
+    # YYYY/MM/DD HH:MM
+    ('slash_ymd_hm', r'\d{4}/\d{2}/\d{2}\s+\d{2}:\d{2}'),
+    # YYYY/MM/DD
+    ('slash_ymd', r'\d{4}/\d{2}/\d{2}'),
+    # YYYY年MM月DD日 HH:MM:SS
+    ('cn_ymd_hms', r'\d{4}年\d{1,2}月\d{1,2}日\s+\d{2}:\d{2}:\d{2}'),
+    # YYYY年MM月DD日 HH:MM
+    ('cn_ymd_hm', r'\d{4}年\d{1,2}月\d{1,2}日\s+\d{2}:\d{2}'),
+    # YYYY年MM月DD日
+    ('cn_ymd', r'\d{4}年\d{1,2}月\d{1,2}日'),
+    # MM-DD HH:MM
+    ('md_hm', r'\d{2}-\d{2}\s+\d{2}:\d{2}'),
+    # MM/DD HH:MM
+    ('slash_md_hm', r'\d{2}/\d{2}\s+\d{2}:\d{2}'),
+    # MM月DD日
+    ('cn_md', r'\d{1,2}月\d{1,2}日'),
+    # MM月DD日 HH:MM
+    ('cn_md_hm', r'\d{1,2}月\d{1,2}日\s+\d{2}:\d{2}'),
+    # ISO 8601 格式
+    ('iso', r'\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}'),
+    # 带毫秒的格式
+    ('ymd_hms_ms', r'\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2}\.\d{3}'),
+)
+
+# 常见的时间元素选择器，按优先级排列：先尝试匹配排在前面的选择器的元素
+TIME_SELECTORS = (
+    'time', '.time', '.date', '.publish-time',
+    '.publish_date', '.article-time', '.post-date',
+    '[datetime]', '.entry-date', '.published',
+    '.news-time', '.article-date', '.post-time',
+    '.release-time', '.update-time', '.create-time',
+    '.meta-time', '.timestamp', 'span[class*="time"]',
+    'span[class*="date"]', 'div[class*="time"]',
+    'div[class*="date"]', 'p[class*="time"]',
+    'p[class*="date"]'
+)
+
+# 一次扫描找出每种格式在文本中的第一个匹配：开头的前瞻只在至少一种格式能匹配的位置停下，
+# 后面每种格式各占一个可为空的前瞻，匹配到时写入同名分组
+_TIME_SCANNER = re.compile(
+    '(?=' + '|'.join(pattern for _, pattern in TIME_PATTERNS) + ')'
+    + ''.join(f'(?=(?P<{name}>{pattern})|)' for name, pattern in TIME_PATTERNS)
+)
+
+# 页面头部中记录发布时间的<meta>，按优先级排列，与name、property或itemprop属性比较时不区分大小写
+STRUCTURED_TIME_META = (
+    'article:published_time', 'og:article:published_time', 'datepublished',
+    'pubdate', 'publishdate', 'publish_date', 'publish-date', 'publishtime',
+    'dc.date.issued', 'dcterms.issued', 'dc.date', 'sailthru.date',
+    'parsely-pub-date', 'date'
+)
+
+# 记录发布时间的JSON-LD属性
+JSON_LD_TIME_KEY = 'datePublished'
+
+JSON_LD_TYPE = 'application/ld+json'
+
+# ISO 8601时间，允许省略秒、带小数秒和时区；时区被忽略，按页面上写的当地时间处理
+_ISO_TIME_RE = re.compile(
+    r'^\s*(\d{4}-\d{1,2}-\d{1,2})[Tt\s]+(\d{1,2}:\d{1,2}(?::\d{1,2})?)(?:[.,]\d+)?\s*(?:[Zz]|[+-]\d{2}(?::?\d{2})?)?\s*$'
+)
+
+# 解析结果缓存的时间文本数量
+TIME_CACHE_SIZE = 4096
+
+# 标准化时间文本时依次尝试的格式，以及每种格式是否只有日期、需要用当前时刻补全
+TIME_FORMATS = (
+    ('%Y-%m-%d %H:%M:%S', False),
+    ('%Y-%m-%d %H:%M', False),
+    ('%Y-%m-%d', True),
+    ('%Y/%m/%d %H:%M:%S', False),
+    ('%Y/%m/%d %H:%M', False),
+    ('%Y/%m/%d', True),
+    ('%Y年%m月%d日 %H:%M:%S', False),
+    ('%Y年%m月%d日 %H:%M', False),
+    ('%Y年%m月%d日', True),
+    ('%m-%d %H:%M', False),
+    ('%m/%d %H:%M', False),
+    ('%m月%d日', True),
+    ('%m月%d日 %H:%M', False),
+    ('%Y-%m-%dT%H:%M:%S', False),  # ISO 8601
+    ('%Y-%m-%d %H:%M:%S.%f', False)  # 带毫秒
+)
+
+# 时间文本的“指纹”：按分隔符和数字位数判断文本可能符合哪种格式，分组名为格式在TIME_FORMATS中的位置。
+# 每个指纹都覆盖对应格式strptime能接受的全部文本（格式中的空格匹配任意空白，%d允许前导空格），
+# 且各格式的分隔符互不相同，一段文本最多只能被一种格式完整解析，所以按指纹只需尝试一种格式
+_FINGERPRINT_PATTERNS = (
+    r'\d{4}-\d{1,2}-\s*\d{1,2}\s+\d{1,2}:\d{1,2}:\d{1,2}',
+    r'\d{4}-\d{1,2}-\s*\d{1,2}\s+\d{1,2}:\d{1,2}',
+    r'\d{4}-\d{1,2}-\s*\d{1,2}',
+    r'\d{4}/\d{1,2}/\s*\d{1,2}\s+\d{1,2}:\d{1,2}:\d{1,2}',
+    r'\d{4}/\d{1,2}/\s*\d{1,2}\s+\d{1,2}:\d{1,2}',
+    r'\d{4}/\d{1,2}/\s*\d{1,2}',
+    r'\d{4}年\d{1,2}月\s*\d{1,2}日\s+\d{1,2}:\d{1,2}:\d{1,2}',
+    r'\d{4}年\d{1,2}月\s*\d{1,2}日\s+\d{1,2}:\d{1,2}',
+    r'\d{4}年\d{1,2}月\s*\d{1,2}日',
+    r'\d{1,2}-\s*\d{1,2}\s+\d{1,2}:\d{1,2}',
+    r'\d{1,2}/\s*\d{1,2}\s+\d{1,2}:\d{1,2}',
+    r'\d{1,2}月\s*\d{1,2}日',
+    r'\d{1,2}月\s*\d{1,2}日\s+\d{1,2}:\d{1,2}',
+    r'\d{4}-\d{1,2}-\s*\d{1,2}[Tt]\d{1,2}:\d{1,2}:\d{1,2}',
+    r'\d{4}-\d{1,2}-\s*\d{1,2}\s+\d{1,2}:\d{1,2}:\d{1,2}\.\d{1,6}',
+)
+_FINGERPRINT = re.compile(
+    '|'.join(f'(?P<f{index}>{pattern})' for index, pattern in enumerate(_FINGERPRINT_PATTERNS))
+)
+
+_CN_DATE_RE = re.compile(r'(\d{4})年(\d{1,2})月(\d{1,2})日')
+_CN_CLOCK_RE = re.compile(r'(\d{1,2})[时:](\d{1,2})(?:[分:](\d{1,2}))?')
+
+_SELECTOR_RULE_RE = re.compile(r'^(?:(?P<tag>\w+)|\.(?P<cls>[\w-]+)|\[(?P<attr>\w+)\]|(?P<ctag>\w+)\[class\*="(?P<part>\w+)"\])$')
+
+
+def _selector_rules(selectors):
+    """
+    把TIME_SELECTORS拆分为按标签名、class、属性和class子串匹配的四类规则
+    
+    Returns:
+        tuple: (标签名到位置, class到位置, 属性名到位置, [(位置, 标签名, class子串), ...])，
+            同一个键只保留最靠前的位置
+    """
+    tags, classes, attrs, parts = {}, {}, {}, []
+    for rank, selector in enumerate(selectors):
+        match = _SELECTOR_RULE_RE.match(selector)
+        if match is None:
+            raise ValueError(f"不支持的时间元素选择器: {selector}")
+        if match.group('tag'):
+            tags.setdefault(match.group('tag'), rank)
+        elif match.group('cls'):
+            classes.setdefault(match.group('cls'), rank)
+        elif match.group('attr'):
+            attrs.setdefault(match.group('attr'), rank)
+        else:
+            parts.append((rank, match.group('ctag'), match.group('part')))
+    return tags, classes, attrs, parts
+
+
+_TAG_RANKS, _CLASS_RANKS, _ATTR_RANKS, _PART_RULES = _selector_rules(TIME_SELECTORS)
+
+
+def _class_tokens(element):
+    """元素的class列表和class属性原文"""
+    classes = element.get('class') or ''
+    if isinstance(classes, list):
+        return classes, ' '.join(classes)
+    return classes.split(), classes
+
+
+def _selector_test(selector):
+    """生成判断元素是否匹配TIME_SELECTORS中某个选择器的函数"""
+    match = _SELECTOR_RULE_RE.match(selector)
+    tag, cls, attr, ctag, part = match.group('tag', 'cls', 'attr', 'ctag', 'part')
+    if tag:
+        return lambda element: element.name == tag
+    if cls:
+        return lambda element: cls in _class_tokens(element)[0]
+    if attr:
+        return lambda element: element.has_attr(attr)
+    return lambda element: element.name == ctag and part in _class_tokens(element)[1]
+
+
+_SELECTOR_TESTS = tuple(_selector_test(selector) for selector in TIME_SELECTORS)
+
+# 每种格式单独编译的正则，按已学习的格式提取时间时使用
+TIME_PATTERN_RES = {name: re.compile(pattern) for name, pattern in TIME_PATTERNS}
+
+if LXML_AVAILABLE:
+    # 页面头部的<meta>和JSON-LD脚本
+    _LXML_HEAD_METADATA = etree.XPath(
+        '(descendant-or-self::head)[1]//*[self::meta or self::script]'
+    )
+    
+    # 可能匹配时间元素选择器的元素：标签名、属性或class符合条件，具体匹配哪个选择器由selector_rank判断
+    _LXML_CANDIDATES = etree.XPath(
+        'descendant-or-self::*[' + ' or '.join(
+            [f'self::{tag}' for tag in _TAG_RANKS] + [f'@{attr}' for attr in _ATTR_RANKS] + ['@class']
+        ) + ']'
+    )
+
+
+def selector_rank(element):
+    """
+    元素匹配的第一个时间元素选择器在TIME_SELECTORS中的位置
+    
+    与soupsieve的匹配规则相同：class按空白分隔后逐个比较，class*=按class属性原文查找子串，
+    都区分大小写。
+    
+    Args:
+        element: 页面中的元素（BeautifulSoup或lxml.html）
+    
+    Returns:
+        int: 选择器位置，不匹配任何选择器时返回None
+    """
+    name = element.name
+    rank = _TAG_RANKS.get(name)
+    for attr, attr_rank in _ATTR_RANKS.items():
+        if (rank is None or attr_rank < rank) and element.has_attr(attr):
+            rank = attr_rank
+    classes = element.get('class')
+    if not classes:
+        return rank
+    if isinstance(classes, list):
+        class_text = ' '.join(classes)
+    else:
+        class_text = classes
+        classes = classes.split()
+    for cls in classes:
+        class_rank = _CLASS_RANKS.get(cls)
+        if class_rank is not None and (rank is None or class_rank < rank):
+            rank = class_rank
+    for part_rank, tag, part in _PART_RULES:
+        if rank is not None and part_rank >= rank:
+            break
+        if name == tag and part in class_text:
+            rank = part_rank
+    return rank
+
+
+def ranked_time_elements(document):
+    """
+    查找页面中的时间元素
+    
+    只遍历页面一次，对每个元素判断它匹配的第一个选择器，再按选择器排序，同一选择器的元素
+    保持页面顺序，与依次用每个选择器查找的先后顺序相同。
+    
+    Args:
+        document: 页面对象（BeautifulSoup或lxml.html）
+    
+    Returns:
+        list: 按优先级排列的(选择器在TIME_SELECTORS中的位置, 元素)
+    """
+    if isinstance(document, LxmlElement):
+        elements = [LxmlElement(element) for element in _LXML_CANDIDATES(document.element)]
+        if not document._include_self and elements and elements[0].element is document.element:
+            elements.pop(0)
+    else:
+        elements = document.find_all(True)
+    ranked = []
+    for position, element in enumerate(elements):
+        rank = selector_rank(element)
+        if rank is not None:
+            ranked.append((rank, position, element))
+    ranked.sort(key=lambda item: item[:2])
+    return [(rank, element) for rank, _, element in ranked]
+
+
+def iter_selector_elements(document, selector):
+    """
+    按页面顺序逐个返回匹配TIME_SELECTORS中某个选择器的元素
+    
+    在BeautifulSoup页面上边遍历边判断，调用方找到需要的元素后即可停止遍历；
+    在lxml.html页面上由编译后的XPath查找。
+    
+    Args:
+        document: 页面对象（BeautifulSoup或lxml.html）
+        selector (str): TIME_SELECTORS中的选择器
+    
+    Yields:
+        匹配的元素
+    """
+    if isinstance(document, LxmlElement):
+        yield from compile_selector(selector).select(document)
+        return
+    matches = _SELECTOR_TESTS[TIME_SELECTORS.index(selector)]
+    for element in document.descendants:
+        if isinstance(element, Tag) and matches(element):
+            yield element
+
+
+def _meta_keys(element):
+    """<meta>的name、property和itemprop属性值（小写）"""
+    for attr in ('name', 'property', 'itemprop'):
+        value = element.get(attr)
+        if value:
+            yield value.strip().lower()
+
+
+def _json_ld_times(data):
+    """按出现顺序返回JSON-LD数据（含@graph和嵌套对象）中的datePublished值"""
+    if isinstance(data, list):
+        for item in data:
+            yield from _json_ld_times(item)
+    elif isinstance(data, dict):
+        value = data.get(JSON_LD_TIME_KEY)
+        if isinstance(value, str):
+            yield value
+        for key, item in data.items():
+            if isinstance(item, (list, dict)):
+                yield from _json_ld_times(item)
+
+
+def parse_structured_time(value, parse):
+    """
+    解析结构化元数据中的时间值
+    
+    ISO 8601时间（如2024-05-15T10:30:00+08:00）去掉小数秒和时区后解析，
+    其他写法按TIME_PATTERNS从值中查找。
+    
+    Args:
+        value (str): 元数据中的时间值
+        parse (callable): 解析时间文本的函数，解析失败返回None
+    
+    Returns:
+        str: 解析后的时间，无法解析时返回None
+    """
+    match = _ISO_TIME_RE.match(value)
+    if match:
+        parsed = parse(f"{match.group(1)} {match.group(2)}")
+        if parsed:
+            return parsed
+    return search_time(value, parse)[0]
+
+
+def find_structured_time(document, parse):
+    """
+    从页面头部的结构化元数据中提取发布时间
+    
+    先查找JSON-LD的datePublished，再按STRUCTURED_TIME_META的顺序查找<meta>。
+    只查找<head>中的元素，不遍历正文；定向解析的页面没有<head>，在保留下来的顶层元素中查找。
+    
+    Args:
+        document: 页面对象（BeautifulSoup或lxml.html）
+        parse (callable): 解析时间文本的函数，解析失败返回None
+    
+    Returns:
+        tuple: (解析后的时间, 来源说明)，没有找到时返回(None, None)
+    """
+    if isinstance(document, LxmlElement):
+        elements = [(element.tag, element, element.text) for element in _LXML_HEAD_METADATA(document.element)]
+    else:
+        # 只在文档的前两层中找<head>，不遍历正文
+        html = document.find('html', recursive=False)
+        head = (html or document).find('head', recursive=False)
+        if head is not None:
+            found = head.find_all(['meta', 'script'])
+        else:
+            # 定向解析时保留下来的元素都在文档顶层
+            found = document.find_all(['meta', 'script'], recursive=False)
+        elements = [(element.name, element, element.string) for element in found]
+    
+    metas = {}
+    for name, element, text in elements:
+        if name == 'meta':
+            content = element.get('content')
+            if content:
+                for key in _meta_keys(element):
+                    metas.setdefault(key, content)
+            continue
+        if (element.get('type') or '').strip().lower() != JSON_LD_TYPE or not text:
+            continue
+        try:
+            data = json.loads(text)
+        except ValueError:
+            continue
+        for value in _json_ld_times(data):
+            parsed = parse_structured_time(value, parse)
+            if parsed:
+                return parsed, f"JSON-LD {JSON_LD_TIME_KEY}"
+    
+    for key in STRUCTURED_TIME_META:
+        if key in metas:
+            parsed = parse_structured_time(metas[key], parse)
+            if parsed:
+                return parsed, f"<meta> {key}"
+    return None, None
+
+
+def search_time(text, parse):
+    """
+    按TIME_PATTERNS的优先级从文本中提取时间
+    
+    依次取每种格式在文本中的第一个匹配交给parse解析，返回第一个解析成功的结果。
+    所有格式共用一次扫描，排在最前面的未排除格式一旦匹配并解析成功就提前结束。
+    
+    Args:
+        text (str): 要搜索的文本
+        parse (callable): 解析时间文本的函数，解析失败返回None
+    
+    Returns:
+        tuple: (解析后的时间, 格式名)，没有找到时返回(None, None)
+    """
+    first = [None] * len(TIME_PATTERNS)
+    best = 0
+    for match in _TIME_SCANNER.finditer(text):
+        for index, value in enumerate(match.groups()):
+            if value is not None and first[index] is None:
+                first[index] = value
+        # 优先级最高的未排除格式已经匹配时立即解析，成功则不需要继续扫描
+        while best < len(first) and first[best] is not None:
+            parsed = parse(first[best])
+            if parsed:
+                return parsed, TIME_PATTERNS[best][0]
+            best += 1
+    
+    for index in range(best, len(first)):
+        if first[index] is not None:
+            parsed = parse(first[index])
+            if parsed:
+                return parsed, TIME_PATTERNS[index][0]
+    return None, None
+
+
+@lru_cache(maxsize=TIME_CACHE_SIZE)
+def parse_time_parts(time_text):
+    """
+    解析时间文本，结果按文本缓存
+    
+    按指纹选出唯一可能的格式，只调用一次strptime；指纹不匹配或解析失败时，没有其他格式能
+    解析该文本，直接从文本中查找“YYYY年MM月DD日”和时分秒。缓存的是标准化后的结果和是否
+    需要用当前时刻补全，只有日期时缓存的是日期部分，补全由parse_time_text在每次调用时完成。
+    
+    Args:
+        time_text (str): 时间文本
+    
+    Returns:
+        tuple: (标准化后的时间或日期, 是否需要用当前时刻补全时分秒)，无法解析时返回None
+    """
+    match = _FINGERPRINT.fullmatch(time_text)
+    if match is not None:
+        fmt, date_only = TIME_FORMATS[int(match.lastgroup[1:])]
+        try:
+            parsed_time = datetime.strptime(time_text, fmt)
+            if date_only:
+                return parsed_time.strftime('%Y-%m-%d'), True
+            return parsed_time.strftime('%Y-%m-%d %H:%M:%S'), False
+        except ValueError:
+            pass
+    
+    # 如果标准格式无法解析，尝试使用正则表达式提取年月日
+    date_match = _CN_DATE_RE.search(time_text)
+    if date_match is None:
+        return None
+    year, month, day = (int(value) for value in date_match.groups())
+    # 尝试提取时分秒
+    clock_match = _CN_CLOCK_RE.search(time_text)
+    try:
+        if clock_match is None:
+            return datetime(year, month, day).strftime('%Y-%m-%d'), True
+        hour, minute, second = clock_match.groups()
+        parsed_time = datetime(year, month, day, int(hour), int(minute), int(second) if second else 0)
+        return parsed_time.strftime('%Y-%m-%d %H:%M:%S'), False
+    except ValueError:
+        return None
+
+
+def parse_time_text(time_text):
+    """
+    解析时间文本并标准化为"%Y-%m-%d %H:%M:%S"格式
+    
+    只有日期的时间用当前时刻补全时分秒。
+    
+    Args:
+        time_text (str): 时间文本
+    
+    Returns:
+        str: 标准化后的时间字符串，解析失败返回None
+    """
+    parsed = parse_time_parts(time_text)
+    if parsed is None:
+        return None
+    text, date_only = parsed
+    if date_only:
+        now = datetime.now()
+        return f"{text} {now.hour:02d}:{now.minute:02d}:{now.second:02d}"
+    return text
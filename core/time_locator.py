@@ -0,0 +1,141 @@
+from .json_store import JsonFileStore, get_shared_store
+from .time_extractor import TIME_SELECTORS, TIME_PATTERN_RES, iter_selector_elements
+
+# 时间所在的位置：时间元素的datetime属性、时间元素的文本
+# 从整个页面文本中找到的时间不记录：页面文本几乎总能匹配到某个日期，按它提取会跳过真正的时间元素
+SOURCE_DATETIME = 'datetime'
+SOURCE_TEXT = 'text'
+
+
+def make_locator(selector, source, pattern=None):
+    """
+    生成时间定位器
+    
+    Args:
+        selector (str): TIME_SELECTORS中的选择器
+        source (str): 时间所在的位置，SOURCE_DATETIME或SOURCE_TEXT
+        pattern (str, optional): 提取时间使用的TIME_PATTERNS格式名，source为datetime时为None
+    
+    Returns:
+        dict: 时间定位器
+    """
+    return {'selector': selector, 'source': source, 'pattern': pattern}
+
+
+def is_valid_locator(locator):
+    """检查从文件加载的定位器是否仍能使用（选择器和格式可能已被修改）"""
+    if not isinstance(locator, dict):
+        return False
+    source = locator.get('source')
+    if source == SOURCE_DATETIME:
+        return locator.get('selector') in TIME_SELECTORS
+    if source == SOURCE_TEXT:
+        return locator.get('selector') in TIME_SELECTORS and locator.get('pattern') in TIME_PATTERN_RES
+    return False
+
+
+def apply_locator(document, locator, parse):
+    """
+    按定位器从页面中提取时间
+    
+    只查找定位器记录的选择器匹配的元素，只使用记录的位置和格式，不尝试其他选择器和格式。
+    
+    Args:
+        document: 页面对象（BeautifulSoup或lxml.html）
+        locator (dict): 时间定位器
+        parse (callable): 解析时间文本的函数，解析失败返回None
+    
+    Returns:
+        str: 解析后的时间，没有找到时返回None
+    """
+    source = locator['source']
+    pattern = TIME_PATTERN_RES.get(locator.get('pattern'))
+    for element in iter_selector_elements(document, locator['selector']):
+        if source == SOURCE_DATETIME:
+            if element.has_attr('datetime'):
+                parsed_time = parse(element['datetime'])
+                if parsed_time:
+                    return parsed_time
+            continue
+        match = pattern.search(element.get_text(strip=True))
+        if match:
+            parsed_time = parse(match.group(0))
+            if parsed_time:
+                return parsed_time
+    return None
+
+
+class TimeLocatorStore(JsonFileStore):
+    """
+    按站点保存学习到的文章时间位置
+    
+    同一站点的文章页通常把发布时间放在同一位置。启发式提取成功后记录是哪个选择器、
+    datetime属性还是元素文本、哪种格式给出了时间，之后先按记录的位置提取，
+    找不到时再使用完整的启发式提取并重新学习。
+    """
+    
+    load_error_message = "加载时间定位器失败"
+    indent = 2
+    
+    def _filter_entries(self, entries):
+        """丢弃选择器或格式已失效的定位器"""
+        return {
+            key: entry for key, entry in entries.items()
+            if isinstance(entry, dict) and is_valid_locator(entry.get('locator'))
+        }
+    
+    def get(self, key):
+        """
+        获取站点的时间定位器
+        
+        Args:
+            key (str): 站点（主机名）
+        
+        Returns:
+            dict: 时间定位器，没有记录时返回None
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry['locator'] if entry else None
+    
+    def learn(self, key, locator):
+        """
+        记录启发式提取成功时使用的定位器，与已有记录相同时保留原有计数
+        
+        Args:
+            key (str): 站点（主机名）
+            locator (dict): 时间定位器
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry['locator'] != locator:
+                entry = {'locator': locator, 'hits': 0, 'misses': 0}
+                self._entries[key] = entry
+            self._dirty = True
+    
+    def record(self, key, hit):
+        """
+        记录一次按定位器提取的结果
+        
+        Args:
+            key (str): 站点（主机名）
+            hit (bool): 是否提取成功
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry['hits' if hit else 'misses'] += 1
+                self._dirty = True
+
+
+def get_time_locator_store(path):
+    """
+    获取指定路径的共享时间定位器存储
+    
+    Args:
+        path (str): 存储文件路径
+    
+    Returns:
+        TimeLocatorStore: 时间定位器存储
+    """
+    return get_shared_store(TimeLocatorStore, path)
@@ -0,0 +1,114 @@
+import hashlib
+import json
+from .json_store import JsonFileStore, get_shared_store
+
+
+def list_config_fingerprint(url_list_config, base_url=''):
+    """
+    计算列表页链接提取配置的指纹
+    
+    保存的链接是按当时的提取配置解析出来的，配置改变后指纹不同，旧记录不再复用。
+    
+    Args:
+        url_list_config (dict): url_list_config配置
+        base_url (str): 拼接相对链接使用的基础URL
+    
+    Returns:
+        str: 指纹
+    """
+    data = json.dumps([url_list_config, base_url], ensure_ascii=False, sort_keys=True)
+    return hashlib.sha1(data.encode('utf-8')).hexdigest()
+
+
+class ValidatorStore(JsonFileStore):
+    """
+    列表页条件请求的验证器存储
+    
+    按URL保存上次响应的ETag、Last-Modified、从该页解析出的链接列表和解析时使用的
+    提取配置指纹。再次爬取时发送If-None-Match/If-Modified-Since请求头，
+    服务端返回304时直接复用保存的链接，无需重新下载和解析列表页；
+    指纹与当前提取配置不同的记录视为没有记录。
+    """
+    
+    load_error_message = "加载条件请求验证器失败"
+    
+    def _get_entry(self, url, fingerprint):
+        """获取URL的记录，指纹不同时返回None"""
+        with self._lock:
+            entry = self._entries.get(url)
+        if not entry or entry.get('fingerprint') != fingerprint:
+            return None
+        return entry
+    
+    def conditional_headers(self, url, fingerprint=None):
+        """
+        获取URL对应的条件请求头
+        
+        Args:
+            url (str): 列表页URL
+            fingerprint (str, optional): 当前提取配置的指纹，见list_config_fingerprint
+        
+        Returns:
+            dict: 条件请求头，没有可用记录时返回None
+        """
+        entry = self._get_entry(url, fingerprint)
+        if not entry:
+            return None
+        
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers or None
+    
+    def get_links(self, url, fingerprint=None):
+        """
+        获取上次从该页解析出的链接列表
+        
+        Args:
+            url (str): 列表页URL
+            fingerprint (str, optional): 当前提取配置的指纹
+        
+        Returns:
+            list: 链接列表，没有记录或指纹不同时返回None
+        """
+        entry = self._get_entry(url, fingerprint)
+        return entry.get('links') if entry else None
+    
+    def update(self, url, headers, links, fingerprint=None):
+        """
+        保存列表页的验证器和解析结果，响应中没有验证器时删除旧记录
+        
+        Args:
+            url (str): 列表页URL
+            headers (dict): 响应头
+            links (list): 解析出的链接列表
+            fingerprint (str, optional): 解析时使用的提取配置的指纹
+        """
+        etag = headers.get('ETag')
+        last_modified = headers.get('Last-Modified')
+        with self._lock:
+            if etag or last_modified:
+                self._entries[url] = {
+                    'etag': etag,
+                    'last_modified': last_modified,
+                    'links': links,
+                    'fingerprint': fingerprint
+                }
+            else:
+                self._entries.pop(url, None)
+            self._dirty = True
+
+
+def get_validator_store(path):
+    """
+    获取指定路径的共享验证器存储
+    
+    Args:
+        path (str): 存储文件路径
+    
+    Returns:
+        ValidatorStore: 验证器存储
+    """
+    return get_shared_store(ValidatorStore, path)
@@ -0,0 +1,107 @@
+import heapq
+import itertools
+import queue
+import threading
+import time
+from collections import deque
+
+
+class WorkQueue:
+    """
+    支持延迟投递的线程安全任务队列
+    
+    与queue.Queue类似，但任务可以延迟一段时间后才被领取（用于延后重试）。
+    队列关闭且所有任务（包括延迟中和处理中的任务）都已完成后，get()返回None，
+    工作线程据此退出。处理中的任务在task_done()之前重新投递，不会导致队列提前结束。
+    设置maxsize后，待领取的任务达到上限时生产者的put()会阻塞；工作线程重新投递任务时
+    应使用block=False，避免所有工作线程都阻塞在投递上。
+    """
+    
+    def __init__(self, maxsize=0):
+        """
+        Args:
+            maxsize (int): 待领取任务数上限，0表示不限制
+        """
+        self.maxsize = maxsize
+        lock = threading.Lock()
+        self._condition = threading.Condition(lock)
+        # 等待队列空位的生产者单独等待，避免与领取任务的工作线程互相抢占通知
+        self._not_full = threading.Condition(lock)
+        self._ready = deque()
+        self._delayed = []
+        self._sequence = itertools.count()
+        self._unfinished = 0
+        self._closed = False
+    
+    def put(self, item, delay=0, block=True, timeout=None):
+        """
+        投递任务
+        
+        Args:
+            item: 任务
+            delay (float): 延迟领取的秒数
+            block (bool): 队列已满时是否等待，为False时不受maxsize限制
+            timeout (float, optional): 队列已满时最长等待秒数
+        
+        Raises:
+            queue.Full: 超时队列仍然是满的
+        """
+        with self._condition:
+            if block and self.maxsize > 0:
+                if not self._not_full.wait_for(lambda: len(self._ready) < self.maxsize, timeout):
+                    raise queue.Full
+            self._unfinished += 1
+            if delay > 0:
+                heapq.heappush(self._delayed, (time.monotonic() + delay, next(self._sequence), item))
+            else:
+                self._ready.append(item)
+            self._condition.notify()
+    
+    def close(self):
+        """关闭队列，表示不再有新任务投递"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+    
+    def get(self, timeout=None):
+        """
+        领取一个已到期的任务
+        
+        Args:
+            timeout (float, optional): 最长等待秒数
+        
+        Returns:
+            任务，队列已关闭且所有任务完成时返回None
+        
+        Raises:
+            queue.Empty: 超时仍没有可领取的任务
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while True:
+                now = time.monotonic()
+                while self._delayed and self._delayed[0][0] <= now:
+                    self._ready.append(heapq.heappop(self._delayed)[2])
+                if self._ready:
+                    item = self._ready.popleft()
+                    self._not_full.notify()
+                    return item
+                if self._closed and self._unfinished == 0:
+                    return None
+                
+                wait = None
+                if self._delayed:
+                    wait = self._delayed[0][0] - now
+                if deadline is not None:
+                    remaining = deadline - now
+                    if remaining <= 0:
+                        raise queue.Empty
+                    wait = remaining if wait is None else min(wait, remaining)
+                self._condition.wait(wait)
+    
+    def task_done(self):
+        """标记一个领取的任务已处理完成"""
+        with self._condition:
+            self._unfinished -= 1
+            if self._unfinished <= 0:
+                self._condition.notify_all()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+AIMD自适应并发控制器的单元测试
+
+用法:
+    python -m pytest -q tests
+"""
+
+import os
+import sys
+import unittest
+
+# 添加项目根目录到路径，以便导入core模块
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(current_dir))
+
+from core.adaptive import AdaptiveController
+
+
+class AdaptiveControllerTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.messages = []
+        self.controller = AdaptiveController(
+            {'min_concurrency': 1, 'max_concurrency': 16, 'min_rate': 0.5, 'max_rate': 20,
+             'rate_step': 0.5, 'target_latency_ms': 2000, 'decrease_factor': 0.5},
+            initial_concurrency=4, initial_rate=2, log=self.messages.append
+        )
+    
+    def test_healthy_responses_increase_concurrency_and_rate(self):
+        for _ in range(4):
+            self.controller.record(200, 0.1)
+        self.assertEqual(self.controller.concurrency, 5)
+        self.assertEqual(self.controller.rate, 2.5)
+        self.assertEqual(self.controller.gate.limit, 5)
+    
+    def test_failures_decrease_and_never_count_as_healthy(self):
+        cases = [
+            (None, None),           # 连接失败
+            (None, 'timeout'),      # 连接或读取响应头超时
+            (200, 'timeout'),       # 收到响应头后读取正文超时
+            (200, 'connection'),    # 正文被截断
+            (500, 500),
+            (502, 502),
+            (504, 504),
+            (429, 429),
+        ]
+        for status, failure in cases:
+            with self.subTest(status=status, failure=failure):
+                self.setUp()
+                for _ in range(20):
+                    self.controller.record(status, 0.1, failure)
+                self.assertEqual(self.controller.concurrency, 2)
+                self.assertEqual(self.controller.rate, 1.0)
+                self.assertFalse(any("响应正常" in message for message in self.messages))
+    
+    def test_client_errors_count_as_healthy(self):
+        for _ in range(4):
+            self.controller.record(404, 0.1, 404)
+        self.assertEqual(self.controller.concurrency, 5)
+    
+    def test_high_latency_decreases(self):
+        self.controller.record(200, 5.0)
+        self.assertEqual(self.controller.concurrency, 2)
+        self.assertIn("平均延迟", self.messages[-1])
+
+
+if __name__ == '__main__':
+    unittest.main()
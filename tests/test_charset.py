@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+响应正文编码检测的单元测试
+
+用法:
+    python -m pytest -q tests
+"""
+
+import os
+import sys
+import unittest
+from unittest import mock
+
+# 添加项目根目录到路径，以便导入core模块
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(current_dir))
+
+from core import charset
+from core.charset import detect_encoding
+
+TEXT = '这是一段用于检测编码的中文正文，' * 20
+
+
+def page(encoding, meta=None):
+    head = f'<meta charset="{meta}">' if meta else ''
+    return f'<html><head>{head}</head><body><p>{TEXT}</p></body></html>'.encode(encoding)
+
+
+class DetectEncodingTest(unittest.TestCase):
+    
+    def setUp(self):
+        # 每个测试使用独立的按主机缓存
+        patcher = mock.patch.dict(charset._host_charsets, clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+    
+    def test_content_type_header_comes_first(self):
+        body = page('utf-8', meta='gbk')
+        self.assertEqual(detect_encoding('http://a.test/', 'text/html; charset=UTF-8', body), 'utf-8')
+    
+    def test_meta_when_header_has_no_charset(self):
+        body = page('gb18030', meta='gb2312')
+        self.assertEqual(detect_encoding('http://b.test/', 'text/html', body), 'gb18030')
+    
+    def test_untrusted_header_charset_is_ignored(self):
+        body = page('gb18030', meta='GBK')
+        self.assertEqual(detect_encoding('http://c.test/', 'text/html; charset=ISO-8859-1', body), 'gb18030')
+    
+    def test_host_cache_before_statistical_detection(self):
+        declared = page('gb18030', meta='gbk')
+        self.assertEqual(detect_encoding('http://d.test/list', 'text/html', declared), 'gb18030')
+        with mock.patch.object(charset.chardet, 'detect') as detect:
+            undeclared = page('gb18030')
+            self.assertEqual(detect_encoding('http://d.test/article', 'text/html', undeclared), 'gb18030')
+        detect.assert_not_called()
+    
+    def test_statistical_detection_last(self):
+        body = page('gb18030')
+        encoding = detect_encoding('http://e.test/', 'text/html', body)
+        self.assertIn(encoding, ('gb18030', 'gb2312', 'gbk'))
+        self.assertEqual(body.decode(encoding), page('gb18030').decode('gb18030'))
+        # 检测结果按主机缓存
+        self.assertEqual(charset._host_charsets['e.test'], encoding)
+    
+    def test_ascii_only_body_defaults_to_utf8_without_caching(self):
+        body = b'<html><body><p>plain ascii</p></body></html>'
+        self.assertEqual(detect_encoding('http://f.test/', None, body), 'utf-8')
+        self.assertNotIn('f.test', charset._host_charsets)
+    
+    def test_chinese_aliases_map_to_superset(self):
+        self.assertEqual(charset.normalize_charset('GB2312'), 'gb18030')
+        self.assertEqual(charset.normalize_charset('big5'), 'big5hkscs')
+        self.assertIsNone(charset.normalize_charset('no-such-charset'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+主机熔断器的单元测试
+
+用法:
+    python -m pytest -q tests
+"""
+
+import logging
+import os
+import sys
+import unittest
+from unittest import mock
+
+# 添加项目根目录到路径，以便导入core模块
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(current_dir))
+
+from core.circuit_breaker import CircuitBreaker, CLOSED, OPEN, HALF_OPEN
+from core.crawler import WebCrawler
+
+
+class FakeClock:
+    """可手动推进的time.monotonic"""
+    
+    def __init__(self):
+        self.now = 1000.0
+    
+    def __call__(self):
+        return self.now
+
+
+class CircuitBreakerTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = mock.patch('core.circuit_breaker.time.monotonic', self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.breaker = CircuitBreaker({
+            'window': 4, 'min_requests': 2, 'failure_rate': 0.5, 'open_seconds': 10, 'half_open_probes': 1
+        })
+    
+    def test_closed_open_half_open_closed_cycle(self):
+        breaker = self.breaker
+        self.assertEqual(breaker.allow(), (True, 0.0))
+        self.assertIsNone(breaker.record(False))
+        self.assertEqual(breaker.record(False), OPEN)
+        self.assertEqual(breaker.state, OPEN)
+        
+        # 熔断期间拒绝请求
+        self.clock.now += 4
+        allowed, wait = breaker.allow()
+        self.assertFalse(allowed)
+        self.assertAlmostEqual(wait, 6)
+        self.assertAlmostEqual(breaker.remaining(), 6)
+        
+        # 熔断时间结束后只放行一个试探请求
+        self.clock.now += 6
+        self.assertEqual(breaker.allow(), (True, 0.0))
+        self.assertEqual(breaker.state, HALF_OPEN)
+        self.assertFalse(breaker.allow()[0])
+        
+        # 试探成功后恢复正常
+        self.assertEqual(breaker.record(True), CLOSED)
+        self.assertEqual(breaker.state, CLOSED)
+        self.assertEqual(breaker.allow(), (True, 0.0))
+    
+    def test_failed_probe_reopens(self):
+        breaker = self.breaker
+        breaker.record(False)
+        breaker.record(False)
+        self.clock.now += 10
+        self.assertTrue(breaker.allow()[0])
+        self.assertEqual(breaker.record(False), OPEN)
+        self.assertFalse(breaker.allow()[0])
+    
+    def test_stays_closed_below_failure_rate(self):
+        breaker = self.breaker
+        for success in (True, True, False, True):
+            self.assertIsNone(breaker.record(success))
+        self.assertEqual(breaker.state, CLOSED)
+
+
+class CrawlerBreakerFeedbackTest(unittest.TestCase):
+    """爬虫反馈给熔断器的请求结果"""
+    
+    def setUp(self):
+        logger = logging.getLogger('test_circuit_breaker')
+        logger.addHandler(logging.NullHandler())
+        logger.propagate = False
+        self.crawler = WebCrawler({
+            'name': 'test_circuit_breaker',
+            'circuit_breaker': {'enabled': True, 'min_requests': 2, 'failure_rate': 0.5, 'open_seconds': 60}
+        }, logger=logger)
+        self.addCleanup(self.crawler.close)
+    
+    def breaker_state(self, url):
+        return self.crawler._get_breaker(url).state
+    
+    def test_body_read_timeouts_after_200_open_the_breaker(self):
+        url = 'http://body-timeout.test/article.html'
+        for _ in range(3):
+            self.crawler._record_response(url, 200, 0.1, failure='timeout')
+        self.assertEqual(self.breaker_state(url), OPEN)
+    
+    def test_truncated_bodies_open_the_breaker(self):
+        url = 'http://truncated.test/article.html'
+        for _ in range(2):
+            self.crawler._record_response(url, 200, 0.1, failure='connection')
+        self.assertEqual(self.breaker_state(url), OPEN)
+    
+    def test_client_errors_do_not_open_the_breaker(self):
+        url = 'http://not-found.test/article.html'
+        for _ in range(3):
+            self.crawler._record_response(url, 404, 0.1, failure=404)
+        self.crawler._record_response(url, 200, 0.1, failure='skipped')
+        self.assertEqual(self.breaker_state(url), CLOSED)
+
+
+if __name__ == '__main__':
+    unittest.main()
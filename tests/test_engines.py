@@ -0,0 +1,187 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+多线程引擎与异步引擎的一致性测试
+
+在127.0.0.1上启动一个http.server测试站点（多个列表页和对应的文章页），
+分别用两种爬虫引擎和各个页面解析器爬取，比较写入JSONL文件的文章数据是否一致。
+
+用法:
+    python -m pytest -q tests
+    python -m unittest discover tests
+"""
+
+import glob
+import json
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# 添加项目根目录到路径，以便导入core模块
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(current_dir))
+
+from core.async_crawler import AIOHTTP_AVAILABLE
+from core.engine import create_crawler
+from core.html_tree import PARSER_BACKENDS
+
+LIST_PAGES = 3
+ARTICLES_PER_PAGE = 6
+
+
+def build_list_page(page_index):
+    """生成列表页，第page_index页链接到对应的ARTICLES_PER_PAGE篇文章"""
+    first = page_index * ARTICLES_PER_PAGE
+    items = ''.join(
+        f'<li><a href="/article/{index}.html">文章 {index}</a></li>'
+        for index in range(first, first + ARTICLES_PER_PAGE)
+    )
+    return (
+        f'<html><head><meta charset="utf-8"><title>列表 {page_index}</title></head><body>'
+        f'<div class="nav"><a href="/">首页</a></div>'
+        f'<div class="list"><ul>{items}</ul></div>'
+        f'<div class="footer">2020-01-01</div></body></html>'
+    )
+
+
+def build_article_page(index):
+    """生成文章页，正文和发布时间随序号变化"""
+    return (
+        f'<html><head><meta charset="utf-8"></head><body>'
+        f'<div class="nav">首页 2019-01-01</div>'
+        f'<div class="article"><h1>标题 {index}</h1>'
+        f'<span class="time">发布时间：2024-05-{index % 28 + 1:02d} 10:{index % 60:02d}</span>'
+        f'<p>第一段内容 {index}</p><p>第二段内容 {index}</p></div></body></html>'
+    )
+
+
+class SiteHandler(BaseHTTPRequestHandler):
+    """测试站点：/index.html和/index_N.html为列表页，/article/N.html为文章页，其他路径返回404"""
+    
+    protocol_version = 'HTTP/1.1'
+    
+    def log_message(self, format, *args):
+        pass
+    
+    def _route(self):
+        path = self.path.split('?')[0]
+        if path == '/index.html':
+            return 200, build_list_page(0)
+        if path.startswith('/index_') and path.endswith('.html'):
+            page_index = int(path[len('/index_'):-len('.html')])
+            if page_index < LIST_PAGES:
+                return 200, build_list_page(page_index)
+        if path.startswith('/article/') and path.endswith('.html'):
+            return 200, build_article_page(int(path[len('/article/'):-len('.html')]))
+        return 404, '页面不存在'
+    
+    def _send(self, with_body):
+        status, text = self._route()
+        body = text.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if with_body:
+            self.wfile.write(body)
+    
+    def do_GET(self):
+        self._send(True)
+    
+    def do_HEAD(self):
+        self._send(False)
+
+
+class EngineConsistencyTest(unittest.TestCase):
+    """两种爬虫引擎爬取同一站点的结果应当一致"""
+    
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), SiteHandler)
+        cls.server.daemon_threads = True
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+        
+        # 屏蔽爬取过程中的逐页日志
+        cls.logger = logging.getLogger('test_engines')
+        cls.logger.addHandler(logging.NullHandler())
+        cls.logger.propagate = False
+    
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+    
+    def setUp(self):
+        self.output_dir = tempfile.mkdtemp(prefix='test_engines_')
+        self.addCleanup(shutil.rmtree, self.output_dir, ignore_errors=True)
+    
+    def build_config(self, engine, parser, output_dir):
+        """生成测试站点的爬虫配置，结果写入output_dir中的JSONL文件"""
+        return {
+            'name': 'test_engines',
+            'base_url': self.base_url,
+            'url_onepage': f"{self.base_url}/index.html",
+            'url_multi_page': f"{self.base_url}/index_{{}}.html",
+            'url_multi_page_start': 0,
+            'url_multi_page_stop': LIST_PAGES + 5,
+            'url_list_config': {
+                'target_list_container': {'name': 'div', 'class': 'list', 'id': ''},
+                'target_list_item': {
+                    'name': 'li',
+                    'title': {'name': 'a', 'attr': 'text'},
+                    'link': {'name': 'a', 'attr': 'href'}
+                }
+            },
+            'article_config': {
+                'target_container': {'name': 'div', 'class': 'article', 'id': ''},
+                'target_text_item': {'name': 'p', 'attr': 'text'}
+            },
+            'delay_min': 0,
+            'delay_max': 0,
+            'concurrency': 4,
+            'engine': engine,
+            'parser': parser,
+            'use_jsonl': True,
+            'jsonl_config': {'file_prefix': 'test_engines', 'max_entries': 1000, 'base_path': output_dir}
+        }
+    
+    def crawl(self, engine, parser):
+        """用指定的引擎和解析器爬取测试站点，返回排序后的(标题, 正文, 时间)列表"""
+        output_dir = os.path.join(self.output_dir, f"{engine}_{parser}")
+        crawler = create_crawler(self.build_config(engine, parser, output_dir), logger=self.logger)
+        self.assertTrue(crawler.crawl())
+        
+        rows = []
+        for path in glob.glob(os.path.join(output_dir, '*.jsonl')):
+            with open(path, encoding='utf-8') as f:
+                for line in f:
+                    article = json.loads(line)
+                    rows.append((article['title'], article['content'], article['time']))
+        return sorted(rows)
+    
+    def test_threaded_crawl_collects_every_article(self):
+        rows = self.crawl('threaded', 'html.parser')
+        self.assertEqual(len(rows), LIST_PAGES * ARTICLES_PER_PAGE)
+        title, content, publish_time = rows[0]
+        self.assertEqual(title, '文章 0')
+        self.assertEqual(content, '第一段内容 0\n第二段内容 0')
+        self.assertTrue(publish_time.startswith('2024-05-01'))
+    
+    @unittest.skipUnless(AIOHTTP_AVAILABLE, "异步引擎需要aiohttp")
+    def test_async_engine_matches_threaded_engine(self):
+        for parser in PARSER_BACKENDS:
+            with self.subTest(parser=parser):
+                expected = self.crawl('threaded', parser)
+                self.assertEqual(len(expected), LIST_PAGES * ARTICLES_PER_PAGE)
+                self.assertEqual(self.crawl('async', parser), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+共享连接池的单元测试
+
+用法:
+    python -m pytest -q tests
+"""
+
+import os
+import sys
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# 添加项目根目录到路径，以便导入core模块
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(current_dir))
+
+from core.http_pool import create_session, get_shared_adapter
+
+
+class CountingHandler(BaseHTTPRequestHandler):
+    """记录建立的连接数，连接在请求之间保持打开"""
+    
+    protocol_version = 'HTTP/1.1'
+    connections = 0
+    lock = threading.Lock()
+    
+    def setup(self):
+        super().setup()
+        with CountingHandler.lock:
+            CountingHandler.connections += 1
+    
+    def log_message(self, format, *args):
+        pass
+    
+    def do_GET(self):
+        body = b'ok'
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class SharedAdapterTest(unittest.TestCase):
+    
+    def test_crawlers_with_different_concurrency_share_one_adapter(self):
+        small = get_shared_adapter({'max_hosts': 5, 'max_per_host': 4, 'keepalive_timeout': 31})
+        large = get_shared_adapter({'max_hosts': 8, 'max_per_host': 24, 'keepalive_timeout': 31})
+        again = get_shared_adapter({'max_hosts': 5, 'max_per_host': 4, 'keepalive_timeout': 31})
+        self.assertIs(small, large)
+        self.assertIs(small, again)
+        self.assertEqual(small._pool_maxsize, 24)
+        self.assertEqual(small._pool_connections, 8)
+        self.assertEqual(small.poolmanager.connection_pool_kw['maxsize'], 24)
+    
+    def test_blocking_pools_are_separate(self):
+        blocking = get_shared_adapter({'block': True, 'keepalive_timeout': 32})
+        non_blocking = get_shared_adapter({'block': False, 'keepalive_timeout': 32})
+        self.assertIsNot(blocking, non_blocking)
+
+
+class KeepAliveTimeoutTest(unittest.TestCase):
+    
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), CountingHandler)
+        cls.server.daemon_threads = True
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.url = f"http://127.0.0.1:{cls.server.server_address[1]}/"
+    
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+    
+    def fetch_twice(self, pool_config, pause):
+        """间隔pause秒发送两次请求，返回服务端新建的连接数"""
+        session = create_session(pool_config=pool_config)
+        before = CountingHandler.connections
+        session.get(self.url, timeout=5).close()
+        time.sleep(pause)
+        session.get(self.url, timeout=5).close()
+        return CountingHandler.connections - before
+    
+    def test_connection_reused_within_timeout(self):
+        self.assertEqual(self.fetch_twice({'keepalive_timeout': 5}, 0), 1)
+    
+    def test_idle_connection_not_reused_after_timeout(self):
+        self.assertEqual(self.fetch_twice({'keepalive_timeout': 0.1}, 0.3), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
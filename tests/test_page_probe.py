@@ -0,0 +1,132 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+最后一页探测的单元测试
+
+用法:
+    python -m pytest -q tests
+"""
+
+import logging
+import os
+import sys
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# 添加项目根目录到路径，以便导入core模块
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(current_dir))
+
+from core.crawler import WebCrawler
+from core.page_probe import last_page_search
+
+LAST_PAGE = 37
+
+
+def run_search(start, stop, last_page):
+    """用页码不超过last_page即存在的判断驱动last_page_search，返回(结果, 探测过的页码)"""
+    search = last_page_search(start, stop)
+    probed = []
+    try:
+        page_index = next(search)
+        while True:
+            probed.append(page_index)
+            page_index = search.send(page_index <= last_page)
+    except StopIteration as e:
+        return e.value, probed
+
+
+class LastPageSearchTest(unittest.TestCase):
+    
+    def test_finds_last_page(self):
+        for start, stop, last_page in ((1, 1000, 37), (1, 1000, 1), (1, 1000, 2), (5, 100, 64), (0, 500, 255)):
+            with self.subTest(start=start, last_page=last_page):
+                result, probed = run_search(start, stop, last_page)
+                self.assertEqual(result, last_page)
+                self.assertLessEqual(len(probed), 2 * (last_page - start + 2).bit_length())
+    
+    def test_stops_at_upper_bound(self):
+        result, probed = run_search(1, 20, 1000)
+        self.assertEqual(result, 20)
+        self.assertEqual(probed[-1], 20)
+    
+    def test_start_equals_stop(self):
+        self.assertEqual(run_search(3, 3, 10), (3, []))
+
+
+class ProbeHandler(BaseHTTPRequestHandler):
+    """/list_N.html在N不超过LAST_PAGE时存在；不支持HEAD请求时只响应Range请求"""
+    
+    protocol_version = 'HTTP/1.1'
+    support_head = True
+    requests = []
+    
+    def log_message(self, format, *args):
+        pass
+    
+    def _status(self):
+        page_index = int(self.path[len('/list_'):-len('.html')])
+        return 200 if page_index <= LAST_PAGE else 404
+    
+    def _reply(self, status, body=b''):
+        self.send_response(status)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if body and self.command != 'HEAD':
+            self.wfile.write(body)
+    
+    def do_HEAD(self):
+        ProbeHandler.requests.append(('HEAD', self.path))
+        self._reply(self._status() if self.support_head else 405)
+    
+    def do_GET(self):
+        ProbeHandler.requests.append(('GET', self.path))
+        status = self._status()
+        self._reply(206 if status == 200 and self.headers.get('Range') else status, b'x')
+
+
+class ProbeLastPageTest(unittest.TestCase):
+    
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), ProbeHandler)
+        cls.server.daemon_threads = True
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+    
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+    
+    def setUp(self):
+        ProbeHandler.requests = []
+        ProbeHandler.support_head = True
+        logger = logging.getLogger('test_page_probe')
+        logger.addHandler(logging.NullHandler())
+        logger.propagate = False
+        self.crawler = WebCrawler({'name': 'test_page_probe', 'base_url': self.base_url}, logger=logger)
+        self.addCleanup(self.crawler.close)
+        self.config = {
+            'url_onepage': f"{self.base_url}/list_1.html",
+            'url_multi_page': f"{self.base_url}/list_{{}}.html",
+            'url_multi_page_start': 1,
+            'url_multi_page_stop': 1000,
+        }
+    
+    def test_probe_with_head(self):
+        self.assertEqual(self.crawler._probe_last_page(self.config), LAST_PAGE)
+        self.assertTrue(all(method == 'HEAD' for method, _ in ProbeHandler.requests))
+        self.assertLess(len(ProbeHandler.requests), 16)
+    
+    def test_falls_back_to_range_requests(self):
+        ProbeHandler.support_head = False
+        self.assertEqual(self.crawler._probe_last_page(self.config), LAST_PAGE)
+        self.assertEqual(ProbeHandler.requests[0][0], 'HEAD')
+        self.assertTrue(all(method == 'GET' for method, _ in ProbeHandler.requests[1:]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+令牌桶限速器的单元测试
+
+用法:
+    python -m pytest -q tests
+"""
+
+import logging
+import os
+import sys
+import threading
+import time
+import unittest
+from unittest import mock
+
+# 添加项目根目录到路径，以便导入core模块
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(current_dir))
+
+from core.crawler import WebCrawler
+from core.rate_limiter import TokenBucket
+
+
+class TokenBucketTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.now = 1000.0
+        patcher = mock.patch('core.rate_limiter.time.monotonic', lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+    
+    def test_reservations_queue_behind_each_other(self):
+        bucket = TokenBucket(rate=2, burst=1)
+        self.assertEqual(bucket.reserve(), 0.0)
+        self.assertAlmostEqual(bucket.reserve(), 0.5)
+        self.assertAlmostEqual(bucket.reserve(), 1.0)
+        self.now += 1.0
+        self.assertAlmostEqual(bucket.reserve(), 0.5)
+    
+    def test_release_returns_cancelled_reservations(self):
+        bucket = TokenBucket(rate=2, burst=1)
+        bucket.reserve()
+        bucket.reserve()
+        bucket.release()
+        self.assertAlmostEqual(bucket.reserve(), 0.5)
+    
+    def test_release_never_exceeds_burst(self):
+        bucket = TokenBucket(rate=2, burst=2)
+        bucket.release(5)
+        self.assertEqual(bucket.tokens, 2)
+    
+    def test_pause(self):
+        bucket = TokenBucket(rate=2, burst=1)
+        bucket.pause(3)
+        self.assertAlmostEqual(bucket.reserve(), 3.5)
+
+
+class CrawlerRateLimitStopTest(unittest.TestCase):
+    """等待限速令牌的工作线程应及时响应停止请求"""
+    
+    def test_stop_interrupts_queued_workers(self):
+        logger = logging.getLogger('test_rate_limiter')
+        logger.addHandler(logging.NullHandler())
+        logger.propagate = False
+        crawler = WebCrawler({
+            'name': 'test_rate_limiter',
+            'rate_limit': {'requests_per_second': 0.5, 'burst': 1}
+        }, logger=logger)
+        self.addCleanup(crawler.close)
+        url = 'http://rate-limit-stop.test/page.html'
+        limiter = crawler._get_rate_limiter(url)
+        
+        results = []
+        workers = [threading.Thread(target=lambda: results.append(crawler._acquire_rate_limit(url))) for _ in range(8)]
+        for worker in workers:
+            worker.start()
+        time.sleep(0.2)
+        start = time.monotonic()
+        crawler.stop()
+        for worker in workers:
+            worker.join(timeout=5)
+        elapsed = time.monotonic() - start
+        
+        # 8个线程按0.5次/秒排队需要14秒，停止后应在一个等待分段内全部返回
+        self.assertLess(elapsed, 1.5)
+        self.assertEqual(sorted(results), [False] * 7 + [True])
+        # 被取消的预约已归还，下一次预约只需等待一个令牌的补充时间（未归还时需要16秒）
+        self.assertLess(limiter.reserve(), 2.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
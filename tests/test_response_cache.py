@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+磁盘响应缓存的单元测试
+
+用法:
+    python -m pytest -q tests
+"""
+
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+# 添加项目根目录到路径，以便导入core模块
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(current_dir))
+
+from core.crawler import WebCrawler
+from core.response_cache import ResponseCache
+
+HEADERS = {'Content-Type': 'text/html; charset=utf-8'}
+
+
+class ResponseCacheTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(prefix='test_response_cache_')
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+        self.now = 1_700_000_000.0
+        patcher = mock.patch('core.response_cache.time.time', lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+    
+    def test_round_trip(self):
+        cache = ResponseCache(self.directory)
+        cache.put('https://example.com/a', '正文'.encode('gb18030'), 'gb18030', 200, HEADERS)
+        cached = cache.get('https://example.com/a')
+        self.assertEqual(cached.text, '正文')
+        self.assertEqual(cached.status, 200)
+        self.assertEqual(cached.headers, HEADERS)
+    
+    def test_ttl_expiry(self):
+        cache = ResponseCache(self.directory, ttl=60)
+        cache.put('https://example.com/a', b'a', 'utf-8', 200, HEADERS)
+        self.now += 59
+        self.assertIsNotNone(cache.get('https://example.com/a'))
+        self.now += 2
+        self.assertIsNone(cache.get('https://example.com/a'))
+        # 离线模式忽略过期时间
+        self.assertIsNotNone(cache.get('https://example.com/a', allow_stale=True))
+    
+    def test_zero_ttl_never_expires(self):
+        cache = ResponseCache(self.directory, ttl=0)
+        cache.put('https://example.com/a', b'a', 'utf-8', 200, HEADERS)
+        self.now += 10 ** 8
+        self.assertIsNotNone(cache.get('https://example.com/a'))
+    
+    def test_lru_eviction(self):
+        bodies = {name: os.urandom(1000) for name in 'abc'}
+        # 随机内容压缩后仍约1000字节，上限只能容纳两个页面
+        cache = ResponseCache(self.directory, ttl=0, max_size=2500)
+        cache.put('https://example.com/a', bodies['a'], 'utf-8', 200, HEADERS)
+        cache.put('https://example.com/b', bodies['b'], 'utf-8', 200, HEADERS)
+        # 访问a后，最久未使用的是b
+        self.assertIsNotNone(cache.get('https://example.com/a'))
+        cache.put('https://example.com/c', bodies['c'], 'utf-8', 200, HEADERS)
+        self.assertIsNone(cache.get('https://example.com/b'))
+        self.assertEqual(cache.get('https://example.com/a').body, bodies['a'])
+        self.assertEqual(cache.get('https://example.com/c').body, bodies['c'])
+    
+    def test_no_store_is_not_cached(self):
+        cache = ResponseCache(self.directory)
+        cache.put('https://example.com/a', b'a', 'utf-8', 200, {'Cache-Control': 'private, no-store'})
+        self.assertIsNone(cache.get('https://example.com/a'))
+    
+    def test_index_survives_reload(self):
+        cache = ResponseCache(self.directory)
+        cache.put('https://example.com/a', b'a', 'utf-8', 200, HEADERS)
+        cache.save()
+        self.assertEqual(ResponseCache(self.directory).get('https://example.com/a').body, b'a')
+
+
+class OfflineModeTest(unittest.TestCase):
+    """离线模式下只从缓存读取页面"""
+    
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(prefix='test_response_cache_offline_')
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+        cache = ResponseCache(self.directory, ttl=1)
+        cache.put('https://offline.test/cached.html', b'<html><body><p>cached</p></body></html>', 'utf-8', 200, HEADERS)
+        with mock.patch('core.response_cache.time.time', return_value=0):
+            cache.put('https://offline.test/stale.html', b'<html><body><p>stale</p></body></html>', 'utf-8', 200, HEADERS)
+        cache.save()
+        
+        logger = logging.getLogger('test_response_cache')
+        logger.addHandler(logging.NullHandler())
+        logger.propagate = False
+        self.crawler = WebCrawler({
+            'name': 'test_response_cache',
+            'response_cache': {'enabled': True, 'directory': self.directory, 'ttl': 1, 'offline': True}
+        }, logger=logger)
+        self.addCleanup(self.crawler.close)
+    
+    def test_cached_and_stale_pages_are_served(self):
+        for url, text in (('https://offline.test/cached.html', 'cached'), ('https://offline.test/stale.html', 'stale')):
+            with self.subTest(url=url):
+                result = self.crawler.fetch_page(url)
+                self.assertIsNone(result.failure)
+                self.assertTrue(result.from_cache)
+                self.assertEqual(result.soup.find('p').get_text(), text)
+    
+    def test_missing_page_fails_without_request(self):
+        with mock.patch.object(self.crawler, '_send_request') as send_request:
+            result = self.crawler.fetch_page('https://offline.test/missing.html')
+        send_request.assert_not_called()
+        self.assertEqual(result.failure, 'offline')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+重试策略和Retry-After解析的单元测试
+
+用法:
+    python -m pytest -q tests
+"""
+
+import os
+import sys
+import unittest
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+# 添加项目根目录到路径，以便导入core模块
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(current_dir))
+
+from core.adaptive import parse_retry_after
+from core.retry import RetryPolicy
+
+
+class RetryPolicyTest(unittest.TestCase):
+    
+    def test_full_jitter_stays_within_exponential_bound(self):
+        policy = RetryPolicy({'max_attempts': 10, 'backoff_base': 1.0, 'backoff_max': 5.0})
+        for attempt, bound in ((1, 1.0), (2, 2.0), (3, 4.0), (4, 5.0), (8, 5.0)):
+            with self.subTest(attempt=attempt):
+                delays = [policy.get_delay(503, attempt) for _ in range(200)]
+                self.assertTrue(all(0 <= delay <= bound for delay in delays))
+                # 全抖动在整个区间内取值，不会集中在上限附近
+                self.assertLess(min(delays), bound / 2)
+    
+    def test_without_jitter_uses_exponential_delay(self):
+        policy = RetryPolicy({'max_attempts': 10, 'backoff_base': 0.5, 'backoff_max': 3.0, 'jitter': False})
+        self.assertEqual([policy.get_delay('timeout', attempt) for attempt in range(1, 6)], [0.5, 1.0, 2.0, 3.0, 3.0])
+    
+    def test_max_attempts_cutoff(self):
+        policy = RetryPolicy({'max_attempts': 3})
+        self.assertIsNotNone(policy.get_delay('connection', 1))
+        self.assertIsNotNone(policy.get_delay('connection', 2))
+        self.assertIsNone(policy.get_delay('connection', 3))
+    
+    def test_class_overrides_max_attempts(self):
+        policy = RetryPolicy({'max_attempts': 2, 'status_classes': {'429': {'max_attempts': 5}, '5xx': {}}})
+        self.assertIsNotNone(policy.get_delay(429, 4))
+        self.assertIsNone(policy.get_delay(429, 5))
+        self.assertIsNone(policy.get_delay(502, 2))
+    
+    def test_unlisted_failures_are_not_retried(self):
+        policy = RetryPolicy()
+        for failure in (404, 403, 'error', 'skipped', 'stopped'):
+            with self.subTest(failure=failure):
+                self.assertIsNone(policy.get_delay(failure, 1))
+    
+    def test_retry_after_takes_precedence(self):
+        policy = RetryPolicy({'backoff_max': 1.0})
+        self.assertEqual(policy.get_delay(429, 1, retry_after=30.0), 30.0)
+        ignoring = RetryPolicy({'backoff_max': 1.0, 'respect_retry_after': False})
+        self.assertLessEqual(ignoring.get_delay(429, 1, retry_after=30.0), 1.0)
+
+
+class ParseRetryAfterTest(unittest.TestCase):
+    
+    def test_seconds(self):
+        self.assertEqual(parse_retry_after('120'), 120.0)
+        self.assertEqual(parse_retry_after(' 1.5 '), 1.5)
+        self.assertEqual(parse_retry_after('-3'), 0.0)
+    
+    def test_http_date(self):
+        retry_time = datetime.now(timezone.utc) + timedelta(seconds=90)
+        seconds = parse_retry_after(format_datetime(retry_time, usegmt=True))
+        self.assertAlmostEqual(seconds, 90, delta=2)
+    
+    def test_http_date_in_the_past(self):
+        self.assertEqual(parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT'), 0.0)
+    
+    def test_invalid(self):
+        self.assertIsNone(parse_retry_after(''))
+        self.assertIsNone(parse_retry_after(None))
+        self.assertIsNone(parse_retry_after('soon'))
+
+
+if __name__ == '__main__':
+    unittest.main()
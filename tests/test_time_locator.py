@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+按站点学习文章时间位置的单元测试
+
+用法:
+    python -m pytest -q tests
+"""
+
+import json
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+# 添加项目根目录到路径，以便导入core模块
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(current_dir))
+
+from core.crawler import WebCrawler
+from core.html_tree import parse_html
+from core.time_locator import SOURCE_TEXT, TimeLocatorStore, make_locator
+
+SITE = 'news.example.com'
+
+# 时间只出现在正文中，没有时间元素，只能从整个页面文本中找到
+PAGE_WITHOUT_TIME_ELEMENT = (
+    '<html><body><div class="article"><p>记者 2024-01-02 09:15 报道</p></div></body></html>'
+)
+
+# 导航中有一个更早出现的日期，真正的发布时间在时间元素中
+PAGE_WITH_TIME_ELEMENT = (
+    '<html><body><div class="nav">专题 2019-09-09 08:00</div>'
+    '<div class="article"><span class="time">2024-03-04 11:22</span><p>正文</p></div></body></html>'
+)
+
+
+class TimeLocatorTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(prefix='test_time_locator_')
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+        self.store_path = os.path.join(self.directory, 'time_locators.json')
+    
+    def create_crawler(self):
+        logger = logging.getLogger('test_time_locator')
+        logger.addHandler(logging.NullHandler())
+        logger.propagate = False
+        crawler = WebCrawler({
+            'name': 'test_time_locator',
+            'time_locator': {'enabled': True, 'store_path': self.store_path}
+        }, logger=logger)
+        self.addCleanup(crawler.close)
+        return crawler
+    
+    def extract(self, crawler, html, index):
+        return crawler.extract_time_from_page(parse_html(html, 'html.parser'), f"https://{SITE}/article/{index}.html")
+    
+    def test_page_text_time_is_not_learned(self):
+        crawler = self.create_crawler()
+        self.assertEqual(self.extract(crawler, PAGE_WITHOUT_TIME_ELEMENT, 1), '2024-01-02 09:15:00')
+        self.assertIsNone(crawler.time_locator_store.get(SITE))
+        
+        # 下一篇文章的时间元素不会被之前在页面文本中找到的位置抢先
+        self.assertEqual(self.extract(crawler, PAGE_WITH_TIME_ELEMENT, 2), '2024-03-04 11:22:00')
+        self.assertEqual(crawler.time_locator_store.get(SITE), make_locator('.time', SOURCE_TEXT, 'ymd_hm'))
+    
+    def test_saved_page_text_locator_loses_to_time_element(self):
+        with open(self.store_path, 'w', encoding='utf-8') as f:
+            json.dump({SITE: {'locator': {'selector': None, 'source': 'page', 'pattern': 'ymd_hm'},
+                              'hits': 5, 'misses': 0}}, f)
+        self.assertIsNone(TimeLocatorStore(self.store_path).get(SITE))
+        
+        crawler = self.create_crawler()
+        self.assertEqual(self.extract(crawler, PAGE_WITH_TIME_ELEMENT, 1), '2024-03-04 11:22:00')
+    
+    def test_learned_element_locator_is_reused(self):
+        crawler = self.create_crawler()
+        self.extract(crawler, PAGE_WITH_TIME_ELEMENT, 1)
+        store = crawler.time_locator_store
+        page = PAGE_WITH_TIME_ELEMENT.replace('2024-03-04 11:22', '2024-03-05 08:30')
+        self.assertEqual(self.extract(crawler, page, 2), '2024-03-05 08:30:00')
+        self.assertEqual(store._entries[SITE]['hits'], 1)
+    
+    def test_save_and_reload(self):
+        store = TimeLocatorStore(self.store_path)
+        locator = make_locator('time', 'datetime')
+        store.learn(SITE, locator)
+        store.record(SITE, True)
+        store.save()
+        reloaded = TimeLocatorStore(self.store_path)
+        self.assertEqual(reloaded.get(SITE), locator)
+        self.assertEqual(reloaded._entries[SITE]['hits'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
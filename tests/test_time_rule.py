@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+配置的文章时间提取规则（article_config.target_time）的单元测试
+
+用法:
+    python -m pytest -q tests
+"""
+
+import os
+import sys
+import unittest
+from datetime import datetime
+from unittest import mock
+
+# 添加项目根目录到路径，以便导入core模块
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(current_dir))
+
+from core import extraction_plan
+from core.extraction_plan import TimeRule
+from core.html_tree import parse_html
+from core.time_extractor import parse_time_text
+
+PAGE = (
+    '<html><body><div class="nav">2019-09-09 08:00</div>'
+    '<div class="info"><span class="date" data-ts="2024/03/04 11:22">发布于 2024年03月04日</span>'
+    '<em class="md">02-29 07:30</em><em class="day">2024-03-04</em></div></body></html>'
+)
+
+
+class FixedDatetime(datetime):
+    """当前时间固定为2026-10-17 09:08:07"""
+    
+    @classmethod
+    def now(cls, tz=None):
+        return cls(2026, 10, 17, 9, 8, 7)
+
+
+class TimeRuleTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.document = parse_html(PAGE, 'html.parser')
+        patcher = mock.patch.object(extraction_plan, 'datetime', FixedDatetime)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+    
+    def extract(self, **config):
+        return TimeRule(config).extract(self.document, parse_time_text)
+    
+    def test_attribute_with_auto_format(self):
+        self.assertEqual(self.extract(selector='span.date', attr='data-ts'), '2024-03-04 11:22:00')
+    
+    def test_text_with_explicit_format(self):
+        self.assertEqual(self.extract(selector='span.date', format='发布于 %Y年%m月%d日'), '2024-03-04 09:08:07')
+    
+    def test_date_only_format_uses_current_clock(self):
+        self.assertEqual(self.extract(selector='em.day', format='%Y-%m-%d'), '2024-03-04 09:08:07')
+    
+    def test_format_without_year_uses_current_year_and_leap_day(self):
+        # 当前年份2026不是闰年，2月29日使用最近的闰年
+        self.assertEqual(self.extract(selector='em.md', format='%m-%d %H:%M'), '2024-02-29 07:30:00')
+    
+    def test_xpath_selector(self):
+        # XPath选择器只能用于lxml.html解析器
+        self.document = parse_html(PAGE, 'lxml.html')
+        self.assertEqual(self.extract(selector='//span[@class="date"]/@data-ts'), '2024-03-04 11:22:00')
+    
+    def test_unmatched_or_unparseable_returns_none(self):
+        self.assertIsNone(self.extract(selector='.missing'))
+        self.assertIsNone(self.extract(selector='em.day', format='%d/%m/%Y'))
+    
+    def test_fallback(self):
+        self.assertTrue(TimeRule({'selector': '.date'}).use_heuristic)
+        self.assertFalse(TimeRule({'selector': '.date', 'fallback': 'none'}).use_heuristic)
+    
+    def test_invalid_config(self):
+        for config in ({}, {'selector': '  '}, {'selector': 'div[', 'fallback': 'none'},
+                       {'selector': '.date', 'fallback': 'guess'}):
+            with self.subTest(config=config):
+                with self.assertRaises(ValueError):
+                    TimeRule(config)
+
+
+if __name__ == '__main__':
+    unittest.main()
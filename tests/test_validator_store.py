@@ -0,0 +1,124 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+列表页条件请求的单元测试
+
+用法:
+    python -m pytest -q tests
+"""
+
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# 添加项目根目录到路径，以便导入core模块
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(current_dir))
+
+from core.crawler import WebCrawler
+from core.validator_store import ValidatorStore, list_config_fingerprint
+
+LIST_PAGE = (
+    '<html><body>'
+    '<div class="news"><ul><li><a href="/news/1.html">新闻 1</a></li></ul></div>'
+    '<div class="notice"><ul><li><a href="/notice/1.html">公告 1</a></li></ul></div>'
+    '</body></html>'
+).encode('utf-8')
+ETAG = '"list-v1"'
+
+
+class ListHandler(BaseHTTPRequestHandler):
+    """带ETag的列表页，携带匹配的If-None-Match时返回304"""
+    
+    protocol_version = 'HTTP/1.1'
+    not_modified = 0
+    
+    def log_message(self, format, *args):
+        pass
+    
+    def do_GET(self):
+        if self.headers.get('If-None-Match') == ETAG:
+            ListHandler.not_modified += 1
+            self.send_response(304)
+            self.send_header('ETag', ETAG)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('ETag', ETAG)
+        self.send_header('Content-Length', str(len(LIST_PAGE)))
+        self.end_headers()
+        self.wfile.write(LIST_PAGE)
+
+
+def list_config(container_class):
+    return {
+        'target_list_container': {'name': 'div', 'class': container_class, 'id': ''},
+        'target_list_item': {'name': 'li', 'title': {'name': 'a', 'attr': 'text'}, 'link': {'name': 'a', 'attr': 'href'}}
+    }
+
+
+class ValidatorStoreTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(prefix='test_validator_store_')
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+        self.store_path = os.path.join(self.directory, 'list_validators.json')
+    
+    def test_fingerprint_mismatch_is_a_miss(self):
+        store = ValidatorStore(self.store_path)
+        links = [{'title': '新闻 1', 'url': 'https://example.com/news/1.html'}]
+        news = list_config_fingerprint(list_config('news'), 'https://example.com')
+        notice = list_config_fingerprint(list_config('notice'), 'https://example.com')
+        self.assertNotEqual(news, notice)
+        
+        store.update('https://example.com/list', {'ETag': ETAG}, links, news)
+        self.assertEqual(store.conditional_headers('https://example.com/list', news), {'If-None-Match': ETAG})
+        self.assertEqual(store.get_links('https://example.com/list', news), links)
+        self.assertIsNone(store.conditional_headers('https://example.com/list', notice))
+        self.assertIsNone(store.get_links('https://example.com/list', notice))
+        
+        store.save()
+        self.assertEqual(ValidatorStore(self.store_path).get_links('https://example.com/list', news), links)
+    
+    def test_changed_selectors_do_not_reuse_stale_links(self):
+        server = ThreadingHTTPServer(('127.0.0.1', 0), ListHandler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        base_url = f"http://127.0.0.1:{server.server_address[1]}"
+        
+        logger = logging.getLogger('test_validator_store')
+        logger.addHandler(logging.NullHandler())
+        logger.propagate = False
+        
+        def get_titles(container_class):
+            crawler = WebCrawler({
+                'name': 'test_validator_store',
+                'base_url': base_url,
+                'url_list_config': list_config(container_class),
+                'conditional_get': {'enabled': True, 'store_path': self.store_path}
+            }, logger=logger)
+            self.addCleanup(crawler.close)
+            return [item['title'] for item in crawler._get_url_list(f"{base_url}/list.html")]
+        
+        self.assertEqual(get_titles('news'), ['新闻 1'])
+        before = ListHandler.not_modified
+        self.assertEqual(get_titles('news'), ['新闻 1'])
+        self.assertEqual(ListHandler.not_modified, before + 1)
+        
+        # 修改列表容器后不再发送条件请求，按新配置重新解析
+        self.assertEqual(get_titles('notice'), ['公告 1'])
+        self.assertEqual(ListHandler.not_modified, before + 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
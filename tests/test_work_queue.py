@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+支持延迟投递的任务队列的单元测试
+
+用法:
+    python -m pytest -q tests
+"""
+
+import os
+import queue
+import sys
+import threading
+import time
+import unittest
+
+# 添加项目根目录到路径，以便导入core模块
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(current_dir))
+
+from core.work_queue import WorkQueue
+
+
+class WorkQueueTest(unittest.TestCase):
+    
+    def test_reput_after_delay(self):
+        work_queue = WorkQueue()
+        work_queue.put('a')
+        work_queue.put('b')
+        self.assertEqual(work_queue.get(timeout=1), 'a')
+        
+        # 处理失败的任务延后重新投递，期间其他任务照常领取
+        work_queue.put('a', delay=0.2, block=False)
+        work_queue.task_done()
+        self.assertEqual(work_queue.get(timeout=1), 'b')
+        work_queue.task_done()
+        
+        start = time.monotonic()
+        self.assertEqual(work_queue.get(timeout=1), 'a')
+        self.assertGreaterEqual(time.monotonic() - start, 0.15)
+        work_queue.task_done()
+    
+    def test_delayed_items_come_out_in_due_order(self):
+        work_queue = WorkQueue()
+        work_queue.put('late', delay=0.2)
+        work_queue.put('early', delay=0.1)
+        self.assertEqual(work_queue.get(timeout=1), 'early')
+        self.assertEqual(work_queue.get(timeout=1), 'late')
+    
+    def test_get_times_out_while_item_is_delayed(self):
+        work_queue = WorkQueue()
+        work_queue.put('a', delay=1)
+        with self.assertRaises(queue.Empty):
+            work_queue.get(timeout=0.05)
+    
+    def test_closed_queue_waits_for_reput_before_finishing(self):
+        work_queue = WorkQueue()
+        work_queue.put('a')
+        work_queue.close()
+        self.assertEqual(work_queue.get(timeout=1), 'a')
+        
+        # 处理中的任务在task_done()之前重新投递，队列不会提前结束
+        work_queue.put('a', delay=0.05, block=False)
+        work_queue.task_done()
+        self.assertEqual(work_queue.get(timeout=1), 'a')
+        work_queue.task_done()
+        self.assertIsNone(work_queue.get(timeout=1))
+    
+    def test_maxsize_blocks_producer_until_item_taken(self):
+        work_queue = WorkQueue(maxsize=1)
+        work_queue.put('a')
+        with self.assertRaises(queue.Full):
+            work_queue.put('b', timeout=0.05)
+        
+        threading.Timer(0.05, work_queue.get).start()
+        work_queue.put('b', timeout=1)
+        # 工作线程重新投递时不受上限限制
+        work_queue.put('c', block=False)
+        self.assertEqual(work_queue.get(timeout=1), 'b')
+        self.assertEqual(work_queue.get(timeout=1), 'c')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -41,6 +41,52 @@ class ConfigWindow:
         self.delay_min_var = tk.StringVar(value="800")
         self.delay_max_var = tk.StringVar(value="1500")
         
+        # 性能设置变量
+        self.concurrency_var = tk.StringVar(value="1")
+        self.engine_var = tk.StringVar(value="threaded")
+        self.link_queue_size_var = tk.StringVar(value="200")
+        self.list_page_concurrency_var = tk.StringVar(value="1")
+        self.parse_workers_var = tk.StringVar(value="0")
+        self.probe_last_page_var = tk.BooleanVar(value=False)
+        self.parser_var = tk.StringVar(value="html.parser")
+        self.targeted_parse_var = tk.BooleanVar(value=False)
+        self.rate_limit_rps_var = tk.StringVar(value="0")
+        self.rate_limit_burst_var = tk.StringVar(value="1")
+        self.adaptive_enabled_var = tk.BooleanVar(value=False)
+        self.adaptive_min_concurrency_var = tk.StringVar(value="1")
+        self.adaptive_max_concurrency_var = tk.StringVar(value="16")
+        self.adaptive_min_rate_var = tk.StringVar(value="0.5")
+        self.adaptive_max_rate_var = tk.StringVar(value="20")
+        self.adaptive_target_latency_var = tk.StringVar(value="2000")
+        self.retry_max_attempts_var = tk.StringVar(value="3")
+        self.retry_backoff_base_var = tk.StringVar(value="1.0")
+        self.retry_backoff_max_var = tk.StringVar(value="60")
+        self.breaker_enabled_var = tk.BooleanVar(value=False)
+        self.breaker_failure_rate_var = tk.StringVar(value="0.5")
+        self.breaker_open_seconds_var = tk.StringVar(value="30")
+        self.pool_max_hosts_var = tk.StringVar(value="10")
+        self.pool_max_per_host_var = tk.StringVar(value="10")
+        self.pool_block_var = tk.BooleanVar(value=False)
+        self.pool_keep_alive_var = tk.BooleanVar(value=True)
+        self.pool_keepalive_timeout_var = tk.StringVar(value="15")
+        self.conditional_get_var = tk.BooleanVar(value=False)
+        self.response_cache_enabled_var = tk.BooleanVar(value=False)
+        self.response_cache_ttl_var = tk.StringVar(value="3600")
+        self.response_cache_max_size_var = tk.StringVar(value="200")
+        self.response_cache_offline_var = tk.BooleanVar(value=False)
+        self.time_locator_var = tk.BooleanVar(value=False)
+        self.download_max_body_var = tk.StringVar(value="10")
+        self.download_content_types_var = tk.StringVar(value="text/html, application/xhtml+xml, text/plain")
+        self.timeout_connect_var = tk.StringVar(value="10")
+        self.timeout_read_var = tk.StringVar(value="10")
+        self.timeout_total_var = tk.StringVar(value="60")
+        self.budget_max_seconds_var = tk.StringVar(value="0")
+        self.budget_max_pages_var = tk.StringVar(value="0")
+        self.budget_max_mb_var = tk.StringVar(value="0")
+        
+        # 表单未覆盖的配置项（如手工编辑的高级配置），保存时原样保留
+        self.extra_config = {}
+        
         # URL列表配置变量
         self.list_container_name_var = tk.StringVar(value="div")
         self.list_container_class_var = tk.StringVar()
@@ -57,6 +103,10 @@ class ConfigWindow:
         self.article_container_id_var = tk.StringVar()
         self.article_text_item_name_var = tk.StringVar(value="p")
         self.article_text_item_attr_var = tk.StringVar(value="text")
+        self.article_time_selector_var = tk.StringVar()
+        self.article_time_attr_var = tk.StringVar(value="text")
+        self.article_time_format_var = tk.StringVar()
+        self.article_time_fallback_var = tk.StringVar(value="heuristic")
         
         # 请求头变量
         self.user_agent_var = tk.StringVar(value="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36")
@@ -82,6 +132,7 @@ class ConfigWindow:
     
     def load_config_data(self, config_data):
         """加载配置数据到表单"""
+        self.extra_config = dict(config_data)
         self.name_var.set(config_data.get('name', ''))
         self.base_url_var.set(config_data.get('base_url', ''))
         # 加载URL配置
@@ -93,6 +144,58 @@ class ConfigWindow:
         self.delay_min_var.set(str(config_data.get('delay_min', 800)))
         self.delay_max_var.set(str(config_data.get('delay_max', 1500)))
         
+        # 性能设置
+        self.concurrency_var.set(str(config_data.get('concurrency', 1)))
+        self.link_queue_size_var.set(str(config_data.get('link_queue_size', 200)))
+        self.list_page_concurrency_var.set(str(config_data.get('list_page_concurrency', 1)))
+        self.probe_last_page_var.set(config_data.get('probe_last_page', False))
+        self.parser_var.set(config_data.get('parser', 'html.parser'))
+        self.parse_workers_var.set(str(config_data.get('parse_workers', 0)))
+        self.targeted_parse_var.set(config_data.get('targeted_parse', False))
+        self.engine_var.set(config_data.get('engine', 'threaded'))
+        rate_limit_config = config_data.get('rate_limit', {})
+        self.rate_limit_rps_var.set(str(rate_limit_config.get('requests_per_second', 0)))
+        self.rate_limit_burst_var.set(str(rate_limit_config.get('burst', 1)))
+        adaptive_config = config_data.get('adaptive', {})
+        self.adaptive_enabled_var.set(adaptive_config.get('enabled', False))
+        self.adaptive_min_concurrency_var.set(str(adaptive_config.get('min_concurrency', 1)))
+        self.adaptive_max_concurrency_var.set(str(adaptive_config.get('max_concurrency', 16)))
+        self.adaptive_min_rate_var.set(str(adaptive_config.get('min_rate', 0.5)))
+        self.adaptive_max_rate_var.set(str(adaptive_config.get('max_rate', 20)))
+        self.adaptive_target_latency_var.set(str(adaptive_config.get('target_latency_ms', 2000)))
+        retry_config = config_data.get('retry', {})
+        self.retry_max_attempts_var.set(str(retry_config.get('max_attempts', 3)))
+        self.retry_backoff_base_var.set(str(retry_config.get('backoff_base', 1.0)))
+        self.retry_backoff_max_var.set(str(retry_config.get('backoff_max', 60)))
+        breaker_config = config_data.get('circuit_breaker', {})
+        self.breaker_enabled_var.set(breaker_config.get('enabled', False))
+        self.breaker_failure_rate_var.set(str(breaker_config.get('failure_rate', 0.5)))
+        self.breaker_open_seconds_var.set(str(breaker_config.get('open_seconds', 30)))
+        pool_config = config_data.get('connection_pool', {})
+        self.pool_max_hosts_var.set(str(pool_config.get('max_hosts', 10)))
+        self.pool_max_per_host_var.set(str(pool_config.get('max_per_host', 10)))
+        self.pool_block_var.set(pool_config.get('block', False))
+        self.pool_keep_alive_var.set(pool_config.get('keep_alive', True))
+        self.pool_keepalive_timeout_var.set(str(pool_config.get('keepalive_timeout', 15)))
+        self.conditional_get_var.set(config_data.get('conditional_get', {}).get('enabled', False))
+        response_cache_config = config_data.get('response_cache', {})
+        self.response_cache_enabled_var.set(response_cache_config.get('enabled', False))
+        self.response_cache_ttl_var.set(str(response_cache_config.get('ttl', 3600)))
+        self.response_cache_max_size_var.set(str(response_cache_config.get('max_size_mb', 200)))
+        self.response_cache_offline_var.set(response_cache_config.get('offline', False))
+        self.time_locator_var.set(config_data.get('time_locator', {}).get('enabled', False))
+        download_config = config_data.get('download', {})
+        self.download_max_body_var.set(str(download_config.get('max_body_mb', 10)))
+        self.download_content_types_var.set(', '.join(download_config.get('allowed_content_types', ['text/html', 'application/xhtml+xml', 'text/plain'])))
+        timeout_config = config_data.get('timeouts', {})
+        self.timeout_connect_var.set(str(timeout_config.get('connect', 10)))
+        self.timeout_read_var.set(str(timeout_config.get('read', 10)))
+        self.timeout_total_var.set(str(timeout_config.get('total', 60)))
+        budget_config = config_data.get('budget', {})
+        self.budget_max_seconds_var.set(str(budget_config.get('max_seconds', 0)))
+        self.budget_max_pages_var.set(str(budget_config.get('max_pages', 0)))
+        self.budget_max_mb_var.set(str(budget_config.get('max_mb', 0)))
+        
         # URL列表配置
         url_list_config = config_data.get('url_list_config', {})
         target_list_container = url_list_config.get('target_list_container', {})
@@ -122,6 +225,12 @@ class ConfigWindow:
         self.article_text_item_name_var.set(target_text_item.get('name', 'p'))
         self.article_text_item_attr_var.set(target_text_item.get('attr', 'text'))
         
+        target_time = article_config.get('target_time', {})
+        self.article_time_selector_var.set(target_time.get('selector', ''))
+        self.article_time_attr_var.set(target_time.get('attr', 'text'))
+        self.article_time_format_var.set(target_time.get('format', ''))
+        self.article_time_fallback_var.set(target_time.get('fallback', 'heuristic'))
+        
         # 请求头
         headers = config_data.get('headers', {})
         self.user_agent_var.set(headers.get('User-Agent', ''))
@@ -178,6 +287,11 @@ class ConfigWindow:
         notebook.add(article_frame, text="文章配置")
         self.create_article_tab(article_frame)
         
+        # 性能设置选项卡
+        performance_frame = ttk.Frame(notebook, padding="10")
+        notebook.add(performance_frame, text="性能设置")
+        self.create_performance_tab(performance_frame)
+        
         # 高级设置选项卡
         advanced_frame = ttk.Frame(notebook, padding="10")
         notebook.add(advanced_frame, text="高级设置")
@@ -364,6 +478,28 @@ class ConfigWindow:
         
         text_frame.columnconfigure(1, weight=1)
         
+        # 时间配置
+        time_frame = ttk.LabelFrame(parent, text="时间配置", padding="10")
+        time_frame.pack(fill=tk.X, pady=(0, 10))
+        
+        ttk.Label(time_frame, text="时间选择器:").grid(row=0, column=0, sticky=tk.W, pady=(0, 5))
+        ttk.Entry(time_frame, textvariable=self.article_time_selector_var, width=30).grid(row=0, column=1, sticky=tk.EW, pady=(0, 5))
+        
+        ttk.Label(time_frame, text="时间属性:").grid(row=1, column=0, sticky=tk.W, pady=(0, 5))
+        time_attr_combo = ttk.Combobox(time_frame, textvariable=self.article_time_attr_var, width=27)
+        time_attr_combo['values'] = ('text', 'datetime', 'content', 'title')
+        time_attr_combo.grid(row=1, column=1, sticky=tk.EW, pady=(0, 5))
+        
+        ttk.Label(time_frame, text="时间格式:").grid(row=2, column=0, sticky=tk.W, pady=(0, 5))
+        ttk.Entry(time_frame, textvariable=self.article_time_format_var, width=30).grid(row=2, column=1, sticky=tk.EW, pady=(0, 5))
+        
+        ttk.Label(time_frame, text="未提取到时:").grid(row=3, column=0, sticky=tk.W, pady=(0, 5))
+        time_fallback_combo = ttk.Combobox(time_frame, textvariable=self.article_time_fallback_var, width=27, state="readonly")
+        time_fallback_combo['values'] = ('heuristic', 'none')
+        time_fallback_combo.grid(row=3, column=1, sticky=tk.EW, pady=(0, 5))
+        
+        time_frame.columnconfigure(1, weight=1)
+        
         # 配置说明
         info_frame = ttk.LabelFrame(parent, text="配置说明", padding="10")
         info_frame.pack(fill=tk.X, pady=(10, 0))
@@ -376,7 +512,230 @@ class ConfigWindow:
    
 2. 文本项配置：要提取的文本元素
    - 文本项标签名：文本元素的HTML标签（如p、span等）
-   - 文本项属性：文本的属性（text表示文本内容，其他表示属性值）"""
+   - 文本项属性：文本的属性（text表示文本内容，其他表示属性值）
+   
+3. 时间配置：直接指定文章时间的位置，不再自动查找
+   - 时间选择器：CSS选择器或XPath（以xpath:或/开头，需要lxml.html解析器），留空时自动查找时间
+   - 时间属性：时间所在的属性（text表示文本内容，如datetime、content）
+   - 时间格式：strptime格式（如%Y年%m月%d日 %H:%M），留空时自动识别常见格式
+   - 未提取到时：heuristic继续自动查找，none不填写时间
+   - 启用定向解析时同时保留选择器匹配的元素；选择器含组合符或伪类时文章页完整解析
+   
+4. 附加字段（在配置文件的article_config.fields中设置）：
+   - 字段名到CSS选择器或XPath（以xpath:或/开头）的映射，提取结果与正文一起保存，
+     如 {"author": ".author", "tags": {"selector": "a[rel=tag]", "many": true}}
+   - 可用attr指定提取的属性；XPath需要lxml.html解析器
+   - 启用定向解析时同时保留字段匹配的元素；选择器含组合符（如div p）或伪类时文章页完整解析"""
+        
+        ttk.Label(info_frame, text=info_text, justify=tk.LEFT).pack(anchor=tk.W)
+    
+    def create_performance_tab(self, parent):
+        """创建性能设置选项卡"""
+        # 并发配置
+        concurrency_frame = ttk.LabelFrame(parent, text="并发配置", padding="10")
+        concurrency_frame.pack(fill=tk.X, pady=(0, 10))
+        
+        ttk.Label(concurrency_frame, text="文章并发数:").grid(row=0, column=0, sticky=tk.W, pady=(0, 5))
+        ttk.Entry(concurrency_frame, textvariable=self.concurrency_var, width=30).grid(row=0, column=1, sticky=tk.EW, pady=(0, 5))
+        
+        ttk.Label(concurrency_frame, text="爬虫引擎:").grid(row=1, column=0, sticky=tk.W, pady=(0, 5))
+        engine_combo = ttk.Combobox(concurrency_frame, textvariable=self.engine_var, width=27, state="readonly")
+        engine_combo['values'] = ('threaded', 'async')
+        engine_combo.grid(row=1, column=1, sticky=tk.EW, pady=(0, 5))
+        
+        ttk.Label(concurrency_frame, text="链接队列容量:").grid(row=2, column=0, sticky=tk.W, pady=(0, 5))
+        ttk.Entry(concurrency_frame, textvariable=self.link_queue_size_var, width=30).grid(row=2, column=1, sticky=tk.EW, pady=(0, 5))
+        
+        ttk.Label(concurrency_frame, text="列表页并发数:").grid(row=3, column=0, sticky=tk.W, pady=(0, 5))
+        ttk.Entry(concurrency_frame, textvariable=self.list_page_concurrency_var, width=30).grid(row=3, column=1, sticky=tk.EW, pady=(0, 5))
+        
+        ttk.Checkbutton(concurrency_frame, text="爬取前探测最后一页", variable=self.probe_last_page_var).grid(row=4, column=0, columnspan=2, sticky=tk.W, pady=(0, 5))
+        
+        ttk.Label(concurrency_frame, text="页面解析器:").grid(row=5, column=0, sticky=tk.W, pady=(0, 5))
+        parser_combo = ttk.Combobox(concurrency_frame, textvariable=self.parser_var, width=27, state="readonly")
+        parser_combo['values'] = ('html.parser', 'lxml', 'lxml.html')
+        parser_combo.grid(row=5, column=1, sticky=tk.EW, pady=(0, 5))
+        
+        ttk.Checkbutton(concurrency_frame, text="定向解析（只解析配置的容器和时间元素）", variable=self.targeted_parse_var).grid(row=6, column=0, columnspan=2, sticky=tk.W, pady=(0, 5))
+        
+        ttk.Label(concurrency_frame, text="解析进程数:").grid(row=7, column=0, sticky=tk.W, pady=(0, 5))
+        ttk.Entry(concurrency_frame, textvariable=self.parse_workers_var, width=30).grid(row=7, column=1, sticky=tk.EW, pady=(0, 5))
+        
+        concurrency_frame.columnconfigure(1, weight=1)
+        
+        # 限速配置
+        rate_limit_frame = ttk.LabelFrame(parent, text="按主机限速", padding="10")
+        rate_limit_frame.pack(fill=tk.X, pady=(0, 10))
+        
+        ttk.Label(rate_limit_frame, text="每秒请求数:").grid(row=0, column=0, sticky=tk.W, pady=(0, 5))
+        ttk.Entry(rate_limit_frame, textvariable=self.rate_limit_rps_var, width=30).grid(row=0, column=1, sticky=tk.EW, pady=(0, 5))
+        
+        ttk.Label(rate_limit_frame, text="突发请求数:").grid(row=1, column=0, sticky=tk.W, pady=(0, 5))
+        ttk.Entry(rate_limit_frame, textvariable=self.rate_limit_burst_var, width=30).grid(row=1, column=1, sticky=tk.EW, pady=(0, 5))
+        
+        rate_limit_frame.columnconfigure(1, weight=1)
+        
+        # 自适应并发配置
+        adaptive_frame = ttk.LabelFrame(parent, text="自适应并发", padding="10")
+        adaptive_frame.pack(fill=tk.X, pady=(0, 10))
+        
+        ttk.Checkbutton(adaptive_frame, text="启用自适应并发", variable=self.adaptive_enabled_var).grid(row=0, column=0, columnspan=4, sticky=tk.W, pady=(0, 5))
+        
+        ttk.Label(adaptive_frame, text="最小并发数:").grid(row=1, column=0, sticky=tk.W, pady=(0, 5))
+        ttk.Entry(adaptive_frame, textvariable=self.adaptive_min_concurrency_var, width=10).grid(row=1, column=1, sticky=tk.W, padx=(0, 20), pady=(0, 5))
+        ttk.Label(adaptive_frame, text="最大并发数:").grid(row=1, column=2, sticky=tk.W, pady=(0, 5))
+        ttk.Entry(adaptive_frame, textvariable=self.adaptive_max_concurrency_var, width=10).grid(row=1, column=3, sticky=tk.W, pady=(0, 5))
+        
+        ttk.Label(adaptive_frame, text="最小速率(次/秒):").grid(row=2, column=0, sticky=tk.W, pady=(0, 5))
+        ttk.Entry(adaptive_frame, textvariable=self.adaptive_min_rate_var, width=10).grid(row=2, column=1, sticky=tk.W, padx=(0, 20), pady=(0, 5))
+        ttk.Label(adaptive_frame, text="最大速率(次/秒):").grid(row=2, column=2, sticky=tk.W, pady=(0, 5))
+        ttk.Entry(adaptive_frame, textvariable=self.adaptive_max_rate_var, width=10).grid(row=2, column=3, sticky=tk.W, pady=(0, 5))
+        
+        ttk.Label(adaptive_frame, text="目标延迟(ms):").grid(row=3, column=0, sticky=tk.W, pady=(0, 5))
+        ttk.Entry(adaptive_frame, textvariable=self.adaptive_target_latency_var, width=10).grid(row=3, column=1, sticky=tk.W, padx=(0, 20), pady=(0, 5))
+        
+        # 重试配置
+        retry_frame = ttk.LabelFrame(parent, text="失败重试", padding="10")
+        retry_frame.pack(fill=tk.X, pady=(0, 10))
+        
+        ttk.Label(retry_frame, text="最大尝试次数:").grid(row=0, column=0, sticky=tk.W, pady=(0, 5))
+        ttk.Entry(retry_frame, textvariable=self.retry_max_attempts_var, width=10).grid(row=0, column=1, sticky=tk.W, padx=(0, 20), pady=(0, 5))
+        
+        ttk.Label(retry_frame, text="退避基数(秒):").grid(row=1, column=0, sticky=tk.W, pady=(0, 5))
+        ttk.Entry(retry_frame, textvariable=self.retry_backoff_base_var, width=10).grid(row=1, column=1, sticky=tk.W, padx=(0, 20), pady=(0, 5))
+        ttk.Label(retry_frame, text="最长退避(秒):").grid(row=1, column=2, sticky=tk.W, pady=(0, 5))
+        ttk.Entry(retry_frame, textvariable=self.retry_backoff_max_var, width=10).grid(row=1, column=3, sticky=tk.W, pady=(0, 5))
+        
+        ttk.Checkbutton(retry_frame, text="启用主机熔断", variable=self.breaker_enabled_var).grid(row=2, column=0, columnspan=4, sticky=tk.W, pady=(0, 5))
+        
+        ttk.Label(retry_frame, text="熔断失败率:").grid(row=3, column=0, sticky=tk.W, pady=(0, 5))
+        ttk.Entry(retry_frame, textvariable=self.breaker_failure_rate_var, width=10).grid(row=3, column=1, sticky=tk.W, padx=(0, 20), pady=(0, 5))
+        ttk.Label(retry_frame, text="熔断时长(秒):").grid(row=3, column=2, sticky=tk.W, pady=(0, 5))
+        ttk.Entry(retry_frame, textvariable=self.breaker_open_seconds_var, width=10).grid(row=3, column=3, sticky=tk.W, pady=(0, 5))
+        
+        # 连接池配置
+        pool_frame = ttk.LabelFrame(parent, text="连接池", padding="10")
+        pool_frame.pack(fill=tk.X, pady=(0, 10))
+        
+        ttk.Label(pool_frame, text="缓存主机数:").grid(row=0, column=0, sticky=tk.W, pady=(0, 5))
+        ttk.Entry(pool_frame, textvariable=self.pool_max_hosts_var, width=10).grid(row=0, column=1, sticky=tk.W, padx=(0, 20), pady=(0, 5))
+        ttk.Label(pool_frame, text="每主机连接数:").grid(row=0, column=2, sticky=tk.W, pady=(0, 5))
+        ttk.Entry(pool_frame, textvariable=self.pool_max_per_host_var, width=10).grid(row=0, column=3, sticky=tk.W, pady=(0, 5))
+        
+        ttk.Checkbutton(pool_frame, text="保持长连接", variable=self.pool_keep_alive_var).grid(row=1, column=0, columnspan=2, sticky=tk.W, pady=(0, 5))
+        ttk.Checkbutton(pool_frame, text="连接数达到上限时等待", variable=self.pool_block_var).grid(row=1, column=2, columnspan=2, sticky=tk.W, pady=(0, 5))
+        
+        ttk.Label(pool_frame, text="长连接空闲超时(秒):").grid(row=2, column=0, sticky=tk.W, pady=(0, 5))
+        ttk.Entry(pool_frame, textvariable=self.pool_keepalive_timeout_var, width=10).grid(row=2, column=1, sticky=tk.W, padx=(0, 20), pady=(0, 5))
+        
+        # 缓存配置
+        cache_frame = ttk.LabelFrame(parent, text="缓存", padding="10")
+        cache_frame.pack(fill=tk.X, pady=(0, 10))
+        
+        ttk.Checkbutton(cache_frame, text="列表页条件请求（ETag/Last-Modified）", variable=self.conditional_get_var).grid(row=0, column=0, columnspan=4, sticky=tk.W, pady=(0, 5))
+        
+        ttk.Checkbutton(cache_frame, text="启用响应缓存", variable=self.response_cache_enabled_var).grid(row=1, column=0, columnspan=2, sticky=tk.W, pady=(0, 5))
+        ttk.Checkbutton(cache_frame, text="离线模式（只读缓存）", variable=self.response_cache_offline_var).grid(row=1, column=2, columnspan=2, sticky=tk.W, pady=(0, 5))
+        
+        ttk.Label(cache_frame, text="有效期(秒):").grid(row=2, column=0, sticky=tk.W, pady=(0, 5))
+        ttk.Entry(cache_frame, textvariable=self.response_cache_ttl_var, width=10).grid(row=2, column=1, sticky=tk.W, padx=(0, 20), pady=(0, 5))
+        ttk.Label(cache_frame, text="容量上限(MB):").grid(row=2, column=2, sticky=tk.W, pady=(0, 5))
+        ttk.Entry(cache_frame, textvariable=self.response_cache_max_size_var, width=10).grid(row=2, column=3, sticky=tk.W, pady=(0, 5))
+        
+        ttk.Checkbutton(cache_frame, text="按站点学习文章时间位置", variable=self.time_locator_var).grid(row=3, column=0, columnspan=4, sticky=tk.W, pady=(0, 5))
+        
+        # 下载限制
+        download_frame = ttk.LabelFrame(parent, text="下载限制", padding="10")
+        download_frame.pack(fill=tk.X, pady=(0, 10))
+        
+        ttk.Label(download_frame, text="页面大小上限(MB):").grid(row=0, column=0, sticky=tk.W, pady=(0, 5))
+        ttk.Entry(download_frame, textvariable=self.download_max_body_var, width=10).grid(row=0, column=1, sticky=tk.W, pady=(0, 5))
+        
+        ttk.Label(download_frame, text="允许的内容类型:").grid(row=1, column=0, sticky=tk.W, pady=(0, 5))
+        ttk.Entry(download_frame, textvariable=self.download_content_types_var, width=50).grid(row=1, column=1, columnspan=3, sticky=tk.EW, pady=(0, 5))
+        
+        # 超时与预算
+        budget_frame = ttk.LabelFrame(parent, text="超时与预算", padding="10")
+        budget_frame.pack(fill=tk.X, pady=(0, 10))
+        
+        ttk.Label(budget_frame, text="连接超时(秒):").grid(row=0, column=0, sticky=tk.W, pady=(0, 5))
+        ttk.Entry(budget_frame, textvariable=self.timeout_connect_var, width=10).grid(row=0, column=1, sticky=tk.W, padx=(0, 20), pady=(0, 5))
+        ttk.Label(budget_frame, text="读取超时(秒):").grid(row=0, column=2, sticky=tk.W, pady=(0, 5))
+        ttk.Entry(budget_frame, textvariable=self.timeout_read_var, width=10).grid(row=0, column=3, sticky=tk.W, padx=(0, 20), pady=(0, 5))
+        ttk.Label(budget_frame, text="请求总时限(秒):").grid(row=0, column=4, sticky=tk.W, pady=(0, 5))
+        ttk.Entry(budget_frame, textvariable=self.timeout_total_var, width=10).grid(row=0, column=5, sticky=tk.W, pady=(0, 5))
+        
+        ttk.Label(budget_frame, text="最长运行(秒):").grid(row=1, column=0, sticky=tk.W, pady=(0, 5))
+        ttk.Entry(budget_frame, textvariable=self.budget_max_seconds_var, width=10).grid(row=1, column=1, sticky=tk.W, padx=(0, 20), pady=(0, 5))
+        ttk.Label(budget_frame, text="最多页面数:").grid(row=1, column=2, sticky=tk.W, pady=(0, 5))
+        ttk.Entry(budget_frame, textvariable=self.budget_max_pages_var, width=10).grid(row=1, column=3, sticky=tk.W, padx=(0, 20), pady=(0, 5))
+        ttk.Label(budget_frame, text="最大下载量(MB):").grid(row=1, column=4, sticky=tk.W, pady=(0, 5))
+        ttk.Entry(budget_frame, textvariable=self.budget_max_mb_var, width=10).grid(row=1, column=5, sticky=tk.W, pady=(0, 5))
+        
+        # 配置说明
+        info_frame = ttk.LabelFrame(parent, text="配置说明", padding="10")
+        info_frame.pack(fill=tk.X, pady=(10, 0))
+        
+        info_text = """性能设置说明：
+1. 并发配置：
+   - 文章并发数：同时爬取文章的工作线程数（异步引擎下为同时在途的请求数），默认为1（串行爬取）
+   - 每个工作线程在处理完一篇文章后仍会执行随机延迟
+   - 爬虫引擎：threaded为基于requests的多线程引擎，async为基于asyncio/aiohttp的异步引擎，
+     异步引擎适合数百个并发请求的场景
+   - 链接队列容量：列表页解析出的链接立即交给文章工作线程爬取，
+     待处理的链接达到该数量时暂停获取列表页
+   - 列表页并发数：同时获取的列表页数，结果仍按页码顺序处理；
+     某一页获取失败时视为已到达最后一页，取消尚未开始的后续页面
+   - 探测最后一页：爬取前用HEAD请求（不支持时改用Range请求）按指数加二分的方式查找最后一页，
+     之后只请求到该页为止，进度条按探测到的页数估算文章总数
+   - 页面解析器：html.parser为纯Python解析器；lxml使用lxml构建BeautifulSoup对象，速度快数倍；
+     lxml.html直接使用lxml元素树，不构建BeautifulSoup对象，速度最快；
+     三者的提取结果一致，只有极少数不规范的页面会因容错方式不同而略有差异
+   - 定向解析：列表页只构建链接列表容器，文章页只构建文章容器、可能包含时间的元素和附加字段的元素，
+     跳过导航栏、页脚和脚本，减少解析时间和内存；需要配置容器的id或class，
+     对lxml.html解析器无效；常见时间元素中找不到时间时，只在保留的部分中查找
+   - 解析进程数：大于0时文章页在独立的进程中解析，解析速度可随CPU核心数提高，
+     适合并发较高、解析占满一个CPU核心的场景；0表示在工作线程中解析（默认）。
+     启动进程需要约1秒，少量文章时不必启用
+   
+2. 按主机限速：
+   - 每秒请求数：对同一主机的平均请求速率上限，0表示不限速（使用随机延迟）
+   - 突发请求数：允许短时间内连续发送的请求数
+   - 启用后不再执行随机延迟，所有工作线程和爬虫标签页共享同一主机的限速
+   
+3. 自适应并发：
+   - 根据响应延迟、429/5xx响应以及连接失败和超时自动调整并发数和速率，调整范围由最小/最大值限定
+   - 响应正常时逐步提高，被限流或平均延迟超过目标延迟时减半，每次调整都会记录日志
+   
+4. 失败重试：
+   - 对429、5xx、超时和连接失败的请求按指数退避加随机抖动重试，优先遵循Retry-After
+   - 各状态类别的单独设置可在配置文件的retry.status_classes中修改
+   - 主机熔断：同一主机最近的请求失败率达到阈值时熔断，熔断期间该主机的链接暂缓处理，
+     到时后先放行试探请求，成功则恢复；熔断状态显示在爬虫标签页的进度条下方
+   
+5. 连接池：
+   - 所有爬虫标签页和请求测试窗口共享进程内的连接池，复用TCP连接和TLS握手
+   - 每主机连接数会自动提高到不少于并发数；各标签页共用一个连接池，容量按其中最大的需求设置
+   - 长连接空闲超时：连接空闲超过该秒数后不再复用，两种爬虫引擎都有效
+   
+6. 缓存：
+   - 列表页条件请求：重复爬取时携带If-None-Match/If-Modified-Since，
+     列表页未变化（304）时直接复用上次解析出的链接；修改列表提取配置后重新解析
+   - 响应缓存：将页面压缩保存到磁盘，有效期内重复请求直接读取缓存，不再访问网站，
+     超过容量上限时淘汰最久未使用的页面；有效期为0表示永不过期
+   - 离线模式：只从缓存读取页面（忽略有效期），缓存中没有的页面视为获取失败
+   - 学习文章时间位置：记住每个站点发布时间所在的元素和格式并保存到文件，
+     之后先按该位置提取，找不到时再逐个尝试常见的时间元素
+   
+7. 下载限制：
+   - 响应按块流式读取，Content-Type不在允许列表中或大小超过上限的页面（如PDF、视频）提前放弃
+   - 允许的内容类型用逗号分隔，可使用text/*匹配一类；留空表示不限制；大小上限为0表示不限制
+   - 跳过的页面数量在爬取结束时的统计日志中输出
+   
+8. 超时与预算：
+   - 连接超时：建立连接的最长时间；读取超时：两次收到数据之间的最长间隔
+   - 请求总时限：单个请求从发出到读完正文的最长时间，避免持续缓慢发送数据的页面长时间占用工作线程，0表示不限制
+   - 最长运行、最多页面数、最大下载量：任一项达到上限时结束爬取（已获取的结果会保存），0表示不限制"""
         
         ttk.Label(info_frame, text=info_text, justify=tk.LEFT).pack(anchor=tk.W)
     
@@ -480,8 +839,8 @@ class ConfigWindow:
     
     def get_config_data(self):
         """获取表单中的配置数据"""
-        # URL列表配置
-        url_list_config = {
+        # URL列表配置，保留界面中没有的字段
+        url_list_config = dict(self.extra_config.get('url_list_config', {}), **{
             "target_list_container": {
                 "name": self.list_container_name_var.get(),
                 "class": self.list_container_class_var.get(),
@@ -498,10 +857,10 @@ class ConfigWindow:
                     "attr": self.list_item_link_attr_var.get()
                 }
             }
-        }
+        })
         
-        # 文章配置
-        article_config = {
+        # 文章配置，保留界面中没有的字段（如附加字段fields）
+        article_config = dict(self.extra_config.get('article_config', {}), **{
             "target_container": {
                 "name": self.article_container_name_var.get(),
                 "class": self.article_container_class_var.get(),
@@ -510,8 +869,14 @@ class ConfigWindow:
             "target_text_item": {
                 "name": self.article_text_item_name_var.get(),
                 "attr": self.article_text_item_attr_var.get()
+            },
+            "target_time": {
+                "selector": self.article_time_selector_var.get().strip(),
+                "attr": self.article_time_attr_var.get(),
+                "format": self.article_time_format_var.get(),
+                "fallback": self.article_time_fallback_var.get()
             }
-        }
+        })
         
         # 请求头
         headers = {
@@ -529,8 +894,9 @@ class ConfigWindow:
         
         # 多页爬取配置 - 已移除，不再包含在配置中
         
-        # 完整配置
-        config_data = {
+        # 完整配置，以加载时的配置为基础，保留表单未覆盖的配置项
+        config_data = dict(self.extra_config)
+        config_data.update({
             "name": self.name_var.get(),
             "base_url": self.base_url_var.get(),
             "url_onepage": self.url_onepage_var.get(),
@@ -541,10 +907,73 @@ class ConfigWindow:
             "article_config": article_config,
             "delay_min": int(self.delay_min_var.get()) if self.delay_min_var.get() else 1000,
             "delay_max": int(self.delay_max_var.get()) if self.delay_max_var.get() else 3000,
+            "concurrency": int(self.concurrency_var.get()) if self.concurrency_var.get() else 1,
+            "engine": self.engine_var.get() or "threaded",
+            "link_queue_size": int(self.link_queue_size_var.get()) if self.link_queue_size_var.get() else 200,
+            "list_page_concurrency": int(self.list_page_concurrency_var.get()) if self.list_page_concurrency_var.get() else 1,
+            "probe_last_page": self.probe_last_page_var.get(),
+            "parser": self.parser_var.get() or "html.parser",
+            "targeted_parse": self.targeted_parse_var.get(),
+            "parse_workers": int(self.parse_workers_var.get()) if self.parse_workers_var.get() else 0,
+            "rate_limit": dict(self.extra_config.get('rate_limit', {}), **{
+                "requests_per_second": float(self.rate_limit_rps_var.get()) if self.rate_limit_rps_var.get() else 0,
+                "burst": int(self.rate_limit_burst_var.get()) if self.rate_limit_burst_var.get() else 1
+            }),
+            "adaptive": dict(self.extra_config.get('adaptive', {}), **{
+                "enabled": self.adaptive_enabled_var.get(),
+                "min_concurrency": int(self.adaptive_min_concurrency_var.get()) if self.adaptive_min_concurrency_var.get() else 1,
+                "max_concurrency": int(self.adaptive_max_concurrency_var.get()) if self.adaptive_max_concurrency_var.get() else 16,
+                "min_rate": float(self.adaptive_min_rate_var.get()) if self.adaptive_min_rate_var.get() else 0.5,
+                "max_rate": float(self.adaptive_max_rate_var.get()) if self.adaptive_max_rate_var.get() else 20,
+                "target_latency_ms": int(self.adaptive_target_latency_var.get()) if self.adaptive_target_latency_var.get() else 2000
+            }),
+            "retry": dict(self.extra_config.get('retry', {}), **{
+                "max_attempts": int(self.retry_max_attempts_var.get()) if self.retry_max_attempts_var.get() else 3,
+                "backoff_base": float(self.retry_backoff_base_var.get()) if self.retry_backoff_base_var.get() else 1.0,
+                "backoff_max": float(self.retry_backoff_max_var.get()) if self.retry_backoff_max_var.get() else 60
+            }),
+            "circuit_breaker": dict(self.extra_config.get('circuit_breaker', {}), **{
+                "enabled": self.breaker_enabled_var.get(),
+                "failure_rate": float(self.breaker_failure_rate_var.get()) if self.breaker_failure_rate_var.get() else 0.5,
+                "open_seconds": float(self.breaker_open_seconds_var.get()) if self.breaker_open_seconds_var.get() else 30
+            }),
+            "connection_pool": dict(self.extra_config.get('connection_pool', {}), **{
+                "max_hosts": int(self.pool_max_hosts_var.get()) if self.pool_max_hosts_var.get() else 10,
+                "max_per_host": int(self.pool_max_per_host_var.get()) if self.pool_max_per_host_var.get() else 10,
+                "block": self.pool_block_var.get(),
+                "keep_alive": self.pool_keep_alive_var.get(),
+                "keepalive_timeout": float(self.pool_keepalive_timeout_var.get()) if self.pool_keepalive_timeout_var.get() else 15
+            }),
+            "conditional_get": dict(self.extra_config.get('conditional_get', {}), **{
+                "enabled": self.conditional_get_var.get()
+            }),
+            "response_cache": dict(self.extra_config.get('response_cache', {}), **{
+                "enabled": self.response_cache_enabled_var.get(),
+                "ttl": float(self.response_cache_ttl_var.get()) if self.response_cache_ttl_var.get() else 3600,
+                "max_size_mb": float(self.response_cache_max_size_var.get()) if self.response_cache_max_size_var.get() else 200,
+                "offline": self.response_cache_offline_var.get()
+            }),
+            "time_locator": dict(self.extra_config.get('time_locator', {}), **{
+                "enabled": self.time_locator_var.get()
+            }),
+            "download": dict(self.extra_config.get('download', {}), **{
+                "max_body_mb": float(self.download_max_body_var.get()) if self.download_max_body_var.get() else 10,
+                "allowed_content_types": [t.strip() for t in self.download_content_types_var.get().split(',') if t.strip()]
+            }),
+            "timeouts": dict(self.extra_config.get('timeouts', {}), **{
+                "connect": float(self.timeout_connect_var.get()) if self.timeout_connect_var.get() else 10,
+                "read": float(self.timeout_read_var.get()) if self.timeout_read_var.get() else 10,
+                "total": float(self.timeout_total_var.get()) if self.timeout_total_var.get() else 60
+            }),
+            "budget": dict(self.extra_config.get('budget', {}), **{
+                "max_seconds": float(self.budget_max_seconds_var.get()) if self.budget_max_seconds_var.get() else 0,
+                "max_pages": int(self.budget_max_pages_var.get()) if self.budget_max_pages_var.get() else 0,
+                "max_mb": float(self.budget_max_mb_var.get()) if self.budget_max_mb_var.get() else 0
+            }),
             "headers": headers,
             "use_jsonl": self.use_jsonl_var.get(),
             "jsonl_config": jsonl_config
-        }
+        })
         
         return config_data
     
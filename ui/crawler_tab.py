@@ -10,7 +10,7 @@ from datetime import datetime
 # 添加项目根目录到路径，以便导入其他模块
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from core.crawler import WebCrawler
+from core.engine import create_crawler
 from ui.config_window import ConfigWindow
 
 class CrawlerTab:
@@ -127,6 +127,10 @@ class CrawlerTab:
         # 初始化进度为0
         self.progress_var.set(0)
         
+        # 主机熔断状态
+        self.breaker_var = tk.StringVar()
+        ttk.Label(progress_frame, textvariable=self.breaker_var, foreground="red").pack(anchor=tk.W)
+        
         # 创建日志显示区域
         log_frame = ttk.LabelFrame(main_frame, text="日志", padding="10")
         log_frame.pack(fill=tk.BOTH, expand=True)
@@ -219,6 +223,20 @@ class CrawlerTab:
             # 更新进度条
             self.progress_var.set(percentage)
     
+    def refresh_breaker_status(self):
+        """定时刷新主机熔断状态，爬取结束后停止刷新"""
+        if not self.is_crawling or not self.current_crawler:
+            self.breaker_var.set("")
+            return
+        
+        states = [
+            f"{host} {state_name}" + (f"（{remaining:.0f} 秒后试探）" if remaining > 0 else "")
+            for host, state_name, remaining in self.current_crawler.get_breaker_states()
+            if state_name != "正常"
+        ]
+        self.breaker_var.set("主机熔断: " + "，".join(states) if states else "")
+        self.frame.after(1000, self.refresh_breaker_status)
+    
     def test_config(self):
         """测试配置是否正确"""
         config_name = self.config_var.get()
@@ -236,7 +254,11 @@ class CrawlerTab:
             # 在主线程中更新进度
             self.frame.after(0, self.update_progress, current, total, message)
             
-        self.current_crawler = WebCrawler(config_data, self.logger, progress_callback)
+        try:
+            self.current_crawler = create_crawler(config_data, self.logger, progress_callback)
+        except (ImportError, ValueError) as e:
+            messagebox.showerror("错误", f"无法创建爬虫: {str(e)}")
+            return
         
         # 更新UI状态
         self.is_crawling = True
@@ -250,6 +272,7 @@ class CrawlerTab:
         self.crawl_thread = threading.Thread(target=self.run_test)
         self.crawl_thread.daemon = True
         self.crawl_thread.start()
+        self.refresh_breaker_status()
     
     def run_test(self):
         """运行配置测试"""
@@ -390,7 +413,11 @@ class CrawlerTab:
             # 在主线程中更新进度
             self.frame.after(0, self.update_progress, current, total, message)
             
-        self.current_crawler = WebCrawler(config_data, self.logger, progress_callback)
+        try:
+            self.current_crawler = create_crawler(config_data, self.logger, progress_callback)
+        except (ImportError, ValueError) as e:
+            messagebox.showerror("错误", f"无法创建爬虫: {str(e)}")
+            return
         
         # 更新UI状态
         self.is_crawling = True
@@ -403,6 +430,7 @@ class CrawlerTab:
         self.crawl_thread = threading.Thread(target=self.run_crawler)
         self.crawl_thread.daemon = True
         self.crawl_thread.start()
+        self.refresh_breaker_status()
     
     def stop_crawl(self):
         """停止爬取"""
@@ -433,8 +461,11 @@ class CrawlerTab:
         self.start_button.config(state=tk.NORMAL)
         self.stop_button.config(state=tk.DISABLED)
         
-        # 检查是否是因为停止而结束的
-        if self.current_crawler and self.current_crawler.is_stopped():
+        # 检查是否是因为达到爬取预算或停止而结束的
+        if self.current_crawler and self.current_crawler.budget_exhausted:
+            self.progress_var.set(100)
+            self.log_callback(f"已达到爬取预算（{self.current_crawler.budget_exhausted}），爬取任务已结束")
+        elif self.current_crawler and self.current_crawler.is_stopped():
             self.progress_var.set(0)
             self.log_callback("爬取任务已停止")
         elif success:
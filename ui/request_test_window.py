@@ -4,6 +4,7 @@ import threading
 import requests
 import json
 from urllib.parse import urlparse
+from core.http_pool import create_session
 
 # 尝试导入win32gui模块
 try:
@@ -36,6 +37,9 @@ class RequestTestWindow:
         # 设置窗口协议
         self.window.wm_protocol("WM_DELETE_WINDOW", self.on_close)  # 处理窗口关闭事件
         
+        # 使用进程内共享的连接池，与爬虫标签页复用连接
+        self.session = create_session()
+        
         # 设置窗口在父窗口中心
         # self.window.transient(parent)  # 注释掉这行，可能会影响最大化按钮的显示
         # self.window.grab_set()  # 注释掉这行，可能会影响最大化按钮的显示
@@ -215,7 +219,7 @@ class RequestTestWindow:
             self.status_var.set(f"正在发送 {method} 请求到 {url}...")
             
             # 发送请求
-            response = requests.request(
+            response = self.session.request(
                 method=method,
                 url=url,
                 headers=headers,